@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Excel Karşılaştırma Uygulaması - Toplu Karşılaştırma
+Eski ve yeni gün klasörlerindeki araç dosyalarını araç numarasına göre
+eşleştirir. Her çift ayrı bir süreçte karşılaştırılır ve kendi çıktısına
+yazılır; özet tablosu her çiftin sonucunu ve aşama sürelerini gösterir.
+"""
+
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+# Constants
+BATCH_SHEET = "Toplu Özet"
+BATCH_OUTPUT_NAME = "toplu_karşılaştırma"
+BATCH_SUMMARY_NAME = "Toplu_Ozet"
+BATCH_COLUMNS = (
+    "Araç", "Depo", "Eski Dosya", "Yeni Dosya", "Yöntem", "Eksik", "Yeni", "Ortak",
+    "Okuma (sn)", "Karşılaştırma (sn)", "Kaydetme (sn)", "Toplam (sn)", "Çıktılar", "Hata"
+)
+
+VehiclePair = Tuple[str, str, str]  # (araç, eski dosya, yeni dosya)
+
+
+class BatchSummary:
+    """Toplu karşılaştırma özeti
+
+    rows her araç çifti ve eşleşmeyen her dosya için BATCH_COLUMNS
+    anahtarlı bir satırdır; elapsed tüm işin duvar saati süresi, workers
+    kullanılan süreç sayısıdır (sırayla çalıştıysa 1). summary_paths
+    kaydedilen özet dosyalarıdır.
+    """
+
+    def __init__(self, rows: List[Dict[str, Any]], elapsed: float, workers: int):
+        self.rows = rows
+        self.elapsed = elapsed
+        self.workers = workers
+        self.summary_paths: List[str] = []
+
+    @property
+    def table(self) -> pd.DataFrame:
+        """Araç sırasıyla özet tablosu (eşleşmeyen dosyalar sonda)"""
+        table = pd.DataFrame(self.rows, columns=list(BATCH_COLUMNS))
+        table["_eşsiz"] = table["Eski Dosya"].eq("") | table["Yeni Dosya"].eq("")
+        return table.sort_values(["_eşsiz", "Araç"], kind='stable').drop(columns="_eşsiz").reset_index(drop=True)
+
+    @property
+    def compared_count(self) -> int:
+        """Hatasız karşılaştırılan çift sayısı"""
+        return sum(1 for row in self.rows if row["Yöntem"] and not row["Hata"])
+
+    @property
+    def failed_count(self) -> int:
+        """Hata veren veya eşi bulunamayan dosya/çift sayısı"""
+        return sum(1 for row in self.rows if row["Hata"])
+
+    @property
+    def difference_count(self) -> int:
+        """Eksik veya yeni carisi olan araç sayısı"""
+        return sum(1 for row in self.rows if not row["Hata"] and (row["Eksik"] or row["Yeni"]))
+
+    @property
+    def status_text(self) -> str:
+        pair_seconds = sum(row["Toplam (sn)"] or 0 for row in self.rows)
+        return (
+            f"Toplu karşılaştırma: {self.compared_count} araç karşılaştırıldı, {self.difference_count} araçta fark var, "
+            f"{self.failed_count} dosya/çift atlandı veya hata verdi. Süre {self.elapsed:.1f} sn ({self.workers} süreç; "
+            f"çiftlerin toplam süresi {pair_seconds:.1f} sn)."
+        )
+
+
+def summary_row(vehicle: Optional[str], old_path: str = "", new_path: str = "", error: Optional[str] = None) -> Dict[str, Any]:
+    """Boş özet satırı (sonuç alanları karşılaştırmadan sonra doldurulur)"""
+    row: Dict[str, Any] = dict.fromkeys(BATCH_COLUMNS)
+    row.update({
+        "Araç": vehicle or "",
+        "Depo": "",
+        "Eski Dosya": Path(old_path).name if old_path else "",
+        "Yeni Dosya": Path(new_path).name if new_path else "",
+        "Yöntem": "",
+        "Çıktılar": "",
+        "Hata": error or "",
+    })
+    return row
+
+
+def pair_exports(old_files: List[Tuple[str, Optional[str]]],
+                 new_files: List[Tuple[str, Optional[str]]]) -> Tuple[List[VehiclePair], List[Dict[str, Any]]]:
+    """(dosya, araç numarası) listelerinden araç bazında çiftler ve eşleşmeyen dosyaların özet satırları
+
+    Listeler güne göre sıralı verilir; bir klasörde aynı araca ait birden
+    fazla dosya varsa en yenisi kullanılır, diğerleri özette atlandı
+    olarak gösterilir. Çiftler araç numarası sırasıyla döner.
+    """
+    unmatched: List[Dict[str, Any]] = []
+
+    def by_vehicle(files: List[Tuple[str, Optional[str]]], side: str) -> Dict[str, str]:
+        found: Dict[str, str] = {}
+        for file_path, vehicle in files:
+            old_path, new_path = (file_path, "") if side == "old" else ("", file_path)
+            if vehicle is None:
+                unmatched.append(summary_row(None, old_path, new_path, "Araç numarası bulunamadı"))
+                continue
+            if vehicle in found:
+                logging.warning(f"Araç {vehicle} için birden fazla dosya var, en yenisi kullanılıyor: {file_path}")
+                previous = found[vehicle]
+                skipped = (previous, "") if side == "old" else ("", previous)
+                unmatched.append(summary_row(vehicle, *skipped, error=f"Daha yeni dosya kullanıldı: {Path(file_path).name}"))
+            found[vehicle] = file_path
+        return found
+
+    old_by_vehicle = by_vehicle(old_files, "old")
+    new_by_vehicle = by_vehicle(new_files, "new")
+
+    pairs: List[VehiclePair] = []
+    for vehicle in sorted(set(old_by_vehicle) | set(new_by_vehicle)):
+        if vehicle not in new_by_vehicle:
+            unmatched.append(summary_row(vehicle, old_path=old_by_vehicle[vehicle], error="Yeni klasörde eşi yok"))
+        elif vehicle not in old_by_vehicle:
+            unmatched.append(summary_row(vehicle, new_path=new_by_vehicle[vehicle], error="Eski klasörde eşi yok"))
+        else:
+            pairs.append((vehicle, old_by_vehicle[vehicle], new_by_vehicle[vehicle]))
+    return pairs, unmatched
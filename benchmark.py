@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Excel Karşılaştırma Uygulaması - Performans Ölçümü
+Okuma motorlarının hızını örnek veya gerçek bir dosya üzerinde karşılaştırır.
+
+Kullanım:
+    python benchmark.py                      # 500.000 satırlık örnek dosya üretir
+    python benchmark.py --rows 100000
+    python benchmark.py --file ihracat.xlsx  # gerçek dosya ile ölç
+    python benchmark.py --compare            # karşılaştırma motorunun ölçeklenmesi
+    python benchmark.py --compare --names 1000000 5000000
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from comparison import clean_names, missing_names
+from normalization import NameNormalizer
+from excel_reader import LoadedWorkbook, READER_ENGINES
+
+# Constants
+DEFAULT_ROWS = 500_000
+DEFAULT_EXTRA_COLUMNS = 30
+DEFAULT_NAME_COUNTS = [100_000, 1_000_000, 3_000_000]
+MISSING_RATIO = 0.05
+
+
+def create_sample_workbook(path: Path, rows: int, extra_columns: int = DEFAULT_EXTRA_COLUMNS) -> None:
+    """Depo ihracatına benzeyen örnek bir çalışma kitabı oluştur"""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(["Cari Liste Raporu"])
+    sheet.append(["Cari Kategori 3 : [120.02] İZMİR ARAÇ 02"])
+    sheet.append([])
+    sheet.append(["Cari Kodu", "Cari Ünvan"] + [f"Alan {i}" for i in range(extra_columns)])
+
+    rng = random.Random(42)
+    for i in range(rows):
+        sheet.append(
+            [f"C{i:07d}", f"MÜŞTERİ {i} GIDA LTD. ŞTİ."]
+            + [rng.randint(0, 100_000) for _ in range(extra_columns)]
+        )
+    workbook.save(path)
+
+
+def _pandas_baseline(file_path: str) -> int:
+    """Eski yöntem: başlık araması + tüm sütunlarla tam okuma"""
+    pd.read_excel(file_path, header=None, nrows=15)
+    df = pd.read_excel(file_path, header=3)
+    return len(df["Cari Ünvan"])
+
+
+def _streaming(engine: str) -> Callable[[str], int]:
+    def _run(file_path: str) -> int:
+        workbook = LoadedWorkbook(file_path, streaming=True, engine=engine)
+        return len(workbook.frame(workbook.header_row))
+    return _run
+
+
+def run_benchmark(file_path: str) -> List[Tuple[str, float, int]]:
+    """Her yöntemi çalıştır ve süreleri döndür"""
+    methods = [("pandas (tam okuma)", _pandas_baseline)]
+    for name, engine in READER_ENGINES.items():
+        if engine.is_available() and engine.supports(file_path):
+            methods.append((f"{name} akış", _streaming(name)))
+
+    results = []
+    for name, method in methods:
+        start = time.perf_counter()
+        count = method(file_path)
+        elapsed = time.perf_counter() - start
+        results.append((name, elapsed, count))
+        print(f"  {name:<22} {elapsed:8.2f} sn   {count} satır")
+    return results
+
+
+def create_name_lists(count: int, seed: int = 42) -> Tuple[pd.Series, pd.Series, List[str]]:
+    """Tekrarlı ve boş değerler içeren eski/yeni cari ünvan sütunları ve beklenen sonucu üret
+
+    Yeni dosyada ünvanlar farklı yazılışlarla (Türkçe büyük harf, açık
+    şirket türü, farklı noktalama) yer alır; normalleştirme sonrası eşleşmeleri gerekir.
+    """
+    rng = np.random.default_rng(seed)
+    ids = rng.integers(0, count, size=count)
+    old = pd.Series([f" Müşteri {i} Gıda Ltd. Şti. " for i in ids], dtype=object)
+    old[rng.random(count) < 0.01] = None
+
+    kept = ids[rng.random(count) >= MISSING_RATIO]
+    spellings = ("MÜŞTERİ {} GIDA LİMİTED ŞİRKETİ", "Müşteri {} Gıda Ltd.Şti.", "MÜŞTERİ  {} GIDA LTD ŞTİ")
+    new = pd.Series([spellings[i % 3].format(i) for i in rng.permutation(kept)], dtype=object)
+
+    kept_set = set(kept.tolist())
+    expected = pd.unique(pd.Series(
+        [f"Müşteri {i} Gıda Ltd. Şti." for i, name in zip(ids, old) if name is not None and i not in kept_set],
+        dtype=object
+    )).tolist()
+    return old, new, expected
+
+
+def _python_comparison(old: pd.Series, new: pd.Series) -> List[str]:
+    """Eski yöntem: apply ile temizlik, Python set ve str.upper (Türkçe harfleri ve yazılış farklarını tanımaz)"""
+    def extract(series: pd.Series) -> List[str]:
+        values = series.dropna().apply(lambda x: x.strip() if isinstance(x, str) else str(x).strip()).tolist()
+        return [x for x in values if x and x.strip()]
+
+    list1, list2 = extract(old), extract(new)
+    list2_upper_set = {unvan.upper() for unvan in list2}
+    unique_list = [unvan for unvan in list1 if unvan.upper() not in list2_upper_set]
+    seen = set()
+    return [x for x in unique_list if not (x in seen or seen.add(x))]
+
+
+def _pandas_comparison(old: pd.Series, new: pd.Series) -> List[str]:
+    """comparison modülü: normalleştirilmiş anahtarlar, factorize ve bool maske"""
+    return missing_names(clean_names(old), clean_names(new), NameNormalizer())
+
+
+def run_comparison_benchmark(counts: List[int]) -> None:
+    """Karşılaştırma motorunu farklı liste boyutlarında ölç
+
+    Eski yöntem farklı yazılışları eşleştiremediği için fark sayısı yüksek
+    çıkar; doğruluk normalleştirilmiş sonucun beklenen listeyle aynı olmasıyla kontrol edilir.
+    """
+    print(f"  {'ad sayısı':>10} {'python':>10} {'pandas':>10} {'hız':>7}  {'fark (python)':>13}  fark")
+    for count in counts:
+        old, new, expected = create_name_lists(count)
+
+        start = time.perf_counter()
+        python_result = _python_comparison(old, new)
+        python_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = _pandas_comparison(old, new)
+        pandas_elapsed = time.perf_counter() - start
+
+        if result != expected:
+            raise AssertionError(f"Sonuçlar farklı ({count} ad)")
+        print(
+            f"  {count:>10} {python_elapsed:>8.2f}sn {pandas_elapsed:>8.2f}sn "
+            f"{python_elapsed / pandas_elapsed:>6.1f}x  {len(python_result):>13}  {len(result)}"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Excel okuma performans ölçümü")
+    parser.add_argument("--file", help="Ölçülecek Excel dosyası (verilmezse örnek üretilir)")
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROWS, help="Örnek dosyadaki satır sayısı")
+    parser.add_argument("--compare", action="store_true", help="Okuma yerine karşılaştırma motorunu ölç")
+    parser.add_argument("--names", type=int, nargs="+", default=DEFAULT_NAME_COUNTS,
+                        help="Karşılaştırma ölçümündeki ad sayıları")
+    args = parser.parse_args()
+
+    if args.compare:
+        run_comparison_benchmark(args.names)
+        return 0
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        if args.file:
+            file_path = args.file
+        else:
+            file_path = str(Path(temp_dir) / "ornek.xlsx")
+            print(f"Örnek dosya oluşturuluyor ({args.rows} satır)...")
+            create_sample_workbook(Path(file_path), args.rows)
+
+        size_mb = Path(file_path).stat().st_size / (1024 * 1024)
+        print(f"Dosya: {file_path} ({size_mb:.1f}MB)")
+
+        results = run_benchmark(file_path)
+
+    baseline = results[0][1]
+    print()
+    for name, elapsed, _ in results[1:]:
+        print(f"  {name:<22} {baseline / elapsed:5.1f}x hızlı")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
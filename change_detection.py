@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Excel Karşılaştırma Uygulaması - Değişiklik Tespiti
+İki dosyada da bulunan carilerin diğer alanlarını (bakiye, adres, kategori
+vb.) satır özetleriyle karşılaştırır; sütun bazında fark sadece özeti
+değişen satırlar için hesaplanır.
+"""
+
+import logging
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_float_dtype
+
+from comparison import KeyValues, combine_hashes
+
+# Constants
+CHANGE_COLUMNS = ("Cari Ünvan", "Alan", "Eski Değer", "Yeni Değer")
+UNNAMED_PREFIX = "Unnamed:"  # başlığı boş sütunlar (pandas adlandırması)
+FACTORIZE_SAMPLE_ROWS = 10_000
+FACTORIZE_MAX_RATIO = 0.5  # örnekte tekrarsız değer oranı bunun altındaysa sütun factorize edilir
+
+
+def compared_columns(old_frame: pd.DataFrame, new_frame: pd.DataFrame,
+                     excluded: Iterable[str] = ()) -> List[str]:
+    """İki dosyada da bulunan, anahtar olmayan ve başlığı boş olmayan sütunlar (eski dosyadaki sırayla)"""
+    excluded = {str(name).strip().casefold() for name in excluded}
+    new_columns = set(new_frame.columns)
+    columns = [
+        column for column in old_frame.columns
+        if column in new_columns
+        and str(column).strip().casefold() not in excluded
+        and not str(column).startswith(UNNAMED_PREFIX)
+    ]
+    only_one_side = [c for c in set(old_frame.columns) ^ new_columns if not str(c).startswith(UNNAMED_PREFIX)]
+    if only_one_side:
+        logging.info(f"Sadece bir dosyada bulunan sütunlar karşılaştırılmadı: {', '.join(map(str, only_one_side))}")
+    return columns
+
+
+def column_text(values: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """Sütunu karşılaştırma için metne çevir: (satır kodları, kodların metinleri)
+
+    Hücre döngüsü olmadan, sütun bazında çalışır. Tekrarlı sütunlar (bakiye,
+    kategori gibi) önce factorize edilir ve sadece tekrarsız değerler metne
+    çevrilir; örneğe göre değerleri çoğunlukla tekrarsız olan sütunlarda
+    kodlar satır numaralarıdır. Boş hücreler '' olur, baş/son boşluklar
+    atılır. Boş hücre yüzünden float'a dönmüş sütunlarda tam sayı değerli
+    ondalıklar '120' olarak yazılır; böylece aynı değer iki dosyada farklı
+    dtype ile okunsa da eşit çıkar.
+    """
+    sample = values.iloc[:FACTORIZE_SAMPLE_ROWS]
+    if len(sample) and sample.nunique(dropna=False) <= len(sample) * FACTORIZE_MAX_RATIO:
+        codes, uniques = pd.factorize(values, use_na_sentinel=False)
+        values = pd.Series(uniques)
+    else:
+        codes = np.arange(len(values))
+
+    missing = values.isna().to_numpy()
+    if is_float_dtype(values.dtype):
+        integral = ~missing & (values.to_numpy() % 1 == 0)
+        text = values.astype(str).to_numpy(dtype=object)
+        text[integral] = values[integral].astype(np.int64).astype(str).to_numpy(dtype=object)
+    else:
+        text = values.astype(str).str.strip().to_numpy(dtype=object)
+    text[missing] = ''
+    return codes, text
+
+
+def row_fingerprints(columns: List[Tuple[np.ndarray, np.ndarray]], row_count: int) -> np.ndarray:
+    """Her satır için sütun metinlerinin 64 bit özeti (column_text çıktıları üzerinde)"""
+    if not columns:
+        return np.zeros(row_count, dtype=np.uint64)
+    return combine_hashes([pd.util.hash_array(text, categorize=False)[codes] for codes, text in columns])
+
+
+def detect_changes(old_frame: pd.DataFrame, new_frame: pd.DataFrame, old_keys: KeyValues, new_keys: KeyValues,
+                   old_names: pd.Series, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """İki dosyada da bulunan ve en az bir alanı değişen cariler
+
+    Satırlar anahtarlarla eşleştirilir (tekrarlı anahtarlarda ilk satır
+    kullanılır). Önce satır özetleri karşılaştırılır; sadece özeti farklı
+    satırlar için sütunlar NumPy dizileri üzerinde karşılaştırılır.
+    Her değişen alan bir satırdır: (Cari Ünvan, Alan, Eski Değer, Yeni Değer).
+    old_frame/old_keys/old_names aynı sıra ve uzunluktadır (yeni dosya için de).
+    """
+    if columns is None:
+        columns = compared_columns(old_frame, new_frame)
+    old_columns = [column_text(old_frame[column]) for column in columns]
+    new_columns = [column_text(new_frame[column]) for column in columns]
+
+    # Her anahtarın ilk satırı; eski satırlar yeni dosyadaki karşılıklarıyla eşleştirilir (join)
+    old_rows = np.flatnonzero(~pd.Series(old_keys).duplicated().to_numpy())
+    new_rows = np.flatnonzero(~pd.Series(new_keys).duplicated().to_numpy())
+    positions = pd.Index(np.asarray(new_keys)[new_rows]).get_indexer(np.asarray(old_keys)[old_rows])
+    matched = positions >= 0
+    old_rows, new_rows = old_rows[matched], new_rows[positions[matched]]
+
+    old_fingerprints = row_fingerprints(old_columns, len(old_frame))
+    new_fingerprints = row_fingerprints(new_columns, len(new_frame))
+    changed = old_fingerprints[old_rows] != new_fingerprints[new_rows]
+    old_rows, new_rows = old_rows[changed], new_rows[changed]
+    logging.info(f"Değişiklik tespiti: {len(changed)} ortak cari, {len(old_rows)} tanesinde değişiklik")
+
+    # Sütun bazında fark sadece değişen satırlarda
+    rows, fields, old_values, new_values = [], [], [], []
+    for field, ((old_codes, old_text), (new_codes, new_text)) in enumerate(zip(old_columns, new_columns)):
+        before = old_text[old_codes[old_rows]]
+        after = new_text[new_codes[new_rows]]
+        differs = np.flatnonzero(before != after)
+        rows.append(differs)
+        fields.append(np.full(len(differs), field))
+        old_values.append(before[differs])
+        new_values.append(after[differs])
+
+    if not rows:
+        return pd.DataFrame(columns=list(CHANGE_COLUMNS))
+    rows, fields = np.concatenate(rows), np.concatenate(fields)
+    order = np.lexsort((fields, rows))  # cari sırası, sonra sütun sırası
+    return pd.DataFrame({
+        CHANGE_COLUMNS[0]: pd.Series(old_names).to_numpy(dtype=object)[old_rows[rows[order]]],
+        CHANGE_COLUMNS[1]: np.asarray(columns, dtype=object)[fields[order]],
+        CHANGE_COLUMNS[2]: np.concatenate(old_values)[order],
+        CHANGE_COLUMNS[3]: np.concatenate(new_values)[order],
+    })
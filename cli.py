@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Excel Karşılaştırma Uygulaması - Komut Satırı
+Ekransız sunucularda (cron vb.) karşılaştırma yapar: tkinter ve arayüz
+modülleri yüklenmez, sonuç JSON olarak standart çıktıya yazılır.
+
+Kullanım:
+    python main.py compare ESKI.xlsx YENI.xlsx --out sonuc --format xlsx,png,csv --case-sensitive
+    python main.py batch ESKI_KLASOR YENI_KLASOR --out cikti_klasoru --format xlsx
+    python main.py split ESKI_TUM.xlsx YENI_TUM.xlsx --out cikti_klasoru
+    python main.py watch PAYLASIM_KLASORU --out cikti_klasoru
+
+'watch' komutu durdurulana kadar çalışır ve her karşılaştırmayı bir JSON
+satırı olarak yazar.
+
+Çıkış kodları: 0 fark yok, 1 eksik veya yeni cari var, 2 hatalı seçenek,
+3 karşılaştırma yapılamadı, 4 karşılaştırma yapıldı ama sonuç kaydedilemedi
+(toplu modda: bir araç çifti karşılaştırılamadı veya eşi bulunamadı).
+"""
+
+import argparse
+import json
+import logging
+import signal
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from batch import BatchSummary
+from comparison import KEY_SEPARATOR
+from engine import ComparisonEngine, ComparisonError, ComparisonResult, OUTPUT_FORMATS, EXCEL_FORMAT, setup_logging
+from excel_reader import available_engines
+from watch import DEFAULT_POLL_INTERVAL, DEFAULT_SETTLE_SECONDS, WATCH_OUTPUT_NAME, ExportWatcher
+
+# Constants
+EXIT_NO_DIFFERENCE = 0
+EXIT_DIFFERENCES = 1
+EXIT_USAGE = 2  # argparse de hatalı seçenekte bu kodla çıkar
+EXIT_FAILED = 3
+EXIT_SAVE_FAILED = 4
+
+
+class CommandLineComparison(ComparisonEngine):
+    """Arayüzsüz karşılaştırma: mesajları ve sonucu JSON raporu için toplar"""
+
+    def __init__(self, key_columns: Optional[str] = None):
+        super().__init__(key_columns)
+        self.report: Optional[Dict[str, Any]] = None
+        self.saved_files: List[Tuple[str, str]] = []
+
+    def _publish_results(self, result: ComparisonResult) -> None:
+        diff = result.diff
+        self.report = {
+            "depot": result.depo_name,
+            "summary": result.status_text,
+            "method": result.method,
+            "total": result.total_count,
+            "removed_count": result.removed_count,
+            "added_count": result.added_count,
+            "common_count": result.common_count,
+            "removed": list(result.iter_removed()),
+            "added": list(result.iter_added()),
+        }
+        if result.near_matches is not None:
+            self.report["near_matches"] = {
+                name: {"match": match, "similarity": round(score, 4)}
+                for name, (match, score) in result.near_matches.items()
+            }
+        if diff.changes is not None:
+            self.report["changes"] = json.loads(diff.changes.to_json(orient='records', force_ascii=False))
+        if diff.count_changes is not None:
+            self.report["count_changes"] = json.loads(diff.count_changes.to_json(orient='records', force_ascii=False))
+
+    def _show_save_result(self, saved_files: List[Tuple[str, str]], formats: List[str]) -> None:
+        self.saved_files = list(saved_files)
+        super()._show_save_result(saved_files, formats)
+
+
+def parse_compare_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """'compare' komutunun seçenekleri"""
+    parser = argparse.ArgumentParser(
+        prog="main.py compare",
+        description="İki Excel dosyasını arayüz açmadan karşılaştırır, sonucu JSON olarak yazar"
+    )
+    parser.add_argument("old", help="Eski tarihli Excel dosyası")
+    parser.add_argument("new", help="Yeni tarihli Excel dosyası")
+    parser.add_argument(
+        "--out", default="",
+        help="Çıktı dosyalarının yolu, uzantısız (varsayılan: çalışma dizininde zaman damgalı ad)"
+    )
+    args = _parse_options(parser, argv)
+    # Uzantı verilmişse atılır, her biçim kendi uzantısını ekler
+    if Path(args.out).suffix.lower().lstrip(".") in OUTPUT_FORMATS:
+        args.out = str(Path(args.out).with_suffix(""))
+    return args
+
+
+def parse_batch_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """'batch' komutunun seçenekleri"""
+    parser = argparse.ArgumentParser(
+        prog="main.py batch",
+        description="İki klasördeki araç dosyalarını araç numarasına göre eşleştirip paralel karşılaştırır"
+    )
+    parser.add_argument("old", help="Eski tarihli araç dosyalarının klasörü")
+    parser.add_argument("new", help="Yeni tarihli araç dosyalarının klasörü")
+    parser.add_argument(
+        "--out", default="",
+        help="Araç çıktılarının ve özetin yazılacağı klasör (varsayılan: çalışma dizininde zaman damgalı ad)"
+    )
+    return _parse_options(parser, argv)
+
+
+def parse_split_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """'split' komutunun seçenekleri"""
+    parser = argparse.ArgumentParser(
+        prog="main.py split",
+        description="Tüm depoları içeren iki dosyayı depo sütunundaki araç numarasına göre ayırıp karşılaştırır"
+    )
+    parser.add_argument("old", help="Eski tarihli birleşik Excel dosyası")
+    parser.add_argument("new", help="Yeni tarihli birleşik Excel dosyası")
+    parser.add_argument(
+        "--out", default="",
+        help="Araç çıktılarının yazılacağı klasör (varsayılan: çalışma dizininde zaman damgalı ad)"
+    )
+    return _parse_options(parser, argv)
+
+
+def parse_watch_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """'watch' komutunun seçenekleri"""
+    parser = argparse.ArgumentParser(
+        prog="main.py watch",
+        description="Klasöre gelen yeni Excel dosyalarını aynı aracın önceki dosyasıyla otomatik karşılaştırır"
+    )
+    parser.add_argument("folder", help="ERP dosyalarının bırakıldığı klasör")
+    parser.add_argument(
+        "--out", default="",
+        help=f"Sonuçların ve izleme özetinin yazılacağı klasör (varsayılan: {WATCH_OUTPUT_NAME})"
+    )
+    parser.add_argument(
+        "--settle", type=float, default=DEFAULT_SETTLE_SECONDS, metavar="SN",
+        help="Dosya bu kadar saniye değişmeden kalınca yazımı bitmiş sayılır"
+    )
+    parser.add_argument(
+        "--interval", type=float, default=DEFAULT_POLL_INTERVAL, metavar="SN",
+        help="Tarama aralığı (inotify kullanılamadığında)"
+    )
+    parser.add_argument("--poll", action="store_true", help="inotify yerine klasörü tarayarak izle (ağ paylaşımları için)")
+    parser.add_argument("--workers", type=int, default=None, help="Paralel karşılaştırma süreci sayısı (varsayılan: işlemci sayısı)")
+    return _parse_options(parser, argv)
+
+
+def _parse_options(parser: argparse.ArgumentParser, argv: Optional[List[str]]) -> argparse.Namespace:
+    """Karşılaştırma seçeneklerini ekleyip komutu ayrıştırır"""
+    parser.add_argument(
+        "--format", dest="formats", default=EXCEL_FORMAT,
+        help=f"Virgülle ayrılmış çıktı biçimleri: {', '.join(OUTPUT_FORMATS)} (boş bırakılırsa dosya yazılmaz)"
+    )
+    parser.add_argument("--case-sensitive", action="store_true", help="Büyük/küçük harf duyarlı karşılaştır")
+    parser.add_argument(
+        "--key", dest="key_columns", default=None,
+        help=f"Karşılaştırma anahtarı sütunları, '{KEY_SEPARATOR}' ile ayrılır (örn. \"Cari Kodu + Cari Ünvan\")"
+    )
+    parser.add_argument("--engine", choices=available_engines(), default=None, help="Excel okuma motoru")
+    parser.add_argument(
+        "--fuzzy", type=float, nargs="?", const=-1.0, default=None, metavar="ESIK",
+        help="Benzer adları eşleşmiş say (eşik 0-1 arası; verilmezse ayarlardaki eşik)"
+    )
+    parser.add_argument("--changes", action="store_true", help="Ortak carilerin değişen alanlarını da bul")
+    parser.add_argument("--counts", action="store_true", help="Cari başına satır sayısı farklarını da bul")
+
+    args = parser.parse_args(argv)
+    args.formats = [item.strip().lower() for item in args.formats.split(",") if item.strip()]
+    unknown = [item for item in args.formats if item not in OUTPUT_FORMATS]
+    if unknown:
+        parser.error(f"Bilinmeyen çıktı biçimi: {', '.join(unknown)} (seçenekler: {', '.join(OUTPUT_FORMATS)})")
+    return args
+
+
+def _create_comparison(args: argparse.Namespace) -> CommandLineComparison:
+    """Komut satırı seçenekleriyle karşılaştırma nesnesini oluşturur"""
+    comparison = CommandLineComparison(args.key_columns)
+    comparison.output_formats = args.formats
+    comparison.case_sensitive.set(args.case_sensitive)
+    if args.engine:
+        comparison.reader_engine.set(args.engine)
+    if args.fuzzy is not None:
+        comparison.fuzzy_matching.set(True)
+        if args.fuzzy >= 0:
+            comparison.similarity_threshold.set(args.fuzzy)
+    if args.changes:
+        comparison.change_detection.set(True)
+    if args.counts:
+        comparison.count_comparison.set(True)
+    return comparison
+
+
+def _report_outcome(comparison: CommandLineComparison) -> Optional[Tuple[int, int]]:
+    """Tek dosya/birleşik dosya raporundan (başarısız, farklı) sayıları; rapor yoksa None"""
+    if comparison.report is None:
+        return None
+    return 0, comparison.report["removed_count"] + comparison.report["added_count"]
+
+
+def _run_command(args: argparse.Namespace, comparison: CommandLineComparison, runner: Callable[[], Any],
+                 context: str, outcome: Callable[[Any], Optional[Tuple[int, int]]],
+                 report_fields: Callable[[Any], Dict[str, Any]]) -> int:
+    """Komutu çalıştırır, JSON raporunu yazar ve çıkış kodunu döndürür
+
+    runner karşılaştırmayı yapar, dönüş değeri outcome ve report_fields'a
+    verilir (hata olduysa None). outcome (başarısız, farklı) sayılarını,
+    karşılaştırma hiç yapılamadıysa None döndürür; report_fields komuta
+    özgü rapor alanlarıdır.
+    """
+    value = None
+    try:
+        value = runner()
+    except ComparisonError as e:
+        comparison.messages.append(("error", "Hata", str(e)))
+    except Exception as e:
+        logging.error(f"Komut satırı {context} hatası: {e}")
+        comparison.messages.append(("error", "Hata", str(e)))
+
+    errors = [message for level, _, message in comparison.messages if level == "error"]
+    counts = outcome(value)
+    if counts is None:
+        exit_code = EXIT_FAILED
+    elif errors or counts[0]:
+        exit_code = EXIT_SAVE_FAILED
+    elif counts[1]:
+        exit_code = EXIT_DIFFERENCES
+    else:
+        exit_code = EXIT_NO_DIFFERENCE
+
+    output = {
+        "old": args.old,
+        "new": args.new,
+        "exit_code": exit_code,
+        **report_fields(value),
+        "errors": errors,
+    }
+    json.dump(output, sys.stdout, ensure_ascii=False, indent=2)
+    sys.stdout.write("\n")
+    return exit_code
+
+
+def _message_fields(comparison: CommandLineComparison, start: float) -> Dict[str, Any]:
+    """Kaydedilen dosyalar, uyarılar ve geçen süre"""
+    return {
+        "outputs": [{"format": file_format, "path": path} for file_format, path in comparison.saved_files],
+        "warnings": [message for level, _, message in comparison.messages if level == "warning"],
+        "elapsed_seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+def run_cli(argv: Optional[List[str]] = None) -> int:
+    """'compare' komutunu çalıştırır; JSON raporu yazar ve çıkış kodunu döndürür"""
+    args = parse_compare_arguments(argv)
+    setup_logging()
+    start = time.perf_counter()
+    comparison = _create_comparison(args)
+
+    def _compare() -> ComparisonResult:
+        result = comparison.run(args.old, args.new)
+        comparison.report_results(result, args.out)
+        return result
+
+    def _fields(result: Optional[ComparisonResult]) -> Dict[str, Any]:
+        return {
+            **(comparison.report or {}),
+            "timings": {name: round(seconds, 3) for name, seconds in (result.timings if result else {}).items()},
+            **_message_fields(comparison, start),
+        }
+
+    return _run_command(args, comparison, _compare, "karşılaştırma", lambda _: _report_outcome(comparison), _fields)
+
+
+def run_split_cli(argv: Optional[List[str]] = None) -> int:
+    """'split' komutunu çalıştırır; araç bazında JSON raporu yazar ve çıkış kodunu döndürür"""
+    args = parse_split_arguments(argv)
+    setup_logging()
+    start = time.perf_counter()
+    comparison = _create_comparison(args)
+
+    def _compare() -> Dict[str, ComparisonResult]:
+        results = comparison.run_combined(args.old, args.new)
+        comparison.report_vehicle_results(results, args.out)
+        return results
+
+    def _fields(results: Optional[Dict[str, ComparisonResult]]) -> Dict[str, Any]:
+        return {
+            "summary": comparison.report["summary"] if comparison.report else None,
+            "vehicles": {
+                vehicle: {
+                    "depot": result.depo_name,
+                    "removed_count": result.removed_count,
+                    "added_count": result.added_count,
+                    "common_count": result.common_count,
+                    "removed": list(result.iter_removed()),
+                    "added": list(result.iter_added()),
+                }
+                for vehicle, result in (results or {}).items()
+            },
+            **_message_fields(comparison, start),
+        }
+
+    return _run_command(args, comparison, _compare, "birleşik dosya", lambda _: _report_outcome(comparison), _fields)
+
+
+def run_watch_cli(argv: Optional[List[str]] = None) -> int:
+    """'watch' komutunu çalıştırır; her karşılaştırma sonucunu bir JSON satırı olarak yazar
+
+    Ctrl+C veya SIGTERM ile durur; kuyruktaki karşılaştırmalar bitirilir.
+    """
+    args = parse_watch_arguments(argv)
+    setup_logging()
+    comparison = _create_comparison(args)
+
+    def _print_result(row: Dict[str, Any]) -> None:
+        json.dump(row, sys.stdout, ensure_ascii=False, default=str)
+        sys.stdout.write("\n")
+        sys.stdout.flush()
+
+    try:
+        watcher = ExportWatcher(
+            comparison, args.folder, args.out, settle_seconds=args.settle, poll_interval=args.interval,
+            use_inotify=not args.poll, workers=args.workers, on_result=_print_result
+        )
+    except (ValueError, OSError) as e:
+        logging.error(f"Klasör izleme başlatılamadı: {e}")
+        print(json.dumps({"errors": [str(e)]}, ensure_ascii=False))
+        return EXIT_FAILED
+
+    for signal_number in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signal_number, lambda *_: watcher.stop())
+    watcher.run()
+    return EXIT_NO_DIFFERENCE
+
+
+def run_batch_cli(argv: Optional[List[str]] = None) -> int:
+    """'batch' komutunu çalıştırır; araç bazında JSON özeti yazar ve çıkış kodunu döndürür"""
+    args = parse_batch_arguments(argv)
+    setup_logging()
+    comparison = _create_comparison(args)
+
+    def _outcome(summary: Optional[BatchSummary]) -> Optional[Tuple[int, int]]:
+        return (summary.failed_count, summary.difference_count) if summary else None
+
+    def _fields(summary: Optional[BatchSummary]) -> Dict[str, Any]:
+        return {
+            "summary": summary.status_text if summary else None,
+            "summary_files": summary.summary_paths if summary else [],
+            "workers": summary.workers if summary else 0,
+            "elapsed_seconds": round(summary.elapsed, 3) if summary else None,
+            "vehicles": json.loads(summary.table.to_json(orient='records', force_ascii=False)) if summary else [],
+        }
+
+    return _run_command(args, comparison, lambda: comparison.run_batch(args.old, args.new, args.out),
+                        "toplu karşılaştırma", _outcome, _fields)
+
+
+if __name__ == "__main__":
+    sys.exit(run_cli(sys.argv[1:]))
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Excel Karşılaştırma Uygulaması - Birleşik Dosya Karşılaştırması
+ERP bazen tüm depoları tek dosyada, depo adı 'Cari Kategori 3' başlık
+satırı yerine bir sütunda olacak şekilde verir. Her satırın araç numarası
+depo sütunundan çıkarılır ve eski/yeni dosyanın satırları tek bir groupby
+geçişinde araç bazında karşılaştırılır.
+"""
+
+import logging
+import re
+from typing import Any, Dict, Iterable, Tuple
+
+import numpy as np
+import pandas as pd
+
+from comparison import NameDiff, count_diff, diff_names
+
+# Constants
+# Depo kartı metninden araç numarası; desenler sırayla denenir (_extract_vehicle_number ile aynı)
+VEHICLE_PATTERNS = (
+    r'[İI][Zz][Mm][İi][Rr]\s+[Aa][Rr][Aa][ÇçĞğ]\s+(\d{1,2})',
+    r'[Aa]ra[çc]\s*(\d{1,2})',
+    r'[Vv]ehicle\s*(\d{1,2})',
+    r'(\d{1,2})\s*[Nn]o',
+    r'\b(\d{1,2})\b'
+)
+DEPOT_COLUMNS = ("Cari Kategori 3", "Depo", "Depo Kartı", "Depo Adı")
+COMBINED_OUTPUT_NAME = "birleşik_karşılaştırma"
+
+VehicleDiffs = Dict[str, Tuple[NameDiff, int, str]]  # araç -> (fark, eski satır sayısı, depo adı)
+
+
+def vehicle_numbers(depots: pd.Series, known: Iterable[str]) -> pd.Series:
+    """Her satırın araç numarası ("03" gibi); bulunamazsa veya config'de yoksa NaN
+
+    Desenler sırayla str.extract ile uygulanır; bir desenin bulduğu numara
+    config'de yoksa sıradaki desen denenir. Aynı depo metni çok sayıda
+    satırda tekrarlandığı için desenler tekrarsız metinler üzerinde
+    çalıştırılıp satırlara kodlarla dağıtılır.
+    """
+    codes, uniques = pd.factorize(depots.astype(object).where(depots.notna(), ""))
+    texts = pd.Series(uniques, dtype=object).astype(str)
+    known = list(known)
+
+    found = pd.Series(np.nan, index=texts.index, dtype=object)
+    for pattern in VEHICLE_PATTERNS:
+        numbers = texts.str.extract(pattern, expand=False).str.zfill(2)
+        found = found.where(found.notna(), numbers.where(numbers.isin(known)))
+
+    for text in texts[found.isna() & (texts != "")].head(5):
+        logging.warning(f"Depo metninden araç numarası çıkarılamadı: '{text}'")
+    return pd.Series(found.to_numpy()[codes], index=depots.index, dtype=object)
+
+
+def vehicle_diffs(old_rows: pd.DataFrame, old_keys: Any, new_rows: pd.DataFrame, new_keys: Any,
+                  count_changes: bool = False) -> VehicleDiffs:
+    """Eski ve yeni dosyanın satırlarını tek groupby geçişinde araç bazında karşılaştırır
+
+    Satır tabloları 'Araç', 'Depo' ve 'Cari Ünvan' sütunlarındadır; anahtarlar
+    satırlarla aynı sıradadır (metin veya bileşik uint64). İki tarafın
+    anahtarları bir kez birlikte factorize edilir, gruplarda tamsayı
+    kodlar karşılaştırılır. Araç numarası olmayan satırlar atlanır.
+    """
+    codes, _ = pd.factorize(np.concatenate([np.asarray(old_keys, dtype=object), np.asarray(new_keys, dtype=object)]))
+    rows = pd.concat([old_rows, new_rows], ignore_index=True)
+    rows["_kod"] = codes
+    rows["_yeni"] = np.arange(len(rows)) >= len(old_rows)
+
+    results: VehicleDiffs = {}
+    for vehicle, group in rows.groupby("Araç", sort=True):
+        is_new = group["_yeni"].to_numpy()
+        old_group, new_group = group[~is_new], group[is_new]
+        old_codes, new_codes = old_group["_kod"].to_numpy(), new_group["_kod"].to_numpy()
+        diff = diff_names(old_group["Cari Ünvan"], new_group["Cari Ünvan"], old_keys=old_codes, new_keys=new_codes)
+        if count_changes:
+            diff.count_changes = count_diff(old_group["Cari Ünvan"], new_group["Cari Ünvan"],
+                                            old_keys=old_codes, new_keys=new_codes)
+        # "[120.03] İZMİR ARAÇ 03" -> "İZMİR ARAÇ 03" (başlık satırındaki depo adıyla aynı)
+        depo_name = re.sub(r'^\s*\[.*?\]\s*', '', str(group["Depo"].iloc[0]))
+        results[vehicle] = (diff, len(old_group), depo_name)
+    return results
+
+
+def labelled_diff(results: VehicleDiffs) -> NameDiff:
+    """Tüm araçların farkları tek listede ("ÜNVAN (Araç NN)" biçiminde)"""
+    removed, added, common_count = [], [], 0
+    for vehicle, (diff, _, _) in results.items():
+        removed.extend(f"{name} (Araç {vehicle})" for name in diff.removed)
+        added.extend(f"{name} (Araç {vehicle})" for name in diff.added)
+        common_count += diff.common_count
+    return NameDiff(removed=removed, added=added, common_count=common_count)
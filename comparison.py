@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Excel Karşılaştırma Uygulaması - Karşılaştırma Motoru
+Cari ünvan listelerini pandas/NumPy ile temizler ve normalleştirilmiş
+anahtarlarla karşılaştırır.
+"""
+
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_float_dtype, is_object_dtype
+
+from fuzzy_match import DEFAULT_SIMILARITY_THRESHOLD, TrigramIndex
+from normalization import NameNormalizer
+
+NameValues = Union[pd.Series, Iterable]
+NearMatch = Tuple[Optional[str], float]  # (en yakın ad, benzerlik)
+KeyValues = Union[pd.Series, np.ndarray]  # normalleştirilmiş metin veya 64 bit bileşik anahtar
+
+KEY_SEPARATOR = '+'  # "Cari Kodu + Cari Ünvan"
+COUNT_COLUMNS = ("Cari Ünvan", "Eski Adet", "Yeni Adet", "Fark")
+HASH_MULTIPLIER = np.uint64(0x100000001B3)  # FNV-1a 64 bit çarpanı
+
+
+def clean_names(values: NameValues) -> pd.Series:
+    """Boş/NaN hücreleri at, metne çevir ve baş/son boşlukları temizle
+
+    Sayısal hücreler str() ile metne çevrilir; temizlik sonrası boş kalan
+    değerler atılır. Sıra korunur.
+    """
+    series = _as_series(values).dropna()
+    text = series.astype(str).str.strip()
+    return text[text != ''].reset_index(drop=True)
+
+
+def clean_key_rows(values: NameValues, parts: Dict[str, list]) -> Tuple[pd.Series, Dict[str, pd.Series]]:
+    """clean_names ile aynı temizlik; ek anahtar sütunlarından aynı satırlar atılır
+
+    Ünvanı boş olan satırlar iki taraftan da çıkarıldığı için dönen
+    sütunlar temizlenmiş adlarla aynı sıra ve uzunluktadır.
+    """
+    series = _as_series(values).reset_index(drop=True)
+    text = series.astype(str).str.strip()
+    keep = (series.notna() & (text != '')).to_numpy()
+    names = text[keep].reset_index(drop=True)
+    return names, {column: _as_series(part)[keep].reset_index(drop=True) for column, part in parts.items()}
+
+
+def parse_key_columns(spec: Union[str, Iterable[str], None]) -> Tuple[str, ...]:
+    """Anahtar tanımını ("Cari Kodu + Cari Ünvan") sütun adlarına ayır; boşsa sadece ünvan kullanılır"""
+    if not spec:
+        return ()
+    columns = spec.split(KEY_SEPARATOR) if isinstance(spec, str) else spec
+    return tuple(column.strip() for column in columns if isinstance(column, str) and column.strip())
+
+
+def composite_keys(name_keys: Optional[pd.Series], parts: Dict[str, pd.Series],
+                   normalizer: Optional[NameNormalizer] = None) -> np.ndarray:
+    """Ünvan anahtarı ve ek sütunlardan tek bir uint64 anahtar dizisi
+
+    Ek sütunlar (cari kodu gibi) metne çevrilip sadece büyük/küçük harf
+    açısından normalleştirilir. Her sütun pandas'ın hash_array fonksiyonuyla
+    64 bit tamsayıya indirgenip satır bazında birleştirilir; karşılaştırma
+    böylece metin yerine sabit genişlikli tamsayılar üzerinde yapılır.
+    Tekrarlı ünvan anahtarları özetlenmeden önce factorize edilir.
+    """
+    normalizer = normalizer or NameNormalizer()
+    part_normalizer = NameNormalizer(case_sensitive=normalizer.case_sensitive, nfkc=False, collapse_whitespace=False,
+                                     strip_punctuation=False, canonical_suffixes=False)
+    columns = []
+    if name_keys is not None:
+        codes, uniques = pd.factorize(pd.Series(name_keys))
+        columns.append(pd.util.hash_array(np.asarray(uniques, dtype=object), categorize=False)[codes])
+    for part in parts.values():
+        text = part_normalizer.normalize(key_text(part))
+        columns.append(pd.util.hash_array(text.to_numpy(dtype=object), categorize=False))
+    if not columns:
+        raise ValueError("Anahtar için en az bir sütun gerekli")
+    return combine_hashes(columns)
+
+
+def combine_hashes(columns: List[np.ndarray]) -> np.ndarray:
+    """Aynı uzunluktaki uint64 sütun özetlerini satır bazında sırayla karıştır
+
+    Sıra önemlidir: (a, b) ile (b, a) farklı sonuç verir. uint64 taşması
+    modüler aritmetiktir.
+    """
+    combined = columns[0].copy()
+    for column in columns[1:]:
+        combined = (combined * HASH_MULTIPLIER) ^ column
+    return combined
+
+
+def composite_display(names: pd.Series, parts: Dict[str, pd.Series]) -> pd.Series:
+    """Sonuçlarda gösterilecek yazılış: "ÜNVAN [kod]" (ek sütun yoksa ünvanın kendisi)"""
+    names = _as_series(names).reset_index(drop=True)
+    if not parts:
+        return names
+    values = [key_text(part) for part in parts.values()]
+    label = values[0]
+    for value in values[1:]:
+        label = label + ' / ' + value
+    return names.astype(str) + ' [' + label + ']'
+
+
+def key_text(values: NameValues) -> pd.Series:
+    """Anahtar hücrelerini metne çevir: boşlar '', tam sayı değerli ondalıklar '120' (motorlar arası aynı sonuç)"""
+    series = _as_series(values).reset_index(drop=True)
+    missing = series.isna().to_numpy()
+    raw = series.astype(str)
+    text = raw.str.strip().to_numpy(dtype=object)
+    if is_float_dtype(series.dtype) or is_object_dtype(series.dtype):
+        numbers = pd.to_numeric(series, errors='coerce') if is_object_dtype(series.dtype) else series
+        integral = ~missing & (numbers.to_numpy() % 1 == 0)
+        if is_object_dtype(series.dtype):
+            # Karışık sütunda sadece float hücreler: metin hücresi kendi str() değerine eşittir,
+            # float hücrenin str() değeri sayısal karşılığınınkiyle aynıdır (tam sayı, tarih hariç)
+            raw = raw.to_numpy(dtype=object)
+            integral &= (series.to_numpy() != raw) & (raw == numbers.astype(str).to_numpy(dtype=object))
+        text[integral] = numbers[integral].astype(np.int64).astype(str).to_numpy(dtype=object)
+    text[missing] = ''
+    return pd.Series(text, dtype=object)
+
+
+def missing_names(old_names: NameValues, new_names: NameValues, normalizer: Optional[NameNormalizer] = None,
+                  old_keys: Optional[pd.Series] = None, new_keys: Optional[pd.Series] = None) -> List[str]:
+    """Eski listede olup yeni listede olmayan adlar (tekrarsız, ilk görülme sırasıyla)
+
+    Eşleştirme normalleştirilmiş anahtarlarla yapılır, sonuçta orijinal
+    yazılış tutulur. Anahtarlar önceden hesaplandıysa (önbellekten)
+    old_keys/new_keys ile verilir; her biri ad listesiyle aynı uzunluktadır.
+    İki tarafın anahtarları birlikte factorize edilir ve yeni dosyadaki
+    kodlar bir NumPy bool dizisinde işaretlenir.
+    """
+    normalizer = normalizer or NameNormalizer()
+    old_names = _as_series(old_names).reset_index(drop=True)
+    if old_keys is None:
+        old_keys = normalizer.normalize(old_names)
+    if new_keys is None:
+        new_keys = normalizer.normalize(_as_series(new_names))
+
+    codes, uniques = pd.factorize(pd.concat([old_keys, new_keys], ignore_index=True))
+    in_new = np.zeros(len(uniques), dtype=bool)
+    in_new[codes[len(old_keys):]] = True
+    # pd.unique tekrarsız değerleri ilk görülme sırasıyla verir
+    return pd.unique(old_names[~in_new[codes[:len(old_keys)]]]).tolist()
+
+
+class NameDiff:
+    """İki yönlü karşılaştırma sonucu: eksik, yeni ve ortak cari ünvanlar
+
+    Listeler tekrarsızdır ve ilk görülme sırasını korur; eksik ve ortak
+    adlar eski dosyadaki, yeni adlar yeni dosyadaki yazılışla tutulur.
+    Akış modunda ortak adlar listelenmez, sadece sayıları (common_count) tutulur.
+    changes, değişiklik tespiti yapıldıysa ortak carilerin değişen alanlarıdır
+    (change_detection.detect_changes tablosu), yapılmadıysa None.
+    count_changes, adet karşılaştırması yapıldıysa satır sayısı değişen
+    carilerdir (count_diff tablosu), yapılmadıysa None.
+    """
+
+    def __init__(self, removed: List[str], added: List[str], common: Optional[List[str]] = None,
+                 common_count: Optional[int] = None, changes: Optional[pd.DataFrame] = None,
+                 count_changes: Optional[pd.DataFrame] = None):
+        self.removed = removed
+        self.added = added
+        self.common = common
+        self.common_count = common_count if common_count is not None else len(common or [])
+        self.changes = changes
+        self.count_changes = count_changes
+
+
+def diff_names(old_names: NameValues, new_names: NameValues, normalizer: Optional[NameNormalizer] = None,
+               old_keys: Optional[KeyValues] = None, new_keys: Optional[KeyValues] = None) -> NameDiff:
+    """Eksik, yeni ve ortak adları tek geçişte bul
+
+    İki tarafın anahtarları bir kez birlikte factorize edilir (build); her
+    taraftaki kodlar bir bool dizisinde işaretlenir ve diğer tarafın kodları
+    bu dizilere bakılarak ayrılır (probe). Anahtarlar metin Series'i veya
+    bileşik anahtardaki gibi uint64 dizisi olabilir.
+    """
+    normalizer = normalizer or NameNormalizer()
+    old_names = _as_series(old_names).reset_index(drop=True)
+    new_names = _as_series(new_names).reset_index(drop=True)
+    if old_keys is None:
+        old_keys = normalizer.normalize(old_names)
+    if new_keys is None:
+        new_keys = normalizer.normalize(new_names)
+
+    codes, uniques = pd.factorize(_concat_keys(old_keys, new_keys))
+    old_codes, new_codes = codes[:len(old_keys)], codes[len(old_keys):]
+    in_old = np.zeros(len(uniques), dtype=bool)
+    in_new = np.zeros(len(uniques), dtype=bool)
+    in_old[old_codes] = True
+    in_new[new_codes] = True
+
+    old_found = in_new[old_codes]
+    return NameDiff(
+        removed=pd.unique(old_names[~old_found]).tolist(),
+        added=pd.unique(new_names[~in_old[new_codes]]).tolist(),
+        common=pd.unique(old_names[old_found]).tolist(),
+    )
+
+
+def count_diff(old_names: NameValues, new_names: NameValues, normalizer: Optional[NameNormalizer] = None,
+               old_keys: Optional[KeyValues] = None, new_keys: Optional[KeyValues] = None) -> pd.DataFrame:
+    """Her anahtarın iki dosyadaki satır sayısı (adet); sadece adedi değişenler
+
+    Tekrarlar küme karşılaştırmasında tek sayılır; burada bir carinin eski
+    dosyada üç, yeni dosyada bir kez geçmesi -2 fark olarak raporlanır.
+    Anahtarlar birlikte factorize edilip kodlar np.bincount ile sayılır
+    (value_counts ile aynı sonuç, tek geçişte iki taraf). Tablo
+    (Cari Ünvan, Eski Adet, Yeni Adet, Fark) sütunlarındadır; önce eski
+    dosyadaki, sonra yeni dosyadaki ilk görülme sırasıyla ve ilk yazılışla.
+    """
+    normalizer = normalizer or NameNormalizer()
+    old_names = _as_series(old_names).reset_index(drop=True)
+    new_names = _as_series(new_names).reset_index(drop=True)
+    if old_keys is None:
+        old_keys = normalizer.normalize(old_names)
+    if new_keys is None:
+        new_keys = normalizer.normalize(new_names)
+
+    codes, uniques = pd.factorize(_concat_keys(old_keys, new_keys))
+    old_counts = np.bincount(codes[:len(old_keys)], minlength=len(uniques))
+    new_counts = np.bincount(codes[len(old_keys):], minlength=len(uniques))
+    changed = np.flatnonzero(old_counts != new_counts)
+
+    # Her kodun ilk satırı; yazılış o satırdan alınır. factorize kodları ilk görülme sırasıyla
+    # verdiğinden yeni bir kod, o ana kadarki en büyük kodun arttığı satırda ilk kez görülür
+    first_rows = np.flatnonzero(np.diff(np.maximum.accumulate(codes), prepend=-1) > 0)
+    rows = first_rows[changed]
+    in_old = rows < len(old_keys)
+    names = np.empty(len(rows), dtype=object)
+    names[in_old] = old_names.take(rows[in_old]).to_numpy(dtype=object)
+    names[~in_old] = new_names.take(rows[~in_old] - len(old_keys)).to_numpy(dtype=object)
+    return pd.DataFrame({
+        COUNT_COLUMNS[0]: names,
+        COUNT_COLUMNS[1]: old_counts[changed],
+        COUNT_COLUMNS[2]: new_counts[changed],
+        COUNT_COLUMNS[3]: new_counts[changed] - old_counts[changed],
+    })
+
+
+def fuzzy_filter(missing: List[str], new_names: NameValues, threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+                 normalizer: Optional[NameNormalizer] = None,
+                 new_keys: Optional[pd.Series] = None) -> Tuple[List[str], Dict[str, NearMatch]]:
+    """Tam eşleşmeyen adları yeni dosyadaki adlara benzerliğe göre ayır
+
+    Yeni dosyanın tekrarsız anahtarları üzerinde üçlü indeksi kurulur ve
+    her eksik ad için en yakın aday bulunur. Benzerliği eşik değerine
+    ulaşanlar eşleşmiş sayılıp listeden çıkarılır. Kalan adlar ve her biri
+    için (en yakın ad, benzerlik) döner; aday yoksa (None, 0.0).
+    """
+    normalizer = normalizer or NameNormalizer()
+    new_names = _as_series(new_names).reset_index(drop=True)
+    if new_keys is None:
+        new_keys = normalizer.normalize(new_names)
+    if not missing:
+        return [], {}
+
+    # Her tekrarsız anahtar için ilk görülen yazılış gösterilir
+    codes, uniques = pd.factorize(new_keys)
+    _, first_rows = np.unique(codes, return_index=True)
+    index = TrigramIndex(uniques.tolist())
+    displays = new_names.take(first_rows).tolist()
+
+    missing_keys = normalizer.normalize(pd.Series(missing, dtype=object)).tolist()
+    still_missing: List[str] = []
+    near: Dict[str, NearMatch] = {}
+    for name, (position, score) in zip(missing, index.best_matches(missing_keys)):
+        if position is not None and score >= threshold:
+            continue
+        still_missing.append(name)
+        near[name] = (displays[position] if position is not None else None, score)
+    return still_missing, near
+
+
+def iter_batches(values: Iterable, size: int) -> Iterator[list]:
+    """Değerleri en fazla size elemanlı listeler halinde ver"""
+    iterator = iter(values)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _concat_keys(old_keys: KeyValues, new_keys: KeyValues) -> KeyValues:
+    """İki tarafın anahtarlarını tek dizide birleştir"""
+    if isinstance(old_keys, np.ndarray) and isinstance(new_keys, np.ndarray):
+        return np.concatenate([old_keys, new_keys])
+    return pd.concat([pd.Series(old_keys), pd.Series(new_keys)], ignore_index=True)
+
+
+def _as_series(values: NameValues) -> pd.Series:
+    """Listeyi object dtype'lı Series'e çevir"""
+    if isinstance(values, pd.Series):
+        return values
+    return pd.Series(list(values), dtype=object)
@@ -0,0 +1,1596 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Excel Karşılaştırma Uygulaması - Karşılaştırma Motoru
+Tkinter gerektirmeyen karşılaştırma iş mantığı: ayarlar, dosya okuma,
+karşılaştırma yöntemleri ve sonuçların kaydedilmesi. Masaüstü arayüzü
+(main.py) ve komut satırı (cli.py) bu sınıfı genişletir; sonuçlar ve
+mesajlar _show_error, _publish_results gibi kancalarla iletilir. Arayüz
+gerektirmeyen kullanım için compare() bir ComparisonResult döndürür.
+"""
+
+import pandas as pd
+import numpy as np
+import os
+import re
+import json
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Dict, Iterator, List, Tuple, Any, Union
+
+from excel_reader import (
+    WorkbookCache, LoadedWorkbook, HeaderDetector, AUTO_ENGINE, READER_ENGINES, HEADER_SYNONYMS, MAX_PROBE_ROWS,
+    SUPPORTED_EXTENSIONS, open_key_stream, find_header_row, find_cari_unvan_column, extract_depo_name
+)
+from parse_cache import ParseCache, DEFAULT_CACHE_DIR, DEFAULT_MAX_SIZE_MB
+from key_store import SpillingKeyMap, DEFAULT_MEMORY_BUDGET_MB
+from partitioned_join import PartitionedDiff, DEFAULT_PARTITIONS
+from sorted_merge import SortedMergeDiff, UnsortedInputError, REMOVED_SIDE, sorted_rows
+from key_index import KeyIndex, KeyIndexBuilder
+from comparison import (
+    clean_names, clean_key_rows, composite_display, composite_keys, count_diff, diff_names, fuzzy_filter,
+    iter_batches, parse_key_columns, KEY_SEPARATOR, NameDiff, NearMatch
+)
+from fuzzy_match import DEFAULT_SIMILARITY_THRESHOLD
+from change_detection import CHANGE_COLUMNS, compared_columns, detect_changes
+from snapshot_chain import SnapshotStore, DEFAULT_SNAPSHOT_DB, export_files, update_chain, vehicle_chains
+from fleet import MOVED_IN, MOVED_OUT, fleet_diff
+from combined_export import (
+    COMBINED_OUTPUT_NAME, DEPOT_COLUMNS, VEHICLE_PATTERNS, labelled_diff, vehicle_diffs, vehicle_numbers
+)
+from batch import BatchSummary, BATCH_OUTPUT_NAME, BATCH_SHEET, BATCH_SUMMARY_NAME, pair_exports, summary_row
+from normalization import NameNormalizer
+
+# Constants
+MAX_FILE_SIZE_MB = 100  # Bu boyutun üzerindeki dosyalar sınırlı bellekli akış modunda karşılaştırılır
+STREAMING_BATCH_SIZE = 10_000
+EXCEL_CHUNK_SIZE = 1000
+CONFIG_FILES = ['config.json', 'vehicle_config.json', 'drivers.json']
+DEFAULT_OUTPUT_NAME = "karşılaştırma_sonucu"
+REMOVED_SHEET = "Eksik Cariler"
+ADDED_SHEET = "Yeni Cariler"
+COMMON_SHEET = "Ortak Cariler"
+CHANGED_SHEET = "Değişen Cariler"
+CHURN_SHEET = "Günlük Değişim"
+COUNT_SHEET = "Adet Farkı"
+FLEET_SHEET = "Araç Değişikliği"
+FLEET_OUTPUT_NAME = "filo_karşılaştırma"
+DEFAULT_READER_ENGINE = AUTO_ENGINE  # 'openpyxl', 'calamine', 'rawxml', 'xlrd' veya 'auto'
+KEY_MAP_JOIN = "keymap"  # akış modu: yeni dosyanın anahtarları diske taşabilen eşlemede
+PARTITIONED_JOIN = "partitioned"  # akış modu: iki dosyanın anahtarları diskte bölümlenir
+MERGE_JOIN = "merge"  # akış modu: sıralı dosyalar birleştirmeyle karşılaştırılır
+EXCEL_FORMAT = "xlsx"
+IMAGE_FORMAT = "png"
+CSV_FORMAT = "csv"
+OUTPUT_FORMATS = {EXCEL_FORMAT: "Excel", IMAGE_FORMAT: "Resim", CSV_FORMAT: "CSV"}
+# compare() seçenekleri: ComparisonEngine'deki aynı adlı seçeneklere aktarılır
+API_OPTIONS = (
+    'key_columns', 'case_sensitive', 'reader_engine', 'fuzzy_matching', 'similarity_threshold',
+    'change_detection', 'count_comparison'
+)
+
+
+# Logging sistemi kurulumu
+def setup_logging() -> None:
+    """Logging sistemini kur"""
+    try:
+        logging.basicConfig(
+            filename='app.log',
+            level=logging.INFO,
+            format='%(asctime)s - %(levelname)s - %(message)s',
+            encoding='utf-8'
+        )
+    except TypeError:  # Python < 3.9 için encoding parametresi desteklenmez
+        logging.basicConfig(
+            filename='app.log',
+            level=logging.INFO,
+            format='%(asctime)s - %(levelname)s - %(message)s'
+        )
+
+
+class ComparisonError(Exception):
+    """Karşılaştırma yapılamadı veya sonuç kaydedilemedi (mesaj kullanıcıya gösterilebilir)"""
+
+
+class Option:
+    """Seçenek değeri (tk.Variable ile aynı get/set arayüzü, Tk gerektirmez)"""
+    
+    def __init__(self, value: Any = None):
+        self._value = value
+    
+    def get(self) -> Any:
+        return self._value
+    
+    def set(self, value: Any) -> None:
+        self._value = value
+
+
+class ComparisonEngine:
+    """Excel karşılaştırma iş mantığı (arayüzden bağımsız)
+    
+    Seçenekler _option() ile oluşturulan get/set nesneleridir; masaüstü
+    arayüzü bunları Tk değişkenleri olarak oluşturup pencereye bağlar.
+    Hata, uyarı ve sonuçlar kancalarla iletilir; bu sınıfta kancalar
+    sadece kayıt tutar.
+    """
+    
+    def __init__(self, key_columns: Optional[str] = None):
+        self.file1_path = self._option("")
+        self.file2_path = self._option("")
+        self.output_path = self._option("")
+        self.case_sensitive = self._option(False)
+        self.output_formats: List[str] = [EXCEL_FORMAT]
+        self.messages: List[Tuple[str, str, str]] = []
+        self.vehicle_drivers: Dict[str, str] = {}
+        self.settings: Dict[str, Any] = {}
+        self._load_vehicle_drivers()
+        self._load_settings()
+        self.reader_engine = self._option(self._configured_reader_engine())
+        # Bileşik anahtar: "Cari Kodu + Cari Ünvan"; boşsa sadece ünvan (komut satırındaki --key öncelikli)
+        configured_keys = parse_key_columns(self.settings.get('key_columns'))
+        self.key_columns = self._option(
+            key_columns if key_columns is not None else f" {KEY_SEPARATOR} ".join(configured_keys)
+        )
+        self.header_detector = self._create_header_detector()
+        self.workbook_cache = WorkbookCache(
+            engine=self.reader_engine.get(),
+            parse_cache=self._create_parse_cache(),
+            detector=self.header_detector,
+            key_columns=parse_key_columns(self.key_columns.get())
+        )
+        self._load_streaming_settings()
+        fuzzy_settings = self.settings.get('fuzzy', {})
+        self.fuzzy_matching = self._option(bool(fuzzy_settings.get('enabled', False)))
+        self.similarity_threshold = self._option(float(fuzzy_settings.get('threshold', DEFAULT_SIMILARITY_THRESHOLD)))
+        # Ortak carilerde bakiye, adres vb. alan değişiklikleri; ignore_columns karşılaştırılmaz
+        change_settings = self.settings.get('changes', {})
+        self.change_detection = self._option(bool(change_settings.get('enabled', False)))
+        self.ignored_change_columns: List[str] = [
+            str(name) for name in change_settings.get('ignore_columns', []) if str(name).strip()
+        ]
+        # Adet modu: tekrarlar tek sayılmaz, cari başına satır sayısı farkı da raporlanır
+        self.count_comparison = self._option(bool(self.settings.get('multiset', False)))
+        # ERP dosyaları 'Cari Ünvan'a göre sıralı veriyorsa önce sıralı birleştirme denenir
+        self.sorted_input = bool(self.settings.get('sorted_input', False))
+    
+    def _option(self, value: Any) -> Option:
+        """Seçenek değeri oluştur (arayüz Tk değişkeni döndürür)"""
+        return Option(value)
+    
+    def _show_error(self, title: str, message: str) -> None:
+        """Hata mesajı kancası"""
+        self.messages.append(("error", title, message))
+    
+    def _show_warning(self, title: str, message: str) -> None:
+        """Uyarı mesajı kancası"""
+        self.messages.append(("warning", title, message))
+    
+    def _show_info(self, title: str, message: str) -> None:
+        """Bilgi mesajı kancası"""
+        self.messages.append(("info", title, message))
+    
+    def _publish_results(self, result: 'ComparisonResult') -> None:
+        """Karşılaştırma sonucu kancası (kaydetmeden önce çağrılır)"""
+    
+    def _output_formats(self) -> List[str]:
+        """Kaydedilecek çıktı biçimleri (EXCEL_FORMAT, IMAGE_FORMAT, CSV_FORMAT)"""
+        return list(self.output_formats)
+    
+    def clear_results(self) -> None:
+        """Önceki sonuçları temizleme kancası"""
+    
+    
+    def _load_vehicle_drivers(self) -> None:
+        """Araç-plasiyer eşleştirmesini dosyadan yükler"""
+        try:
+            # Config dosyalarını dene
+            for config_file in CONFIG_FILES:
+                if Path(config_file).exists():
+                    try:
+                        with open(config_file, 'r', encoding='utf-8') as f:
+                            config = json.load(f)
+                            vehicle_drivers = config.get('vehicle_drivers', {})
+                            if vehicle_drivers:
+                                self.vehicle_drivers = vehicle_drivers
+                                logging.info(f"Araç-plasiyer konfigürasyonu yüklendi: {config_file}")
+                                return
+                    except (json.JSONDecodeError, KeyError) as e:
+                        logging.warning(f"Config dosyası okuma hatası {config_file}: {e}")
+                        continue
+            
+            # Çevre değişkenlerini dene
+            env_config = {}
+            for i in range(1, 21):
+                key = f"DRIVER_{i:02d}"
+                if key in os.environ:
+                    env_config[f"{i:02d}"] = os.environ[key]
+            
+            if env_config:
+                self.vehicle_drivers = env_config
+                logging.info("Araç-plasiyer konfigürasyonu çevre değişkenlerinden yüklendi")
+            else:
+                logging.warning("Araç-plasiyer konfigürasyonu bulunamadı!")
+                
+        except Exception as e:
+            logging.error(f"Config yükleme hatası: {e}")
+            self.vehicle_drivers = {}
+    
+    def _load_settings(self) -> None:
+        """Config dosyalarındaki uygulama ayarlarını yükler (vehicle_drivers dışındaki anahtarlar)"""
+        for config_file in reversed(CONFIG_FILES):
+            if not Path(config_file).exists():
+                continue
+            try:
+                with open(config_file, 'r', encoding='utf-8') as f:
+                    config = json.load(f)
+                # Listede önce gelen dosya öncelikli
+                self.settings.update({k: v for k, v in config.items() if k != 'vehicle_drivers'})
+            except (json.JSONDecodeError, OSError) as e:
+                logging.warning(f"Ayar dosyası okuma hatası {config_file}: {e}")
+    
+    def _configured_reader_engine(self) -> str:
+        """Ayarlardaki okuma motoru ('reader_engine'); geçersizse varsayılan"""
+        engine = str(self.settings.get('reader_engine', DEFAULT_READER_ENGINE))
+        if engine != AUTO_ENGINE and engine not in READER_ENGINES:
+            logging.warning(f"Bilinmeyen okuma motoru ayarı '{engine}', '{DEFAULT_READER_ENGINE}' kullanılıyor")
+            return DEFAULT_READER_ENGINE
+        return engine
+    
+    def _on_reader_engine_changed(self, *args) -> None:
+        """Seçenekler kartında motor değişince sonraki okumalarda kullan"""
+        engine = self.reader_engine.get()
+        self.workbook_cache.engine = engine
+        logging.info(f"Okuma motoru seçildi: {engine}")
+    
+    def _apply_options(self) -> None:
+        """Seçili okuma motorunu ve anahtar sütunlarını okuma önbelleğine uygula"""
+        self.workbook_cache.engine = self.reader_engine.get()
+        columns = parse_key_columns(self.key_columns.get())
+        if self.workbook_cache.set_key_columns(columns):
+            logging.info(f"Karşılaştırma anahtarı: {' + '.join(columns) or 'Cari Ünvan'}")
+    
+    def _create_header_detector(self) -> HeaderDetector:
+        """Ayarlardaki başlık adları ve arama penceresiyle başlık bulucuyu oluşturur"""
+        header_settings = self.settings.get('header', {})
+        try:
+            return HeaderDetector(
+                synonyms=tuple(header_settings.get('synonyms', HEADER_SYNONYMS)),
+                max_probe_rows=int(header_settings.get('max_probe_rows', MAX_PROBE_ROWS))
+            )
+        except (TypeError, ValueError) as e:
+            logging.error(f"Başlık ayarı hatası, varsayılanlar kullanılıyor: {e}")
+            return HeaderDetector()
+    
+    def _name_normalizer(self) -> NameNormalizer:
+        """Büyük/küçük harf seçeneği ve ayarlardaki normalleştirme adımlarıyla normalleştiriciyi oluşturur"""
+        options = {
+            name: bool(value) for name, value in self.settings.get('normalization', {}).items()
+            if name in ('nfkc', 'collapse_whitespace', 'strip_punctuation', 'canonical_suffixes')
+        }
+        return NameNormalizer(case_sensitive=self.case_sensitive.get(), **options)
+    
+    def _fuzzy_threshold(self) -> float:
+        """Seçenekler kartındaki benzerlik eşiği (0-1 arası)"""
+        try:
+            threshold = float(self.similarity_threshold.get())
+        except (TypeError, ValueError):
+            logging.warning(f"Geçersiz benzerlik eşiği, varsayılan kullanılıyor: {DEFAULT_SIMILARITY_THRESHOLD}")
+            return DEFAULT_SIMILARITY_THRESHOLD
+        return min(max(threshold, 0.0), 1.0)
+    
+    def _load_streaming_settings(self) -> None:
+        """Büyük dosya (akış modu) ayarlarını yükler: eşik, bellek bütçesi, taşma dizini ve bölümleme"""
+        streaming_settings = self.settings.get('streaming', {})
+        self.large_file_threshold_mb = float(MAX_FILE_SIZE_MB)
+        self.memory_budget_mb = float(DEFAULT_MEMORY_BUDGET_MB)
+        self.spill_directory: Optional[str] = streaming_settings.get('spill_directory')
+        # partitioned: büyük dosyalar doğrudan bölümlenmiş diskte karşılaştırılır
+        self.partitioned_join = bool(streaming_settings.get('partitioned', False))
+        self.partition_count = DEFAULT_PARTITIONS
+        self.partition_workers: Optional[int] = None
+        # key_index: yeni dosyanın anahtarları diske taşan eşleme yerine sıkıştırılmış indekste. İndeks
+        # tamamen bellekte durur ve memory_budget_mb'ye uymaz, bu yüzden varsayılan olarak kapalıdır
+        self.compact_key_index = bool(streaming_settings.get('key_index', False))
+        self.bloom_filter = bool(streaming_settings.get('bloom_filter', False))
+        
+        try:
+            self.large_file_threshold_mb = float(streaming_settings.get('threshold_mb', MAX_FILE_SIZE_MB))
+            self.memory_budget_mb = float(streaming_settings.get('memory_budget_mb', DEFAULT_MEMORY_BUDGET_MB))
+            self.partition_count = int(streaming_settings.get('partitions', DEFAULT_PARTITIONS))
+            if streaming_settings.get('partition_workers'):
+                self.partition_workers = int(streaming_settings['partition_workers'])
+        except (TypeError, ValueError) as e:
+            logging.error(f"Akış modu ayar hatası: {e}")
+    
+    def _create_parse_cache(self) -> Optional[ParseCache]:
+        """Ayarlara göre kalıcı okuma önbelleğini oluşturur"""
+        cache_settings = self.settings.get('parse_cache', {})
+        if not cache_settings.get('enabled', True):
+            logging.info("Kalıcı okuma önbelleği ayarlardan kapatılmış")
+            return None
+        
+        try:
+            return ParseCache(
+                directory=cache_settings.get('directory', DEFAULT_CACHE_DIR),
+                max_size_mb=float(cache_settings.get('max_size_mb', DEFAULT_MAX_SIZE_MB))
+            )
+        except (TypeError, ValueError) as e:
+            logging.error(f"Okuma önbelleği ayar hatası: {e}")
+            return None
+    
+    def validate_file_size(self, file_path: str) -> Tuple[bool, str]:
+        """Dosya boyutunu kontrol et (büyük dosyalar reddedilmez, akış modunda karşılaştırılır)"""
+        try:
+            file_size_mb = Path(file_path).stat().st_size / (1024 * 1024)
+            if file_size_mb > self.large_file_threshold_mb:
+                logging.info(f"Büyük dosya ({file_size_mb:.1f}MB), akış modunda karşılaştırılacak: {file_path}")
+            return True, ""
+        except Exception as e:
+            return False, f"Dosya boyutu kontrol edilemedi: {e}"
+    
+    def is_large_file(self, file_path: str) -> bool:
+        """Dosya akış modu eşiğinden büyük mü?"""
+        try:
+            return Path(file_path).stat().st_size / (1024 * 1024) > self.large_file_threshold_mb
+        except OSError:
+            return False
+    
+    def validate_excel_file(self, file_path: str) -> Tuple[bool, str]:
+        """Excel dosyasının geçerli olup olmadığını kontrol eder"""
+        try:
+            path = Path(file_path)
+            
+            if not path.exists():
+                return False, "Dosya bulunamadı!"
+                
+            if path.suffix.lower() not in SUPPORTED_EXTENSIONS:
+                return False, f"Geçersiz dosya formatı! Desteklenen formatlar: {', '.join(SUPPORTED_EXTENSIONS)}"
+                
+            is_valid, error_msg = self.validate_file_size(file_path)
+            if not is_valid:
+                return False, error_msg
+                
+            if self.is_large_file(file_path):
+                # Büyük dosya: sadece ilk satırlar okunur, veri karşılaştırmada akış olarak okunur
+                open_key_stream(file_path, self.reader_engine.get(), self.header_detector).close()
+            else:
+                # Dosyayı oku (karşılaştırmada tekrar kullanılmak üzere önbelleğe alınır)
+                self.workbook_cache.get(file_path)
+            return True, ""
+            
+        except PermissionError:
+            return False, "Dosyaya erişim izni yok!"
+        except pd.errors.EmptyDataError:
+            return False, "Excel dosyası boş!"
+        except Exception as e:
+            return False, f"Geçersiz Excel dosyası: {e}"
+    
+    def _find_header_row(self, df: pd.DataFrame) -> int:
+        """DataFrame içinde başlık satırını bulur"""
+        return find_header_row(df, self.header_detector)
+    
+    def _extract_vehicle_number(self, depo_text: str) -> Optional[str]:
+        """Depo kartı metninden araç numarasını çıkarır"""
+        if not isinstance(depo_text, str):
+            return None
+                
+        logging.debug(f"Araç numarası çıkarma denemesi: '{depo_text}'")
+                
+        for pattern in VEHICLE_PATTERNS:
+            try:
+                match = re.search(pattern, depo_text)
+                if match:
+                    vehicle_num = f"{int(match.group(1)):02d}"
+                    logging.debug(f"Araç numarası bulundu: {vehicle_num}")
+                    
+                    if vehicle_num in self.vehicle_drivers:
+                        return vehicle_num
+                    else:
+                        logging.warning(f"Araç {vehicle_num} config'de bulunamadı")
+            except (ValueError, AttributeError) as e:
+                logging.warning(f"Regex hatası: {e}")
+                continue
+                        
+        logging.warning(f"Hiçbir pattern eşleşmedi: '{depo_text}'")
+        return None
+    
+    def _create_filename_with_driver(self, depo_text: str) -> str:
+        """Depo kartından araç numarası çıkarıp plasiyer adıyla dosya adı oluşturur"""
+        try:
+            vehicle_num = self._extract_vehicle_number(depo_text)
+            
+            if vehicle_num and vehicle_num in self.vehicle_drivers:
+                driver_name = self.vehicle_drivers[vehicle_num]
+                filename = f"Arac_{vehicle_num}_{driver_name}"
+                return self._sanitize_filename(filename)
+            else:
+                return self._sanitize_filename(depo_text) if depo_text else DEFAULT_OUTPUT_NAME
+                
+        except Exception as e:
+            logging.error(f"Plasiyerli dosya adı oluşturma hatası: {e}")
+            return self._sanitize_filename(depo_text) if depo_text else DEFAULT_OUTPUT_NAME
+    
+    def _sanitize_filename(self, filename: str) -> str:
+        """Dosya adını güvenli hale getirir"""
+        # Güvenli olmayan karakterleri kaldır
+        invalid_chars = r'[\\/*?:"<>|]'
+        safe_name = re.sub(invalid_chars, '', filename)
+        safe_name = safe_name.strip()
+        
+        # Uzunluk kontrolü
+        if len(safe_name) > 100:
+            safe_name = safe_name[:100]
+            
+        return safe_name if safe_name else DEFAULT_OUTPUT_NAME
+    
+    def _save_results_as_image(self, unique_cari_unvan_list: List[str], output_path: str, depo_name: Optional[str] = None) -> Tuple[bool, str]:
+        """Sonuçları resim dosyası olarak kaydeder"""
+        # matplotlib sadece resim istendiğinde yüklenir (komut satırında açılışı hızlandırır)
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        
+        try:
+            fig, ax = plt.subplots(figsize=(12, 8), dpi=150)
+            plt.rcParams['font.family'] = 'DejaVu Sans'
+            
+            if depo_name:
+                vehicle_num = self._extract_vehicle_number(depo_name)
+                if vehicle_num and vehicle_num in self.vehicle_drivers:
+                    driver_name = self.vehicle_drivers[vehicle_num]
+                    title = f"Araç {vehicle_num} - {driver_name}"
+                else:
+                    title = depo_name
+                plt.suptitle(title, fontsize=16, fontweight='bold')
+            else:
+                plt.suptitle("Eksik Cari Ünvanlar", fontsize=16, fontweight='bold')
+                
+            cell_text = []
+            for i, unvan in enumerate(unique_cari_unvan_list, 1):
+                display_unvan = unvan if len(str(unvan)) <= 80 else str(unvan)[:77] + "..."
+                cell_text.append([i, display_unvan])
+                
+            if not cell_text:
+                cell_text = [["", "Tüm cari ünvanlar her iki dosyada da mevcut."]]
+                
+            plt.axis('off')
+            table = plt.table(
+                cellText=cell_text,
+                colLabels=["#", "Cari Ünvan"],
+                loc='center',
+                cellLoc='left',
+                colWidths=[0.1, 0.9]
+            )
+            
+            table.auto_set_font_size(False)
+            table.set_fontsize(9)
+            table.scale(1, 1.5)
+            
+            # Tablo styling
+            for (i, j), cell in table.get_celld().items():
+                if i == 0:
+                    cell.set_text_props(fontweight='bold')
+                    cell.set_facecolor('#e6e6e6')
+                else:
+                    if i % 2 == 0:
+                        cell.set_facecolor('#f9f9f9')
+            
+            full_output_path = str(Path(output_path).resolve())
+            
+            # Dizin oluştur
+            output_dir = Path(full_output_path).parent
+            output_dir.mkdir(parents=True, exist_ok=True)
+            
+            plt.savefig(full_output_path, bbox_inches='tight', dpi=150, 
+                       facecolor='white', edgecolor='none')
+            plt.close(fig)  # Memory leak önleme
+            
+            return True, full_output_path
+            
+        except PermissionError as e:
+            error_msg = f"Resim kaydetme izin hatası: {output_path} - {e}"
+            logging.error(error_msg)
+            return False, error_msg
+        except Exception as e:
+            error_msg = f"Resim kaydetme hatası: {e}"
+            logging.error(error_msg)
+            return False, error_msg
+        finally:
+            plt.close('all')  # Tüm figürleri temizle
+    
+    def run_snapshot_chain(self, folder: str) -> 'ComparisonResult':
+        """Günlük seriyi günceller; son iki günün farkı ve günlük değişim tablosu
+        
+        Her günün anahtarları ayarlardaki 'snapshots.database' deposunda
+        saklanır; daha önce kaydedilmiş günler tekrar okunmaz, her yeni gün
+        sadece aynı aracın bir önceki gününün kayıtlı anahtarlarıyla
+        karşılaştırılır. Klasörde birden fazla aracın dosyaları varsa her
+        araç ayrı seridir; farklar "ÜNVAN (Araç NN)" biçiminde birleştirilir.
+        Aracı bulmak için dosyalar tam okunmaz (akış olarak okunamayan
+        dosyalarda araç dosya adından alınır).
+        """
+        start = time.perf_counter()
+        files = export_files(folder)
+        if len(files) < 2:
+            raise ComparisonError("Klasörde en az iki Excel dosyası olmalı!")
+        
+        self._apply_options()
+        self.clear_results()
+        normalizer = self._name_normalizer()
+        database = self.settings.get('snapshots', {}).get('database', DEFAULT_SNAPSHOT_DB)
+        chains = vehicle_chains(files, lambda path: self._file_vehicle(str(path), full_read=False)[0])
+        logging.info(f"Günlük seri karşılaştırılıyor ({len(files)} dosya, {len(chains)} seri): {folder}")
+        tables: List[pd.DataFrame] = []
+        diffs = {}
+        with SnapshotStore(database) as store:
+            for vehicle, chain_files in chains.items():
+                chain, diff = update_chain(
+                    chain_files, lambda path: self._snapshot_keys(str(path), normalizer),
+                    store, self.workbook_cache.key_signature(normalizer)
+                )
+                if vehicle:
+                    chain.insert(0, "Araç", vehicle)
+                tables.append(chain)
+                if diff is not None:
+                    diffs[vehicle] = (diff, int(chain["Toplam"].iloc[-2]), "")
+        
+        if not diffs:
+            raise ComparisonError("Klasörde aynı araca ait en az iki okunabilir dosya olmalı!")
+        
+        churn = pd.concat(tables, ignore_index=True)
+        diff = next(iter(diffs.values()))[0] if len(chains) == 1 else labelled_diff(diffs)
+        vehicles = f"{len(chains)} araç, " if len(chains) > 1 else ""
+        logging.info(f"Günlük değişim tablosu:\n{churn.to_string(index=False)}")
+        return self._make_result(
+            sum(old_count for _, old_count, _ in diffs.values()), diff, None,
+            extra_sheets={CHURN_SHEET: churn},
+            status_prefix=f"Günlük seri: {vehicles}{len(churn)} gün ({churn['Tarih'].min()} - {churn['Tarih'].max()}). Son gün: ",
+            timings={"compare": time.perf_counter() - start}
+        )
+    
+    def _snapshot_keys(self, file_path: str, normalizer: NameNormalizer) -> Tuple[pd.Series, Any]:
+        """Günlük seri için dosyanın yazılışları ve anahtarları (okuma önbelleği üzerinden)"""
+        workbook = self.workbook_cache.get(file_path)
+        if workbook.key_data()["key_column"] is None:
+            raise ValueError("'Cari Ünvan' sütunu bulunamadı")
+        if workbook.missing_columns:
+            raise ValueError(f"Anahtar sütunu bulunamadı: {', '.join(workbook.missing_columns)}")
+        return self.workbook_cache.keyed_names(workbook, normalizer)
+    
+    def run_fleet(self, old_folder: str, new_folder: str) -> 'ComparisonResult':
+        """Eski ve yeni gün klasörlerindeki araç dosyalarını karşılaştırıp araç değişikliklerini ayırır
+        
+        Eksik ve Yeni sekmelerinde sadece filodan tamamen çıkan ve filoya
+        ilk kez gelen cariler listelenir; araçlar arasında yer değiştirenler
+        FLEET_SHEET sayfasına (hangi araçtan hangi araca) yazılır.
+        """
+        start = time.perf_counter()
+        self._apply_options()
+        self.clear_results()
+        normalizer = self._name_normalizer()
+        old_exports = self._fleet_exports(old_folder, normalizer)
+        new_exports = self._fleet_exports(new_folder, normalizer)
+        if not old_exports or not new_exports:
+            raise ComparisonError("Her iki klasörde de araç numarası bulunan en az bir Excel dosyası olmalı!")
+        read_time = time.perf_counter() - start
+        
+        result = fleet_diff(old_exports, new_exports)
+        moved_out, moved_in = result.status_count(MOVED_OUT), result.status_count(MOVED_IN)
+        logging.info(
+            f"Filo karşılaştırması: {len(old_exports)} / {len(new_exports)} araç, "
+            f"başka araca geçen {moved_out}, başka araçtan gelen {moved_in}"
+        )
+        return self._make_result(
+            result.old_count, result.name_diff(), None,
+            extra_sheets={FLEET_SHEET: result.table},
+            status_prefix=(
+                f"Filo ({len(set(old_exports) | set(new_exports))} araç): {moved_out} cari başka araca geçti, "
+                f"{moved_in} cari başka araçtan geldi. "
+            ),
+            timings={"read": read_time, "compare": time.perf_counter() - start - read_time}
+        )
+    
+    def _fleet_exports(self, folder: str, normalizer: NameNormalizer) -> Dict[str, Tuple[pd.Series, Any]]:
+        """Klasördeki araç dosyaları: araç numarası -> (yazılışlar, anahtarlar)
+        
+        Dosyalar paralel okunur; araç numarası depo kartından, bulunamazsa
+        dosya adından çıkarılır. Aynı araca ait birden fazla dosya birleştirilir.
+        """
+        files = [str(path) for path in export_files(folder)]
+        exports: Dict[str, Tuple[pd.Series, Any]] = {}
+        for file_path, workbook in zip(files, self.workbook_cache.get_many(files)):
+            vehicle = self._extract_vehicle_number(self._extract_depo_name(workbook.probe(10)))
+            if vehicle is None:
+                vehicle = self._extract_vehicle_number(Path(file_path).stem)
+            if vehicle is None:
+                logging.warning(f"Araç numarası bulunamadı, dosya atlanıyor: {file_path}")
+                continue
+            if workbook.key_data()["key_column"] is None or workbook.missing_columns:
+                logging.warning(f"Anahtar sütunu bulunamadı, dosya atlanıyor: {file_path}")
+                continue
+            
+            names, keys = self.workbook_cache.keyed_names(workbook, normalizer)
+            if vehicle in exports:
+                logging.warning(f"Araç {vehicle} için birden fazla dosya var, birleştiriliyor: {file_path}")
+                previous_names, previous_keys = exports[vehicle]
+                names = pd.concat([previous_names, names], ignore_index=True)
+                keys = np.concatenate([np.asarray(previous_keys, dtype=object), np.asarray(keys, dtype=object)])
+            exports[vehicle] = (names, keys)
+        return exports
+    
+    def run_batch(self, old_folder: str, new_folder: str, output_dir: str = "") -> BatchSummary:
+        """Eski ve yeni klasördeki araç dosyalarını araç numarasına göre eşleştirip her çifti karşılaştırır
+        
+        Çiftler işlemci sayısı kadar süreçte paralel karşılaştırılır; her
+        araç output_dir altında plasiyerli dosya adıyla kaydedilir ve özet
+        tablosu (BATCH_SHEET) aynı klasöre yazılır. Süreç başlatılamazsa
+        çiftler sırayla karşılaştırılır. Eşleştirme için dosyalar tam
+        okunmaz: akış olarak okunamayan dosyaların (.xls) aracı dosya
+        adından alınır, depo kartı alt süreçte okunur.
+        """
+        start = time.perf_counter()
+        self._apply_options()
+        output_dir = output_dir or f"{BATCH_OUTPUT_NAME}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        old_files = [(str(path), self._file_vehicle(str(path), full_read=False)[0]) for path in export_files(old_folder)]
+        new_files = [(str(path), self._file_vehicle(str(path), full_read=False)) for path in export_files(new_folder)]
+        depots = {path: depo_name for path, (_, depo_name) in new_files}
+        pairs, rows = pair_exports(old_files, [(path, vehicle) for path, (vehicle, _) in new_files])
+        if not pairs:
+            raise ComparisonError("Klasörlerde aynı araca ait eski ve yeni dosya bulunamadı!")
+        
+        options = self._worker_options()
+        formats = self._output_formats()
+        tasks = [
+            (vehicle, old_path, new_path,
+             str(Path(output_dir) / self._create_filename_with_driver(depots[new_path] or f"Araç {vehicle}")))
+            for vehicle, old_path, new_path in pairs
+        ]
+        logging.info(f"Toplu karşılaştırma: {len(tasks)} araç çifti, çıktı klasörü {output_dir}")
+        
+        results: List[Dict[str, Any]] = []
+        workers = min(len(tasks), os.cpu_count() or 1)
+        if workers > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    futures = [executor.submit(compare_pair, *task, options, formats) for task in tasks]
+                    for future in as_completed(futures):
+                        results.append(future.result())
+                        logging.info(f"Araç {results[-1]['Araç']} tamamlandı ({len(results)}/{len(tasks)})")
+            except (OSError, RuntimeError, BrokenProcessPool) as e:
+                logging.warning(f"Paralel toplu karşılaştırma başarısız, sırayla yapılıyor: {e}")
+                results = []
+        if not results:
+            workers = 1
+            results = [compare_pair(*task, options, formats) for task in tasks]
+        
+        summary = BatchSummary(rows + results, time.perf_counter() - start, workers)
+        logging.info(f"{summary.status_text}\n{summary.table.to_string(index=False)}")
+        self._save_batch_summary(summary, output_dir, formats)
+        return summary
+    
+    def _worker_options(self) -> Dict[str, Any]:
+        """Alt süreçlere aktarılan seçenekler (Tk değişkenleri taşınamaz, düz değerler verilir)"""
+        return {name: getattr(self, name).get() for name in API_OPTIONS}
+    
+    def _file_vehicle(self, file_path: str, full_read: bool = True) -> Tuple[Optional[str], Optional[str]]:
+        """Dosyanın (araç numarası, depo adı); araç depo kartında yoksa dosya adından çıkarılır
+        
+        Sadece ilk satırlar okunur; akış olarak okunamayan dosyalar (.xls)
+        tam okunur. full_read kapalıysa bu dosyalarda depo kartına bakılmaz,
+        araç yalnızca dosya adından çıkarılır.
+        """
+        depo_name = None
+        try:
+            probe = None
+            try:
+                stream = open_key_stream(file_path, self.reader_engine.get(), self.header_detector)
+                try:
+                    probe = pd.DataFrame(stream.probe_rows)
+                finally:
+                    stream.close()
+            except ValueError:
+                if full_read:
+                    probe = self.workbook_cache.get(file_path).probe(10)
+            if probe is not None:
+                depo_name = self._extract_depo_name(probe)
+        except Exception as e:
+            logging.warning(f"Depo kartı okunamadı {file_path}: {e}")
+        
+        vehicle = self._extract_vehicle_number(depo_name) or self._extract_vehicle_number(Path(file_path).stem)
+        if vehicle is None:
+            logging.warning(f"Araç numarası bulunamadı: {file_path}")
+        return vehicle, depo_name
+    
+    def _save_batch_summary(self, summary: BatchSummary, output_dir: str, formats: List[str]) -> None:
+        """Özet tablosunu kaydet (Excel seçili değilse CSV olarak)"""
+        output_path = str(Path(output_dir) / BATCH_SUMMARY_NAME)
+        if EXCEL_FORMAT in formats or not formats:
+            success, message = self._save_as_excel({BATCH_SHEET: summary.table}, output_path, None)
+            paths = [message]
+        else:
+            success, paths = self._save_as_csv({BATCH_SHEET: summary.table}, output_path)
+        if success:
+            summary.summary_paths = paths
+        else:
+            self._show_error("Hata", paths[0])
+    
+    def run_combined(self, file1_path: str, file2_path: str) -> Dict[str, 'ComparisonResult']:
+        """Tüm depoları içeren eski ve yeni dosyayı araç bazında karşılaştırır: araç numarası -> sonuç
+        
+        Depo adı her satırda bir sütundadır (DEPOT_COLUMNS veya ayarlardaki
+        'combined.depot_column'). Her dosya bir kez okunur, araç numaraları
+        depo sütunundan çıkarılır ve karşılaştırma tek groupby geçişinde
+        yapılır. Sadece vehicle_drivers'taki araçlar için sonuç döner.
+        """
+        start = time.perf_counter()
+        if not file1_path or not file2_path:
+            raise ComparisonError("Lütfen her iki Excel dosyasını da seçin!")
+        for file_path, file_desc in [(file1_path, "Eski tarihli"), (file2_path, "Yeni tarihli")]:
+            if not Path(file_path).exists():
+                raise ComparisonError(f"{file_desc} dosya hatası: Dosya bulunamadı!")
+        if not self.vehicle_drivers:
+            raise ComparisonError("Araç-plasiyer konfigürasyonu bulunamadı, araçlar ayrılamıyor!")
+        if self.change_detection.get() or self.fuzzy_matching.get():
+            logging.warning("Birleşik dosya modunda değişiklik tespiti ve bulanık eşleştirme yapılmaz")
+        
+        self._apply_options()
+        self.clear_results()
+        normalizer = self._name_normalizer()
+        try:
+            old_rows, old_keys = self._combined_rows(file1_path, normalizer)
+            new_rows, new_keys = self._combined_rows(file2_path, normalizer)
+            read_time = time.perf_counter() - start
+            results = vehicle_diffs(old_rows, old_keys, new_rows, new_keys, self.count_comparison.get())
+        except ComparisonError:
+            raise
+        except MemoryError:
+            raise ComparisonError("Dosyalar çok büyük, bellek yetersiz!")
+        except Exception as e:
+            logging.error(f"Birleşik dosya karşılaştırma hatası: {e}")
+            raise ComparisonError(f"İşlem sırasında bir hata oluştu: {e}") from e
+        if not results:
+            raise ComparisonError("Dosyalarda config'deki araçlara ait satır bulunamadı!")
+        
+        missing = sorted(set(self.vehicle_drivers) - set(results))
+        if missing:
+            logging.warning(f"Dosyalarda satırı olmayan araçlar: {', '.join(missing)}")
+        timings = {"read": read_time, "compare": time.perf_counter() - start - read_time}
+        logging.info(f"Birleşik dosya {len(results)} araca ayrıldı: {', '.join(results)}")
+        return {
+            vehicle: self._make_result(total_count, diff, depo_name, timings=timings)
+            for vehicle, (diff, total_count, depo_name) in results.items()
+        }
+    
+    def _combined_rows(self, file_path: str, normalizer: NameNormalizer) -> Tuple[pd.DataFrame, Any]:
+        """Birleşik dosyanın satırları ('Araç', 'Depo', 'Cari Ünvan') ve karşılaştırma anahtarları"""
+        configured = self.settings.get('combined', {}).get('depot_column')
+        candidates = (str(configured),) if configured else DEPOT_COLUMNS
+        key_extras = self.workbook_cache.extra_columns
+        workbook = LoadedWorkbook(
+            file_path, streaming=True, engine=self.reader_engine.get(), detector=self.header_detector,
+            extra_columns=key_extras + tuple(name for name in candidates if name not in key_extras)
+        )
+        if workbook.key_data()["key_column"] is None:
+            raise ComparisonError(f"'Cari Ünvan' sütunu bulunamadı: {Path(file_path).name}")
+        self._check_key_columns([name for name in workbook.missing_columns if name in key_extras])
+        
+        names = workbook.names()
+        parts = dict(workbook.key_parts())
+        depot_column = next((name for name in candidates if name in parts), None)
+        if depot_column is None:
+            raise ComparisonError(
+                f"Depo sütunu bulunamadı ({', '.join(candidates)}): {Path(file_path).name}"
+            )
+        depots = parts[depot_column]
+        parts = {name: parts[name] for name in key_extras if name in parts}
+        
+        if self.workbook_cache.composite:
+            name_keys = normalizer.normalize(names) if self.workbook_cache.include_name else None
+            keys = composite_keys(name_keys, parts, normalizer)
+            names = composite_display(names, parts)
+        else:
+            keys = normalizer.normalize(names)
+        
+        vehicles = vehicle_numbers(depots, self.vehicle_drivers)
+        unknown = int(vehicles.isna().sum())
+        if unknown:
+            logging.warning(f"Araç numarası bulunamayan {unknown} satır atlanıyor: {Path(file_path).name}")
+        return pd.DataFrame({"Araç": vehicles, "Depo": depots, "Cari Ünvan": names}), keys
+    
+    def report_vehicle_results(self, results: Dict[str, 'ComparisonResult'], output_dir: str = "") -> None:
+        """Araç sonuçlarını tek listede gösterir ve her aracı plasiyerli dosya adıyla kaydeder"""
+        output_dir = output_dir or f"{COMBINED_OUTPUT_NAME}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        overview = labelled_diff({
+            vehicle: (result.diff, result.total_count, result.depo_name) for vehicle, result in results.items()
+        })
+        self._publish_results(self._make_result(
+            sum(result.total_count for result in results.values()), overview, None,
+            status_prefix=f"Birleşik dosya ({len(results)} araç): "
+        ))
+        
+        formats = self._output_formats()
+        saved_files: List[Tuple[str, str]] = []
+        for vehicle, result in results.items():
+            output_path = str(Path(output_dir) / self._create_filename_with_driver(f"Araç {vehicle}"))
+            for file_format in formats:
+                try:
+                    saved_files.extend((file_format, path) for path in result.save(output_path, file_format))
+                except ComparisonError as e:
+                    self._show_error("Hata", f"Araç {vehicle}: {e}")
+        self._show_save_result(saved_files, formats)
+    
+    def run(self, file1_path: str, file2_path: str) -> 'ComparisonResult':
+        """İki Excel dosyasını karşılaştırır; karşılaştırılamazsa ComparisonError verir
+        
+        Sonuç dosyaları yazılmaz, ComparisonResult istendiğinde oluşturur.
+        """
+        start = time.perf_counter()
+        
+        # Input validation
+        if not file1_path or not file2_path:
+            raise ComparisonError("Lütfen her iki Excel dosyasını da seçin!")
+        
+        self._apply_options()
+        large_files = [path for path in (file1_path, file2_path) if self.is_large_file(path)]
+        
+        # Dosyaları paralel oku; hatalar aşağıdaki doğrulamada dosya bazında raporlanır
+        try:
+            self.workbook_cache.get_many([path for path in (file1_path, file2_path) if path not in large_files])
+        except Exception as e:
+            logging.warning(f"Dosyalar birlikte okunamadı: {e}")
+        
+        # File validation
+        for file_path, file_desc in [(file1_path, "Eski tarihli"), (file2_path, "Yeni tarihli")]:
+            is_valid, error_msg = self.validate_excel_file(file_path)
+            if not is_valid:
+                raise ComparisonError(f"{file_desc} dosya hatası: {error_msg}")
+        
+        self.clear_results()
+        read_time = time.perf_counter() - start
+        
+        # Bellek yetmezse sıradaki yönteme geçilir: tam okuma, akış, bölümlenmiş diskte karşılaştırma
+        if large_files and self.partitioned_join:
+            methods = [self._compare_files_partitioned]
+        elif large_files:
+            methods = [self._compare_files_streaming, self._compare_files_partitioned]
+        else:
+            methods = [self._compare_files_in_memory, self._compare_files_streaming, self._compare_files_partitioned]
+        if self.sorted_input and self._sorted_merge_applicable():
+            methods.insert(0, self._compare_files_sorted)
+        
+        try:
+            for index, method in enumerate(methods):
+                try:
+                    result = method(file1_path, file2_path)
+                    break
+                except UnsortedInputError as e:
+                    # Sıralı birleştirme sonuç vermeden bırakılır, özet tabanlı yöntemle tekrar dene
+                    logging.warning(f"Dosyalar sıralı değil ({e}), sıradaki yönteme geçiliyor: {methods[index + 1].__name__}")
+                except MemoryError:
+                    if index == len(methods) - 1:
+                        raise
+                    # Okunanları bırakıp bir sonraki yöntemle tekrar dene
+                    logging.warning(f"Bellek yetersiz, sıradaki yönteme geçiliyor: {methods[index + 1].__name__}")
+                    self.workbook_cache.clear()
+        
+        except ComparisonError:
+            raise
+        except MemoryError:
+            raise ComparisonError("Dosyalar çok büyük, bellek yetersiz!")
+        except pd.errors.EmptyDataError:
+            raise ComparisonError("Excel dosyalarından biri boş veya bozuk!")
+        except PermissionError:
+            raise ComparisonError("Dosyalara erişim izni yok!")
+        except Exception as e:
+            logging.error(f"Karşılaştırma hatası: {e}")
+            raise ComparisonError(f"İşlem sırasında bir hata oluştu: {e}") from e
+        
+        result.method = method.__name__.replace('_compare_files_', '')
+        result.timings.update(read=read_time, compare=time.perf_counter() - start - read_time)
+        return result
+    
+    def _compare_files_in_memory(self, file1_path: str, file2_path: str) -> 'ComparisonResult':
+        """Dosyaları tamamen okuyup karşılaştırır"""
+        logging.info(f"Dosyalar okunuyor: {file1_path}, {file2_path}")
+        
+        # Dosyalar seçim sırasında okunduysa önbellekten gelir
+        workbook1 = self.workbook_cache.get(file1_path)
+        workbook2 = self.workbook_cache.get(file2_path)
+        
+        # İlk satırlar (header detection için, başlık bulunana kadar genişleyen pencere)
+        df1_header_search = workbook1.probe()
+        df2_header_search = workbook2.probe()
+        
+        # Depo adını bul
+        depo_name = self._extract_depo_name(df1_header_search)
+        
+        # Header satırlarını bul
+        header_row1 = self._find_header_row(df1_header_search)
+        header_row2 = self._find_header_row(df2_header_search)
+        
+        if header_row1 == -1 or header_row2 == -1:
+            raise ComparisonError("Excel dosyalarında 'Cari Ünvan' başlığı bulunamadı!")
+        
+        # Tam veriler
+        df1 = workbook1.frame(header_row1)
+        df2 = workbook2.frame(header_row2)
+        
+        # Sütun adlarını temizle
+        df1.columns = [col.strip() if isinstance(col, str) else col for col in df1.columns]
+        df2.columns = [col.strip() if isinstance(col, str) else col for col in df2.columns]
+        
+        # Cari Ünvan sütunlarını bul
+        cari_unvan_col1 = self._find_cari_unvan_column(df1.columns)
+        cari_unvan_col2 = self._find_cari_unvan_column(df2.columns)
+        
+        if not cari_unvan_col1 or not cari_unvan_col2:
+            raise ComparisonError("Bir veya daha fazla Excel dosyasında 'Cari Ünvan' sütunu bulunamadı.")
+        
+        self._check_key_columns(workbook1.missing_columns + workbook2.missing_columns)
+        
+        # Temizlenmiş adlar ve anahtarlar çalışma kitabıyla birlikte saklanır; bileşik
+        # anahtarda anahtarlar 64 bit tamsayıdır, adlar "ÜNVAN [kod]" biçimindedir
+        normalizer = self._name_normalizer()
+        cari_unvan_list1, keys1 = self.workbook_cache.keyed_names(workbook1, normalizer)
+        cari_unvan_list2, keys2 = self.workbook_cache.keyed_names(workbook2, normalizer)
+        
+        # Karşılaştırma yap (eksik, yeni ve ortak adlar tek geçişte)
+        diff = diff_names(cari_unvan_list1, cari_unvan_list2, normalizer, keys1, keys2)
+        
+        # Ortak carilerin değişen alanları (satır özetleriyle)
+        if self.change_detection.get():
+            diff.changes = self._detect_changes(workbook1, workbook2, keys1, keys2, cari_unvan_list1)
+        
+        # Cari başına satır sayısı (adet) farkları
+        if self.count_comparison.get():
+            diff.count_changes = count_diff(cari_unvan_list1, cari_unvan_list2, normalizer, keys1, keys2)
+        
+        # Bulanık modda benzer adı olanlar çıkarılır, kalanlara en yakın ad eklenir
+        near_matches = None
+        if self.fuzzy_matching.get():
+            exact_count = len(diff.removed) + len(diff.added)
+            threshold = self._fuzzy_threshold()
+            if self.workbook_cache.composite:
+                # Tamsayı anahtarlar benzerlik için kullanılamaz, yazılışlar normalleştirilir
+                keys1 = keys2 = None
+            diff.removed, near_matches = fuzzy_filter(diff.removed, cari_unvan_list2, threshold, normalizer, keys2)
+            diff.added, near_added = fuzzy_filter(diff.added, cari_unvan_list1, threshold, normalizer, keys1)
+            near_matches.update(near_added)
+            logging.info(f"Benzer adla eşleşen: {exact_count - len(diff.removed) - len(diff.added)}")
+        
+        return self._make_result(len(cari_unvan_list1), diff, depo_name, near_matches)
+    
+    def _sorted_merge_applicable(self) -> bool:
+        """Sıralı birleştirme seçili seçeneklerle kullanılabilir mi?"""
+        if self.workbook_cache.composite:
+            reason = "bileşik anahtar"
+        elif self.fuzzy_matching.get():
+            reason = "benzer ad eşleştirme"
+        elif self.change_detection.get():
+            reason = "değişiklik tespiti"
+        elif self.count_comparison.get():
+            reason = "adet karşılaştırması"
+        else:
+            return True
+        logging.info(f"Sıralı birleştirme kullanılmadı ({reason} seçili)")
+        return False
+    
+    def _compare_files_sorted(self, file1_path: str, file2_path: str) -> 'ComparisonResult':
+        """Sıralı dosyaları satır satır okuyup birleştirmeyle karşılaştırır"""
+        return self._compare_files_streaming(file1_path, file2_path, join=MERGE_JOIN)
+    
+    def _compare_files_partitioned(self, file1_path: str, file2_path: str) -> 'ComparisonResult':
+        """Dosyaları satır satır okuyup anahtarları diskte bölümleyerek karşılaştırır"""
+        return self._compare_files_streaming(file1_path, file2_path, join=PARTITIONED_JOIN)
+    
+    def _compare_files_streaming(self, file1_path: str, file2_path: str,
+                                 join: str = KEY_MAP_JOIN) -> 'ComparisonResult':
+        """Dosyaları sınırlı bellekle, satır satır okuyarak karşılaştırır
+        
+        Yeni dosyanın anahtarları ve yazılışları bellek bütçesi aşılınca diske
+        taşan bir eşlemede toplanır; eski dosya parça parça okunup bu eşlemeye
+        karşı kontrol edilir, bulunan anahtarlar işaretlenir. İşaretlenmeyenler
+        yeni eklenen adlardır. Bellekte sadece farklılıklar tutulur; ortak
+        adların sadece sayısı hesaplanır.
+        
+        join=PARTITIONED_JOIN ise iki dosyanın anahtarları özetlerine göre disk
+        üzerindeki bölümlere yazılır ve bölümler paralel süreçlerde
+        karşılaştırılır (PartitionedDiff); bellek kullanımı bir bölümle sınırlıdır.
+        join=MERGE_JOIN ise sıralı iki akış birlikte ilerletilir (SortedMergeDiff);
+        sıra bozuksa UnsortedInputError verilir.
+        """
+        logging.info(
+            f"Dosyalar akış modunda karşılaştırılıyor (bellek bütçesi {self.memory_budget_mb:.0f}MB): "
+            f"{file1_path}, {file2_path}"
+        )
+        engine = self.reader_engine.get()
+        extra_columns = self.workbook_cache.extra_columns
+        stream1 = open_key_stream(file1_path, engine, self.header_detector, extra_columns)
+        try:
+            stream2 = open_key_stream(file2_path, engine, self.header_detector, extra_columns)
+        except Exception:
+            stream1.close()
+            raise
+        
+        try:
+            depo_name = self._extract_depo_name(pd.DataFrame(stream1.probe_rows))
+            
+            if stream1.header_row == -1 or stream2.header_row == -1:
+                raise ComparisonError("Excel dosyalarında 'Cari Ünvan' başlığı bulunamadı!")
+            
+            if stream1.column_index is None or stream2.column_index is None:
+                raise ComparisonError("Bir veya daha fazla Excel dosyasında 'Cari Ünvan' sütunu bulunamadı.")
+            
+            self._check_key_columns(stream1.missing_columns + stream2.missing_columns)
+            
+            normalizer = self._name_normalizer()
+            if self.fuzzy_matching.get():
+                logging.warning("Akış modunda benzer ad eşleştirme yapılmaz, sadece tam eşleşme aranır")
+            if self.change_detection.get():
+                logging.warning("Akış modunda değişiklik tespiti yapılmaz, sadece eksik ve yeni cariler bulunur")
+            if self.count_comparison.get():
+                logging.warning("Akış modunda adet karşılaştırması yapılmaz, tekrarlar tek sayılır")
+            
+            if join == PARTITIONED_JOIN:
+                diff, total_count = self._partitioned_diff(stream1, stream2, normalizer)
+            elif join == MERGE_JOIN:
+                diff, total_count = self._merge_diff(stream1, stream2, normalizer)
+            else:
+                diff, total_count = self._key_map_diff(stream1, stream2, normalizer)
+        finally:
+            stream1.close()
+            stream2.close()
+        
+        return self._make_result(total_count, diff, depo_name)
+    
+    def _key_map_diff(self, stream1, stream2, normalizer: NameNormalizer) -> Tuple[NameDiff, int]:
+        """Yeni dosyanın anahtarları indekste veya diske taşabilen eşlemede, eski dosya akış olarak: (sonuç, eski satır sayısı)"""
+        total_count = 0
+        unique_cari_unvan_list: List[str] = []
+        seen = set()
+        
+        if self.compact_key_index:
+            new_keys = self._new_file_index(stream2, normalizer)
+            for names, keys in self._stream_batches(stream1, normalizer):
+                total_count += len(names)
+                self._collect_missing(names, keys, new_keys, seen, unique_cari_unvan_list)
+            return NameDiff(unique_cari_unvan_list, new_keys.unmatched_values(),
+                            common_count=new_keys.matched_count()), total_count
+        
+        with SpillingKeyMap(self.memory_budget_mb, self.spill_directory) as new_keys:
+            for names, keys in self._stream_batches(stream2, normalizer):
+                new_keys.update(zip(keys, names.tolist()))
+            
+            for names, keys in self._stream_batches(stream1, normalizer):
+                total_count += len(names)
+                self._collect_missing(names, keys, new_keys, seen, unique_cari_unvan_list)
+            
+            diff = NameDiff(unique_cari_unvan_list, list(new_keys.unmatched_values()),
+                            common_count=new_keys.matched_count())
+        return diff, total_count
+    
+    def _new_file_index(self, stream, normalizer: NameNormalizer) -> KeyIndex:
+        """Yeni dosyanın anahtar indeksi; kalıcı önbellekte varsa dosya satırları okunmaz
+        
+        Aynı yeni dosya birden fazla eski dosyayla (farklı depolar) karşılaştırılırken
+        indeks bir kez oluşturulur.
+        """
+        signature = self.workbook_cache.key_signature(normalizer)
+        parse_cache = self.workbook_cache.parse_cache
+        index = parse_cache.load_key_index(stream.file_path, signature) if parse_cache else None
+        if index is None:
+            builder = KeyIndexBuilder()
+            for names, keys in self._stream_batches(stream, normalizer):
+                builder.add(keys, names.tolist())
+            index = builder.build()
+            if self.bloom_filter:
+                index.add_bloom_filter()
+            if parse_cache:
+                parse_cache.store_key_index(stream.file_path, signature, index)
+        elif self.bloom_filter and not index.has_bloom_filter:
+            index.add_bloom_filter()
+        index_mb = index.nbytes / (1024 * 1024)
+        logging.info(f"Yeni dosyanın anahtar indeksi: {len(index)} anahtar, {index_mb:.1f}MB")
+        if index_mb > self.memory_budget_mb:
+            logging.warning(
+                f"Anahtar indeksi bellek bütçesini aşıyor ({index_mb:.1f}MB > {self.memory_budget_mb:.0f}MB); "
+                "sınırlı bellek için 'streaming.key_index' ayarını kapatın"
+            )
+        return index
+    
+    def _partitioned_diff(self, stream1, stream2, normalizer: NameNormalizer) -> Tuple[NameDiff, int]:
+        """İki dosyanın anahtarları disk üzerindeki bölümlerde: (sonuç, eski satır sayısı)"""
+        with PartitionedDiff(self.partition_count, self.spill_directory, self.partition_workers) as join:
+            for names, keys in self._stream_batches(stream2, normalizer):
+                join.add_new(names, keys)
+            for names, keys in self._stream_batches(stream1, normalizer):
+                join.add_old(names, keys)
+            return join.diff(), join.old_count
+    
+    def _merge_diff(self, stream1, stream2, normalizer: NameNormalizer) -> Tuple[NameDiff, int]:
+        """Sıralı iki akışın birleştirmeli karşılaştırması: (sonuç, eski satır sayısı)"""
+        merge = SortedMergeDiff(sorted_rows(self._stream_batches(stream1, normalizer)),
+                                sorted_rows(self._stream_batches(stream2, normalizer)))
+        removed: List[str] = []
+        added: List[str] = []
+        for side, name in merge:
+            (removed if side == REMOVED_SIDE else added).append(name)
+        return NameDiff(removed, added, common_count=merge.common_count), merge.old_count
+    
+    def _detect_changes(self, workbook1, workbook2, keys1, keys2, names1: pd.Series) -> Optional[pd.DataFrame]:
+        """Ortak carilerin değişen alanları; tam veri okunamazsa None
+        
+        Anahtar sütunları ve ayarlardaki 'ignore_columns' karşılaştırılmaz.
+        """
+        try:
+            frame1 = workbook1.data_frame()
+            frame2 = workbook2.data_frame()
+        except ValueError as e:
+            logging.warning(f"Değişiklik tespiti yapılamadı: {e}")
+            return None
+        
+        excluded = [
+            self._find_cari_unvan_column(frame1.columns), self._find_cari_unvan_column(frame2.columns),
+            *self.workbook_cache.extra_columns, *self.ignored_change_columns
+        ]
+        columns = compared_columns(frame1, frame2, excluded)
+        return detect_changes(frame1, frame2, keys1, keys2, names1, columns)
+    
+    def _stream_batches(self, stream, normalizer: NameNormalizer):
+        """Akıştan STREAMING_BATCH_SIZE satırlık (yazılışlar, anahtarlar) parçaları üretir
+        
+        Bileşik anahtarda anahtarlar sqlite'ta saklanabilmesi için işaretli
+        64 bit tamsayıya (int64 görünümü) çevrilir.
+        """
+        if not self.workbook_cache.composite:
+            for batch in iter_batches(stream, STREAMING_BATCH_SIZE):
+                names = clean_names(batch)
+                yield names, normalizer.normalize(names).tolist()
+            return
+        
+        include_name = self.workbook_cache.include_name
+        for batch in iter_batches(stream.records(), STREAMING_BATCH_SIZE):
+            columns = list(zip(*batch))
+            names, parts = clean_key_rows(columns[0], dict(zip(stream.extra_columns, columns[1:])))
+            keys = composite_keys(normalizer.normalize(names) if include_name else None, parts, normalizer)
+            yield composite_display(names, parts), keys.view(np.int64).tolist()
+    
+    def _check_key_columns(self, missing: List[str]) -> None:
+        """Bileşik anahtarın sütunları iki dosyada da yoksa ComparisonError verir"""
+        if missing:
+            message = f"Anahtar sütunu bulunamadı: {', '.join(dict.fromkeys(missing))}"
+            logging.error(message)
+            raise ComparisonError(message)
+    
+    def _collect_missing(self, names: pd.Series, keys: List[Any], new_keys: Union[SpillingKeyMap, KeyIndex],
+                         seen: set, unique_list: List[str]) -> None:
+        """Yeni dosyada olmayan ünvanları sırayı koruyarak listeye ekler, bulunanları işaretler"""
+        found = new_keys.mark_many(keys)
+        for unvan in names[~np.asarray(found, dtype=bool)]:
+            if unvan not in seen:
+                seen.add(unvan)
+                unique_list.append(unvan)
+    
+    def _make_result(self, total_count: int, diff: NameDiff, depo_name: Optional[str],
+                     near_matches: Optional[Dict[str, NearMatch]] = None,
+                     extra_sheets: Optional[Dict[str, pd.DataFrame]] = None, status_prefix: str = "",
+                     timings: Optional[Dict[str, float]] = None) -> 'ComparisonResult':
+        """Sonuç nesnesi ve durum metni (bulanık modda benzerlik eşiği ile; günlük seri ve filo
+        karşılaştırmasının tabloları extra_sheets ile ayrı sayfalara yazılır)"""
+        status_text = status_prefix + (
+            f"Toplam {total_count} cari ünvandan {len(diff.removed)} tanesi yeni dosyada bulunmuyor. "
+            f"Yeni: {len(diff.added)}, ortak: {diff.common_count}."
+        )
+        if diff.changes is not None:
+            status_text += f" Alanı değişen: {diff.changes[CHANGE_COLUMNS[0]].nunique()}."
+        if diff.count_changes is not None:
+            status_text += f" Adedi değişen: {len(diff.count_changes)}."
+        if near_matches is not None:
+            status_text += f" (Benzerlik eşiği: %{self._fuzzy_threshold() * 100:.0f})"
+        logging.info(
+            f"Karşılaştırma tamamlandı. Eksik: {len(diff.removed)}, yeni: {len(diff.added)}, "
+            f"ortak: {diff.common_count}"
+        )
+        return ComparisonResult(self, diff, total_count, depo_name, status_text, near_matches, extra_sheets, timings)
+    
+    def report_results(self, result: 'ComparisonResult', output_path: str) -> None:
+        """Sonuçları gösterir ve seçili biçimlerde kaydeder"""
+        self._publish_results(result)
+        self._save_results(result, output_path)
+    
+    def _extract_depo_name(self, df: pd.DataFrame) -> Optional[str]:
+        """DataFrame'den depo adını çıkar"""
+        return extract_depo_name(df)
+    
+    def _find_cari_unvan_column(self, columns) -> Optional[str]:
+        """Cari Ünvan sütununu bul"""
+        return find_cari_unvan_column(columns, self.header_detector)
+    
+    def _extract_cari_unvan_list(self, df: pd.DataFrame, cari_unvan_col: str) -> pd.Series:
+        """Cari ünvan listesini çıkar ve temizle"""
+        return clean_names(df[cari_unvan_col])
+    
+    def _perform_comparison(self, list1: pd.Series, list2: pd.Series) -> NameDiff:
+        """İki liste arasında iki yönlü karşılaştırma yap (tekrarsız, ilk görülme sırasıyla)"""
+        return diff_names(list1, list2, self._name_normalizer())
+    
+    def _save_results(self, result: 'ComparisonResult', output_path: str) -> None:
+        """Sonuçları kaydet"""
+        if not output_path or output_path.strip() == "":
+            output_path = f"{DEFAULT_OUTPUT_NAME}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            logging.warning(f"Output path boş, varsayılan oluşturuldu: {output_path}")
+            
+        logging.info(f"Çalışma dizini: {Path.cwd()}")
+        logging.info(f"Output path: {output_path}")
+        logging.info(f"Sonuç listesi uzunlukları: eksik {result.removed_count}, yeni {result.added_count}")
+            
+        try:
+            formats = self._output_formats()
+            logging.info(f"Çıktı biçimleri: {', '.join(formats) or '-'}")
+            
+            saved_files: List[Tuple[str, str]] = []
+            for file_format in formats:
+                try:
+                    saved_files.extend((file_format, path) for path in result.save(output_path, file_format))
+                except ComparisonError as e:
+                    self._show_error("Hata", str(e))
+            
+            # Sonuç mesajı göster
+            self._show_save_result(saved_files, formats)
+                    
+        except Exception as e:
+            error_msg = f"Sonuç kaydetme genel hatası: {e}"
+            logging.error(error_msg)
+            self._show_error("Hata", error_msg)
+    
+    def _result_sheets(self, diff: NameDiff, near_matches: Optional[Dict[str, NearMatch]] = None,
+                       extra_sheets: Optional[Dict[str, pd.DataFrame]] = None) -> Dict[str, pd.DataFrame]:
+        """Sonuç tabloları: eksik, yeni, ortak adlar, değişen alanlar, adet farkları ve ek tablolar
+        
+        Akış modunda ortak adlar listelenmez.
+        """
+        sheets = {
+            REMOVED_SHEET: self._result_frame(diff.removed, near_matches),
+            ADDED_SHEET: self._result_frame(diff.added, near_matches),
+        }
+        if diff.common is not None:
+            sheets[COMMON_SHEET] = self._result_frame(diff.common)
+        if diff.changes is not None:
+            sheets[CHANGED_SHEET] = diff.changes.copy()
+            sheets[CHANGED_SHEET].insert(0, "#", range(1, len(diff.changes) + 1))
+        if diff.count_changes is not None:
+            sheets[COUNT_SHEET] = diff.count_changes.copy()
+            sheets[COUNT_SHEET].insert(0, "#", range(1, len(diff.count_changes) + 1))
+        if extra_sheets:
+            sheets.update(extra_sheets)
+        return sheets
+    
+    def _save_as_excel(self, sheets: Dict[str, pd.DataFrame], output_path: str,
+                       depo_name: Optional[str]) -> Tuple[bool, str]:
+        """Excel olarak kaydet (her tablo ayrı sayfada)"""
+        try:
+            excel_path = Path.cwd() / f"{output_path}.xlsx"
+            logging.info(f"Excel dosyası kaydediliyor: {excel_path}")
+            
+            # Dizin oluştur
+            excel_path.parent.mkdir(parents=True, exist_ok=True)
+            
+            try:
+                # Gelişmiş Excel formatı ile kaydet
+                self._save_excel_with_formatting(sheets, excel_path, depo_name)
+            except ImportError:
+                # Basit format ile kaydet
+                logging.warning("openpyxl.styles import edilemedi, basit format kullanılıyor")
+                with pd.ExcelWriter(excel_path) as writer:
+                    for sheet_name, result_df in sheets.items():
+                        result_df.to_excel(writer, sheet_name=sheet_name, index=False)
+            
+            logging.info(f"Excel dosyası başarıyla kaydedildi: {excel_path}")
+            return True, str(excel_path)
+            
+        except PermissionError as e:
+            error_msg = f"Excel dosyası kaydetme izni yok: {e}"
+            logging.error(error_msg)
+            return False, error_msg
+        except Exception as e:
+            error_msg = f"Excel dosyası kaydedilemedi: {e}"
+            logging.error(error_msg)
+            return False, error_msg
+    
+    def _save_as_csv(self, sheets: Dict[str, pd.DataFrame], output_path: str) -> Tuple[bool, List[str]]:
+        """Her tabloyu ayrı CSV dosyası olarak kaydet ("<çıktı>_Eksik_Cariler.csv" gibi)
+        
+        Dosyalar Excel'in Türkçe karakterleri doğru açması için BOM'lu UTF-8 yazılır.
+        Başarısızlıkta listenin tek elemanı hata mesajıdır.
+        """
+        try:
+            saved: List[str] = []
+            for sheet_name, result_df in sheets.items():
+                csv_path = Path.cwd() / f"{output_path}_{sheet_name.replace(' ', '_')}.csv"
+                csv_path.parent.mkdir(parents=True, exist_ok=True)
+                result_df.to_csv(csv_path, index=False, encoding='utf-8-sig')
+                saved.append(str(csv_path))
+            logging.info(f"CSV dosyaları kaydedildi: {', '.join(saved)}")
+            return True, saved
+        
+        except PermissionError as e:
+            error_msg = f"CSV dosyası kaydetme izni yok: {e}"
+            logging.error(error_msg)
+            return False, [error_msg]
+        except Exception as e:
+            error_msg = f"CSV dosyası kaydedilemedi: {e}"
+            logging.error(error_msg)
+            return False, [error_msg]
+    
+    def _result_frame(self, names: List[str], near_matches: Optional[Dict[str, NearMatch]] = None) -> pd.DataFrame:
+        """Sonuç sayfası tablosu (bulanık modda en yakın ad ve benzerlik sütunlarıyla)"""
+        table_data = [[i, unvan] for i, unvan in enumerate(names, 1)]
+        result_df = pd.DataFrame(table_data, columns=["#", "Cari Ünvan"])
+        if near_matches is not None:
+            result_df["En Yakın Eşleşme"] = [near_matches[unvan][0] for unvan in names]
+            result_df["Benzerlik (%)"] = [round(near_matches[unvan][1] * 100, 1) for unvan in names]
+        return result_df
+    
+    def _save_excel_with_formatting(self, sheets: Dict[str, pd.DataFrame], excel_path: Path, depo_name: Optional[str]) -> None:
+        """Formatlanmış Excel kaydet"""
+        from openpyxl.styles import Font, Border, Side, Alignment
+        
+        with pd.ExcelWriter(excel_path, engine='openpyxl') as writer:
+            for sheet_name, result_df in sheets.items():
+                if depo_name:
+                    # Header ekle
+                    vehicle_num = self._extract_vehicle_number(depo_name)
+                    if vehicle_num and vehicle_num in self.vehicle_drivers:
+                        driver_name = self.vehicle_drivers[vehicle_num]
+                        header_text = f"Araç {vehicle_num} - {driver_name}"
+                    else:
+                        header_text = depo_name
+                    
+                    header_df = pd.DataFrame({"A": [header_text], "B": [""]})
+                    header_df.to_excel(writer, sheet_name=sheet_name, index=False, header=False, startrow=0)
+                    result_df.to_excel(writer, sheet_name=sheet_name, index=False, startrow=2)
+                    
+                    # Styling uygula
+                    self._apply_excel_styling(writer, sheet_name, header_text, len(result_df), len(result_df.columns))
+                else:
+                    result_df.to_excel(writer, sheet_name=sheet_name, index=False)
+    
+    def _apply_excel_styling(self, writer, sheet_name: str, header_text: str, data_rows: int,
+                             column_count: int = 2) -> None:
+        """Excel styling uygula"""
+        from openpyxl.styles import Font, Border, Side, Alignment
+        from openpyxl.utils import get_column_letter
+        
+        workbook = writer.book
+        worksheet = writer.sheets[sheet_name]
+        
+        # Font ve border tanımları
+        bold_font = Font(bold=True, color="000000", size=12)
+        header_font = Font(bold=True, color="000000", size=10)
+        normal_font = Font(color="000000", size=10)
+        
+        thin_border = Border(
+            left=Side(style='thin'), right=Side(style='thin'),
+            top=Side(style='thin'), bottom=Side(style='thin')
+        )
+        
+        center_alignment = Alignment(horizontal='center', vertical='center')
+        left_alignment = Alignment(horizontal='left', vertical='center')
+        
+        # Sütunlar: #, Cari Ünvan, (bulanık modda) En Yakın Eşleşme, Benzerlik; değişen alanlarda Alan, Eski, Yeni Değer
+        columns = [get_column_letter(i) for i in range(1, column_count + 1)]
+        column_widths = {'A': 8, 'B': 60, 'C': 60, 'D': 14}
+        
+        # Header styling
+        worksheet.merge_cells(f'A1:{columns[-1]}1')
+        worksheet['A1'] = header_text
+        worksheet['A1'].font = bold_font
+        worksheet['A1'].alignment = center_alignment
+        worksheet['A1'].border = thin_border
+        
+        # Tablo header styling
+        for column in columns:
+            worksheet[f'{column}3'].font = header_font
+            worksheet[f'{column}3'].alignment = center_alignment
+            worksheet[f'{column}3'].border = thin_border
+        
+        # Veri satırları styling
+        for row in range(4, data_rows + 4):
+            for column in columns:
+                cell = worksheet[f'{column}{row}']
+                cell.font = normal_font
+                cell.alignment = left_alignment if column in ('B', 'C') else center_alignment
+                cell.border = thin_border
+        
+        # Sütun genişlikleri
+        for column in columns:
+            worksheet.column_dimensions[column].width = column_widths.get(column, 20)
+    
+    def _show_save_result(self, saved_files: List[Tuple[str, str]], formats: List[str]) -> None:
+        """Kaydetme sonucunu göster (saved_files: (biçim, dosya yolu) çiftleri)"""
+        if saved_files:
+            success_message = "Sonuçlar başarıyla kaydedildi:\n\n" + "\n".join(
+                f"{OUTPUT_FORMATS[file_format]}: {path}" for file_format, path in saved_files
+            )
+            logging.info(success_message)
+            self._show_info("Başarılı", success_message)
+        elif not formats:
+            warning_msg = "Lütfen en az bir kaydetme formatı seçin (Excel veya Resim)!"
+            logging.warning(warning_msg)
+            self._show_warning("Uyarı", warning_msg)
+        else:
+            error_msg = "Hiçbir dosya kaydedilemedi. Lütfen log dosyasını kontrol edin."
+            logging.error(error_msg)
+            self._show_error("Hata", error_msg)
+    
+
+
+class ComparisonResult:
+    """Karşılaştırma sonucu
+    
+    Sayılar, ad listeleri ve depo adı hazırdır; Excel, resim ve CSV
+    çıktıları sadece save() ile istendiğinde oluşturulur. timings aşama
+    sürelerini saniye cinsinden tutar ('read', 'compare'; kaydedilen her
+    biçim için 'save_xlsx' gibi).
+    """
+    
+    def __init__(self, engine: ComparisonEngine, diff: NameDiff, total_count: int, depo_name: Optional[str],
+                 status_text: str, near_matches: Optional[Dict[str, NearMatch]] = None,
+                 extra_sheets: Optional[Dict[str, pd.DataFrame]] = None,
+                 timings: Optional[Dict[str, float]] = None):
+        self._engine = engine
+        self.diff = diff
+        self.total_count = total_count
+        self.depo_name = depo_name
+        self.status_text = status_text
+        self.near_matches = near_matches
+        self.extra_sheets = extra_sheets or {}
+        self.timings: Dict[str, float] = dict(timings or {})
+        self.method: Optional[str] = None
+        self._sheets: Optional[Dict[str, pd.DataFrame]] = None
+    
+    @property
+    def removed_count(self) -> int:
+        return len(self.diff.removed)
+    
+    @property
+    def added_count(self) -> int:
+        return len(self.diff.added)
+    
+    @property
+    def common_count(self) -> int:
+        return self.diff.common_count
+    
+    @property
+    def has_differences(self) -> bool:
+        """Eksik veya yeni cari var mı?"""
+        return bool(self.diff.removed or self.diff.added)
+    
+    def iter_removed(self) -> Iterator[str]:
+        """Yeni dosyada bulunmayan adlar (eski dosyadaki ilk görülme sırasıyla)"""
+        return iter(self.diff.removed)
+    
+    def iter_added(self) -> Iterator[str]:
+        """Eski dosyada bulunmayan adlar (yeni dosyadaki ilk görülme sırasıyla)"""
+        return iter(self.diff.added)
+    
+    def sheets(self) -> Dict[str, pd.DataFrame]:
+        """Sonuç tabloları (ilk istendiğinde oluşturulur)"""
+        if self._sheets is None:
+            self._sheets = self._engine._result_sheets(self.diff, self.near_matches, self.extra_sheets)
+        return self._sheets
+    
+    def save(self, output_path: str, file_format: str = EXCEL_FORMAT) -> List[str]:
+        """Sonucu verilen biçimde kaydeder (output_path uzantısız); yazılan dosyaları döndürür
+        
+        Kaydedilemezse ComparisonError verilir.
+        """
+        if file_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Bilinmeyen çıktı biçimi: {file_format}")
+        
+        start = time.perf_counter()
+        if file_format == EXCEL_FORMAT:
+            success, message = self._engine._save_as_excel(self.sheets(), output_path, self.depo_name)
+            paths = [message]
+        elif file_format == IMAGE_FORMAT:
+            image_path = str(Path.cwd() / f"{output_path}.png")
+            success, message = self._engine._save_results_as_image(self.diff.removed, image_path, self.depo_name)
+            paths = [message]
+        else:
+            success, paths = self._engine._save_as_csv(self.sheets(), output_path)
+            message = paths[0]
+        if not success:
+            raise ComparisonError(message)
+        
+        self.timings[f"save_{file_format}"] = time.perf_counter() - start
+        return paths
+
+
+def compare(old: str, new: str, options: Optional[Dict[str, Any]] = None) -> ComparisonResult:
+    """İki Excel dosyasını karşılaştırır (Tk gerektirmez, çıktı dosyası yazmaz)
+    
+    options anahtarları API_OPTIONS'dakilerdir; verilmeyenler config
+    dosyalarındaki ayarlardan gelir. Örnek:
+    
+        result = compare("eski.xlsx", "yeni.xlsx", {"case_sensitive": True})
+        for name in result.iter_removed():
+            ...
+        result.save("sonuc", "csv")
+    
+    Karşılaştırma yapılamazsa ComparisonError verilir.
+    """
+    options = dict(options or {})
+    unknown = [name for name in options if name not in API_OPTIONS]
+    if unknown:
+        raise ValueError(f"Bilinmeyen seçenek: {', '.join(unknown)} (seçenekler: {', '.join(API_OPTIONS)})")
+    
+    engine = ComparisonEngine(options.pop('key_columns', None))
+    for name, value in options.items():
+        getattr(engine, name).set(value)
+    return engine.run(old, new)
+
+
+def _worker_engine(options: Dict[str, Any]) -> ComparisonEngine:
+    """Alt süreçte çalışan motor (seçenekler _worker_options ile taşınır)
+    
+    Kalıcı okuma önbelleğinin indeksi süreçler arasında paylaşılamadığı
+    için kullanılmaz; dosyalar ve bölümler de iç içe süreç havuzu
+    açılmadan bu süreçte okunur.
+    """
+    options = dict(options)
+    engine = ComparisonEngine(options.pop('key_columns', None))
+    engine.workbook_cache.parse_cache = None
+    engine.workbook_cache.parallel_load = False
+    engine.partition_workers = 1
+    for name, value in options.items():
+        getattr(engine, name).set(value)
+    return engine
+
+
+def probe_export(file_path: str, options: Dict[str, Any]) -> Tuple[str, Optional[str], Optional[str]]:
+    """Dosyanın aracını ve depo adını alt süreçte bulur (klasör izleme); (dosya, araç, depo adı) döner"""
+    vehicle, depo_name = _worker_engine(options)._file_vehicle(file_path)
+    return file_path, vehicle, depo_name
+
+
+def compare_pair(vehicle: str, old_path: str, new_path: str, output_path: str,
+                 options: Dict[str, Any], formats: List[str]) -> Dict[str, Any]:
+    """Bir araç çiftini karşılaştırıp kaydeder (toplu karşılaştırma ve klasör izlemede alt süreçte çalışır)
+    
+    Döndürülen satır BATCH_COLUMNS anahtarlıdır.
+    """
+    start = time.perf_counter()
+    row = summary_row(vehicle, old_path, new_path)
+    try:
+        engine = _worker_engine(options)
+        result = engine.run(old_path, new_path)
+        depot_vehicle = engine._extract_vehicle_number(result.depo_name)
+        if depot_vehicle and depot_vehicle != vehicle:
+            logging.warning(f"Araç {vehicle} olarak eşleştirilen dosyanın depo kartı başka araca ait: {result.depo_name}")
+        saved: List[str] = []
+        for file_format in formats:
+            saved.extend(result.save(output_path, file_format))
+        row.update({
+            "Depo": result.depo_name or "",
+            "Yöntem": result.method or "",
+            "Eksik": result.removed_count,
+            "Yeni": result.added_count,
+            "Ortak": result.common_count,
+            "Okuma (sn)": round(result.timings.get("read", 0.0), 3),
+            "Karşılaştırma (sn)": round(result.timings.get("compare", 0.0), 3),
+            "Kaydetme (sn)": round(sum(seconds for name, seconds in result.timings.items()
+                                       if name.startswith("save_")), 3),
+            "Çıktılar": ", ".join(saved),
+        })
+    except ComparisonError as e:
+        row["Hata"] = str(e)
+    except Exception as e:
+        logging.error(f"Toplu karşılaştırma hatası, araç {vehicle}: {e}")
+        row["Hata"] = f"İşlem sırasında bir hata oluştu: {e}"
+    row["Toplam (sn)"] = round(time.perf_counter() - start, 3)
+    return row
@@ -0,0 +1,1396 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Excel Karşılaştırma Uygulaması - Excel Okuma Modülü
+Her girdi dosyasının tek seferde okunup tekrar kullanılmasını sağlar.
+"""
+
+import html
+import importlib.util
+import logging
+import os
+import re
+import threading
+import time
+import zipfile
+import xml.etree.ElementTree as ET
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Optional, Dict, List, Tuple, Any, Iterator, Callable
+
+import numpy as np
+import pandas as pd
+
+from comparison import clean_names, clean_key_rows, composite_display, composite_keys, key_text
+from normalization import NameNormalizer, STRING_DTYPE
+from parse_cache import ParseCache
+
+# Constants
+SUPPORTED_EXTENSIONS = ('.xlsx', '.xlsm', '.xls')  # Karşılaştırma, toplu iş ve klasör izlemenin kabul ettiği dosyalar
+WORKBOOK_CACHE_SIZE = 4
+PARALLEL_LOAD_MIN_MB = 5  # Daha küçük dosyalarda süreç başlatma maliyeti kazançtan fazla
+PROBE_ROWS = 15  # En az bu kadar satır okunur (depo adı da bu satırlarda aranır)
+MAX_PROBE_ROWS = 200  # Başlık bulunamazsa okuma penceresi bu sınıra kadar genişler
+DEPO_SEARCH_ROWS = 10
+CARI_UNVAN_HEADER = "Cari Ünvan"
+HEADER_SYNONYMS = (CARI_UNVAN_HEADER, "Cari Unvan", "Müşteri Adı")
+AUTO_ENGINE = 'auto'
+# 'auto' seçiminde ilk sayfanın açılmış XML boyutuna göre eşikler
+RAWXML_AUTO_MIN_MB = 10  # Daha küçük sayfalarda openpyxl yeterince hızlı
+CALAMINE_AUTO_MAX_MB = 500  # calamine sayfanın tamamını bellekte tutar
+
+# XLSX iç yapısı
+_MAIN_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+_REL_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+_PACKAGE_REL_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+_VALUE_TAG = f'{_MAIN_NS}v'
+_INLINE_STRING_TAG = f'{_MAIN_NS}is'
+_TEXT_TAG = f'{_MAIN_NS}t'
+_RUN_TAG = f'{_MAIN_NS}r'
+_SHARED_STRINGS_MEMBER = 'xl/sharedStrings.xml'
+_DEFAULT_SHEET_MEMBER = 'xl/worksheets/sheet1.xml'
+_XML_BLOCK_SIZE = 1024 * 1024
+_ROW_PATTERN = re.compile(rb'<row\b[^>]*?(?:/>|>(.*?)</row>)', re.S)
+_TYPE_ATTR_PATTERN = re.compile(rb'\bt="([^"]*)"')
+_VALUE_PATTERN = re.compile(rb'<v>(.*?)</v>', re.S)
+_TEXT_PATTERN = re.compile(rb'<t\b[^>]*>(.*?)</t>', re.S)
+_PHONETIC_PATTERN = re.compile(rb'<rPh\b.*?</rPh>', re.S)
+
+
+class RawXlsxLayoutError(Exception):
+    """XLSX dosyasının iç yapısı ham XML okuyucunun beklediği gibi değil"""
+
+
+class OpenpyxlRowSource:
+    """openpyxl read-only satır kaynağı"""
+
+    def __init__(self, file_path: str):
+        from openpyxl import load_workbook
+
+        self._workbook = load_workbook(file_path, read_only=True, data_only=True)
+        sheet = self._workbook.worksheets[0]
+        # Read-only modda boyut bilgisi hatalı olabilir (pandas ile aynı davranış)
+        sheet.reset_dimensions()
+        self._rows = sheet.iter_rows(values_only=True)
+
+    def rows(self) -> Iterator[tuple]:
+        """Kalan satırları sırayla ver"""
+        for row in self._rows:
+            yield tuple(_convert_cell(value) for value in row)
+
+    def column_values(self, index: int) -> Iterator[Any]:
+        """Kalan satırlardan sadece bir sütunu ver"""
+        for row in self._rows:
+            yield _convert_cell(row[index]) if index < len(row) else None
+
+    def close(self) -> None:
+        """Dosyayı kapat"""
+        self._workbook.close()
+
+
+class RawXlsxRowSource:
+    """XLSX zip arşivindeki sayfa XML'ini doğrudan okuyan satır kaynağı
+    
+    Sayfa XML'i tam satırlardan oluşan parçalar halinde okunur; stil, formül
+    ve sayı formatı bilgileri okunmaz. Başlık bulunduktan sonra satırlar ağaç
+    olarak ayrıştırılmaz, sadece hedef sütunun hücresi çıkarılır. Paylaşılan
+    metin tablosu (sharedStrings.xml) sadece ihtiyaç duyulan indekse kadar
+    okunur. Beklenmeyen bir yapıda RawXlsxLayoutError fırlatılır.
+    """
+
+    def __init__(self, file_path: str):
+        try:
+            self._zip = zipfile.ZipFile(file_path)
+        except zipfile.BadZipFile as e:
+            raise RawXlsxLayoutError(f"Zip arşivi açılamadı: {e}")
+
+        try:
+            sheet_name = _first_sheet_member(self._zip)
+            self._shared_strings = _LazySharedStrings(self._zip)
+            self._sheet_file = self._zip.open(sheet_name)
+        except Exception:
+            self._zip.close()
+            raise
+
+        self._chunks = _iter_xml_chunks(self._sheet_file, b'worksheet', b'sheetData', b'row')
+        # rows() ile ayrıştırılıp henüz verilmemiş satırlar
+        self._pending: 'deque[ET.Element]' = deque()
+        self._next_row = 1
+
+    def _fill_pending(self) -> bool:
+        """Bekleyen satır yoksa sıradaki parçayı ayrıştır"""
+        while not self._pending:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return False
+            self._pending.extend(_parse_xml_chunk(chunk))
+        return True
+
+    def rows(self) -> Iterator[tuple]:
+        """Kalan satırları sırayla ver"""
+        # Durum sadece nesnede tutulur; üreteç yarıda bırakılınca satır kaybolmaz
+        while self._fill_pending():
+            elem = self._pending[0]
+            row_number = elem.get('r')
+            if row_number is not None and int(row_number) > self._next_row:
+                # XML'de yazılmayan boş satır (openpyxl ile aynı numaralandırma)
+                self._next_row += 1
+                yield ()
+                continue
+
+            self._pending.popleft()
+            self._next_row += 1
+            values: List[Any] = []
+            for cell in elem:
+                ref = cell.get('r')
+                index = _column_index(ref) if ref else len(values)
+                if index > len(values):
+                    values.extend([None] * (index - len(values)))
+                values.append(self._cell_value(cell))
+            yield tuple(values)
+
+    def column_values(self, index: int) -> Iterator[Any]:
+        """Kalan satırlardan sadece bir sütunu ver
+        
+        XML'de hiç yazılmayan boş satırlar atlanır; hücresi olmayan satırlar
+        için None verilir.
+        """
+        letters = _column_letters(index)
+
+        # Ön okumadan kalan, zaten ayrıştırılmış satırlar
+        while self._pending:
+            elem = self._pending.popleft()
+            value = None
+            for position, cell in enumerate(elem):
+                ref = cell.get('r')
+                if (ref.rstrip('0123456789') if ref else _column_letters(position)) == letters:
+                    value = self._cell_value(cell)
+                    break
+            yield value
+
+        # Geri kalan parçalarda sadece hedef hücre aranır
+        cell_pattern = re.compile(
+            rb'<c\b([^>]*?\br="' + letters.encode('ascii') + rb'\d+"[^>]*?)(?:/>|>(.*?)</c>)',
+            re.S
+        )
+        for chunk in self._chunks:
+            for row_match in _ROW_PATTERN.finditer(chunk):
+                content = row_match.group(1)
+                if not content:
+                    yield None
+                    continue
+                cell_match = cell_pattern.search(content)
+                if cell_match is None:
+                    if b' r="' not in content:
+                        # Referanssız hücreler: konuma göre bulmak için ağaç ayrıştırması
+                        raise RawXlsxLayoutError("Hücre referansı (r) olmayan satır")
+                    yield None
+                    continue
+                yield self._raw_cell_value(cell_match.group(1), cell_match.group(2))
+
+    def _cell_value(self, cell: ET.Element) -> Any:
+        """Hücre değerini tipine göre çöz"""
+        cell_type = cell.get('t')
+
+        if cell_type == 'inlineStr':
+            inline = cell.find(_INLINE_STRING_TAG)
+            return _string_item_text(inline) if inline is not None else None
+
+        return self._typed_value(cell_type, cell.findtext(_VALUE_TAG))
+
+    def _raw_cell_value(self, attributes: bytes, content: Optional[bytes]) -> Any:
+        """Ayrıştırılmamış hücre XML'inden değeri çöz"""
+        if not content:
+            return None
+
+        type_match = _TYPE_ATTR_PATTERN.search(attributes)
+        cell_type = type_match.group(1).decode('ascii') if type_match else None
+
+        if cell_type == 'inlineStr':
+            content = _PHONETIC_PATTERN.sub(b'', content)
+            return ''.join(_xml_text(t) for t in _TEXT_PATTERN.findall(content))
+
+        value_match = _VALUE_PATTERN.search(content)
+        return self._typed_value(cell_type, _xml_text(value_match.group(1)) if value_match else None)
+
+    def _typed_value(self, cell_type: Optional[str], text: Optional[str]) -> Any:
+        """<v> metnini hücre tipine göre dönüştür"""
+        if text is None:
+            return None
+
+        if cell_type == 's':
+            return self._shared_strings[int(text)]
+        if cell_type in ('str', 'e', 'd'):
+            return text
+        if cell_type == 'b':
+            return text == '1'
+
+        try:
+            number = float(text)
+        except ValueError:
+            raise RawXlsxLayoutError(f"Beklenmeyen sayı değeri: {text!r}")
+        return int(number) if number.is_integer() else number
+
+    def close(self) -> None:
+        """Dosyayı kapat"""
+        self._sheet_file.close()
+        self._shared_strings.close()
+        self._zip.close()
+
+
+class _LazySharedStrings:
+    """sharedStrings.xml tablosunu istenen indekse kadar okur"""
+
+    def __init__(self, archive: zipfile.ZipFile):
+        self._strings: List[str] = []
+        self._file = None
+        self._chunks: Iterator[bytes] = iter(())
+        if _SHARED_STRINGS_MEMBER in archive.namelist():
+            self._file = archive.open(_SHARED_STRINGS_MEMBER)
+            self._chunks = _iter_xml_chunks(self._file, b'sst', b'sst', b'si')
+
+    def __getitem__(self, index: int) -> str:
+        while index >= len(self._strings):
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                raise RawXlsxLayoutError(f"Paylaşılan metin bulunamadı: {index}")
+            self._strings.extend(_string_item_text(item) for item in _parse_xml_chunk(chunk))
+        return self._strings[index]
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+
+
+class CalamineRowSource:
+    """python-calamine (Rust) satır kaynağı
+    
+    Sayfa tek seferde yerel bellekte okunur, satırlar Python nesnesine tek
+    tek dönüştürülür. .xlsx, .xlsm, .xlsb, .xls ve .ods dosyalarını okur.
+    """
+
+    def __init__(self, file_path: str):
+        from python_calamine import CalamineWorkbook
+
+        self._workbook = CalamineWorkbook.from_path(file_path)
+        sheet = self._workbook.get_sheet_by_index(0)
+        # Kullanılan alan A sütunundan başlamıyorsa soldaki boş sütunlar eklenir
+        self._column_offset = sheet.start[1] if sheet.start else 0
+        self._rows = iter(sheet.iter_rows())
+
+    def rows(self) -> Iterator[tuple]:
+        """Kalan satırları sırayla ver"""
+        padding = (None,) * self._column_offset
+        for row in self._rows:
+            yield padding + tuple(_convert_calamine_cell(value) for value in row)
+
+    def column_values(self, index: int) -> Iterator[Any]:
+        """Kalan satırlardan sadece bir sütunu ver"""
+        index -= self._column_offset
+        for row in self._rows:
+            yield _convert_calamine_cell(row[index]) if 0 <= index < len(row) else None
+
+    def close(self) -> None:
+        """Dosyayı kapat"""
+        close = getattr(self._workbook, 'close', None)
+        if close is not None:
+            close()
+
+
+class XlrdRowSource:
+    """xlrd satır kaynağı (eski .xls dosyaları)"""
+
+    def __init__(self, file_path: str):
+        import xlrd
+
+        self._book = xlrd.open_workbook(file_path, on_demand=True)
+        self._sheet = self._book.sheet_by_index(0)
+        self._next_row = 0
+
+    def rows(self) -> Iterator[tuple]:
+        """Kalan satırları sırayla ver"""
+        while self._next_row < self._sheet.nrows:
+            values = self._sheet.row_values(self._next_row)
+            self._next_row += 1
+            yield tuple(None if value == '' else _convert_cell(value) for value in values)
+
+    def column_values(self, index: int) -> Iterator[Any]:
+        """Kalan satırlardan sadece bir sütunu ver"""
+        while self._next_row < self._sheet.nrows:
+            row = self._next_row
+            self._next_row += 1
+            if index >= self._sheet.row_len(row):
+                yield None
+                continue
+            value = self._sheet.cell_value(row, index)
+            yield None if value == '' else _convert_cell(value)
+
+    def close(self) -> None:
+        """Dosyayı kapat"""
+        self._book.release_resources()
+
+
+class ReaderEngine:
+    """Okuma motoru kaydı: satır kaynağı, desteklenen uzantılar ve gereken modül
+    
+    bounded_memory=True olan motorlar sayfayı parça parça okur; bellek
+    kullanımı sayfa boyutuyla büyümez.
+    """
+
+    def __init__(self, name: str, row_source: type, extensions: set, module: Optional[str] = None,
+                 bounded_memory: bool = False):
+        self.name = name
+        self.row_source = row_source
+        self.extensions = extensions
+        self.module = module
+        self.bounded_memory = bounded_memory
+
+    def is_available(self) -> bool:
+        """Gereken modül kurulu mu?"""
+        return self.module is None or importlib.util.find_spec(self.module) is not None
+
+    def supports(self, file_path: str) -> bool:
+        """Motor bu dosya uzantısını okuyabilir mi?"""
+        return Path(file_path).suffix.lower() in self.extensions
+
+
+READER_ENGINES: 'OrderedDict[str, ReaderEngine]' = OrderedDict()
+
+
+def register_engine(engine: ReaderEngine) -> None:
+    """Okuma motorunu kaydet (aynı adlı kayıt değiştirilir)"""
+    READER_ENGINES[engine.name] = engine
+
+
+register_engine(ReaderEngine('openpyxl', OpenpyxlRowSource, {'.xlsx', '.xlsm'}, 'openpyxl', bounded_memory=True))
+register_engine(ReaderEngine('calamine', CalamineRowSource, {'.xlsx', '.xlsm', '.xlsb', '.xls', '.ods'},
+                             'python_calamine'))
+register_engine(ReaderEngine('rawxml', RawXlsxRowSource, {'.xlsx', '.xlsm'}, bounded_memory=True))
+register_engine(ReaderEngine('xlrd', XlrdRowSource, {'.xls'}, 'xlrd'))
+
+
+def available_engines() -> List[str]:
+    """Seçilebilecek motor adları ('auto' dahil, sadece kurulu olanlar)"""
+    return [AUTO_ENGINE] + [name for name, engine in READER_ENGINES.items() if engine.is_available()]
+
+
+def select_engine(file_path: str, engine: str = AUTO_ENGINE, bounded_memory: bool = False) -> Optional[str]:
+    """Dosya için kullanılacak okuma motorunu belirle
+    
+    İstenen motor kurulu değilse veya dosya uzantısını okuyamıyorsa otomatik
+    seçime dönülür. bounded_memory=True ise önce sayfayı parça parça okuyan
+    motorlar denenir (.xls için böyle bir motor yoktur, normal seçim yapılır).
+    None dönerse dosya pandas ile tek seferde okunur.
+    """
+    if engine != AUTO_ENGINE:
+        selected = READER_ENGINES.get(engine)
+        if selected is None:
+            logging.warning(f"Bilinmeyen okuma motoru '{engine}', otomatik seçim kullanılıyor")
+        elif not selected.is_available():
+            logging.warning(f"Okuma motoru '{engine}' kurulu değil, otomatik seçim kullanılıyor")
+        elif bounded_memory and not selected.bounded_memory and selected.supports(file_path):
+            logging.info(f"Okuma motoru '{engine}' sayfayı tümüyle belleğe alıyor, akış motoru seçiliyor")
+        elif selected.supports(file_path):
+            return engine
+
+    if bounded_memory:
+        for name in ('rawxml', 'openpyxl'):
+            candidate = READER_ENGINES[name]
+            if candidate.supports(file_path) and candidate.is_available():
+                return name
+
+    # Otomatik seçim, .xlsx: calamine en hızlısı ama sayfayı tümüyle bellekte tutar;
+    # çok büyük sayfalarda sınırlı bellekle okuyan ham XML, küçüklerde openpyxl
+    if READER_ENGINES['rawxml'].supports(file_path):
+        size_mb = _sheet_size_mb(file_path)
+        if READER_ENGINES['calamine'].is_available() and size_mb < CALAMINE_AUTO_MAX_MB:
+            return 'calamine'
+        return 'rawxml' if size_mb >= RAWXML_AUTO_MIN_MB else 'openpyxl'
+
+    # Diğer uzantılar: kurulu olan ilk uygun motor
+    for name in ('calamine', 'xlrd'):
+        candidate = READER_ENGINES.get(name)
+        if candidate is not None and candidate.supports(file_path) and candidate.is_available():
+            return name
+    return None
+
+
+def _sheet_size_mb(file_path: str) -> float:
+    """İlk sayfanın zip içindeki açılmış XML boyutu (MB); okunamazsa 0"""
+    try:
+        with zipfile.ZipFile(file_path) as archive:
+            return archive.getinfo(_first_sheet_member(archive)).file_size / (1024 * 1024)
+    except (OSError, KeyError, zipfile.BadZipFile, RawXlsxLayoutError):
+        return 0.0
+
+
+class HeaderDetector:
+    """'Cari Ünvan' başlık satırını ve sütununu bulma kuralları
+    
+    Başlık adlarından (eş anlamlılar dahil) biri büyük/küçük harf duyarsız
+    olarak geçen ilk satır başlık satırıdır. En az min_probe_rows satıra
+    bakılır; başlık bulunamazsa pencere max_probe_rows satıra kadar genişler.
+    """
+
+    def __init__(self, synonyms: Tuple[str, ...] = HEADER_SYNONYMS, min_probe_rows: int = PROBE_ROWS,
+                 max_probe_rows: int = MAX_PROBE_ROWS):
+        self.synonyms = tuple(name.strip() for name in synonyms if isinstance(name, str) and name.strip())
+        if not self.synonyms:
+            raise ValueError("En az bir başlık adı gerekli")
+        self.min_probe_rows = max(int(min_probe_rows), 1)
+        self.max_probe_rows = max(int(max_probe_rows), self.min_probe_rows)
+        self._needles = tuple(name.lower() for name in self.synonyms)
+
+    def signature(self) -> str:
+        """Okuma sonucunu etkileyen kuralların imzası"""
+        return f"{self.min_probe_rows}|{self.max_probe_rows}|{'|'.join(self.synonyms)}"
+
+    def matches(self, value: Any) -> bool:
+        """Hücre bir başlık adı içeriyor mu?"""
+        if not isinstance(value, str):
+            return False
+        text = value.lower()
+        return any(needle in text for needle in self._needles)
+
+    def find_row(self, df: pd.DataFrame) -> int:
+        """Başlık satırının indeksi, yoksa -1
+        
+        Hücreler NumPy metin dizisi olarak bloklar halinde taranır; blok
+        boyutu her adımda iki katına çıkar ve ilk eşleşmede durulur.
+        """
+        values = df.to_numpy(dtype=object)
+        start, block_size = 0, self.min_probe_rows
+        while start < len(values):
+            block = np.char.lower(values[start:start + block_size].astype(str))
+            hits = np.zeros(len(block), dtype=bool)
+            for needle in self._needles:
+                hits |= (np.char.find(block, needle) >= 0).any(axis=1)
+
+            found = np.flatnonzero(hits)
+            if found.size:
+                return int(df.index[start + found[0]])
+            start += len(block)
+            block_size *= 2
+        return -1
+
+    def find_column(self, columns) -> Optional[str]:
+        """Başlık adını içeren ilk sütun"""
+        for col in columns:
+            if self.matches(col):
+                return col
+        return None
+
+    def column_index(self, row: tuple) -> Optional[int]:
+        """Başlık satırında başlık adını içeren ilk hücrenin indeksi"""
+        for i, value in enumerate(row):
+            if self.matches(value):
+                return i
+        return None
+
+    def split_key_columns(self, columns: Tuple[str, ...]) -> Tuple[bool, Tuple[str, ...]]:
+        """Anahtar sütunlarını ayır: ünvan sütunu anahtarda mı ve ek sütunlar
+
+        Liste boşsa anahtar sadece ünvandır. Başlık adlarından birini içeren
+        sütun ünvan sütunu sayılır, diğerleri ('Cari Kodu' gibi) ek sütundur.
+        """
+        extras = tuple(column for column in columns if not self.matches(column))
+        return not columns or len(extras) < len(columns), extras
+
+
+def named_column_index(row, name: str) -> Optional[int]:
+    """Başlık satırında adı (boşluklar ve büyük/küçük harf hariç) tam eşleşen ilk hücrenin indeksi"""
+    needle = name.strip().casefold()
+    for i, value in enumerate(row):
+        if isinstance(value, str) and value.strip().casefold() == needle:
+            return i
+    return None
+
+
+DEFAULT_HEADER_DETECTOR = HeaderDetector()
+
+
+class KeyColumnStream:
+    """Satırları tek tek okuyup sadece 'Cari Ünvan' sütununu veren akış okuyucu
+    
+    Başlık satırı ilk satırlar okunurken bulunur (HeaderDetector penceresi);
+    sonraki satırlardan sadece hedef sütundaki hücre tutulur. Bellek
+    kullanımı sayfadaki sütun sayısından bağımsızdır. extra_columns verilirse
+    ('Cari Kodu' gibi bileşik anahtar sütunları) records() bu sütunları da verir.
+    """
+
+    def __init__(self, file_path: str, engine: str = 'openpyxl', detector: Optional[HeaderDetector] = None,
+                 extra_columns: Tuple[str, ...] = ()):
+        self.file_path = str(file_path)
+        self.engine = engine
+        self.detector = detector or DEFAULT_HEADER_DETECTOR
+        self.extra_columns = tuple(extra_columns)
+        self.probe_rows: List[tuple] = []
+        self.header_row = -1
+        self.column_index: Optional[int] = None
+        self.column_name: Optional[str] = None
+        self.extra_indexes: Dict[str, int] = {}
+
+        self._source = READER_ENGINES[engine].row_source(self.file_path)
+        try:
+            self._read_probe()
+        except Exception:
+            self.close()
+            raise
+
+    def _read_probe(self) -> None:
+        """İlk satırları oku ve başlık satırını bul"""
+        detector = self.detector
+        for row in self._source.rows():
+            self.probe_rows.append(row)
+
+            if self.header_row == -1 and any(detector.matches(value) for value in row):
+                self.header_row = len(self.probe_rows) - 1
+                self.column_index = detector.column_index(row)
+                if self.column_index is not None:
+                    self.column_name = str(row[self.column_index]).strip()
+                for name in self.extra_columns:
+                    index = named_column_index(row, name)
+                    if index is not None:
+                        self.extra_indexes[name] = index
+
+            if len(self.probe_rows) >= detector.max_probe_rows:
+                break
+            if self.header_row != -1 and len(self.probe_rows) >= detector.min_probe_rows:
+                break
+
+    def __iter__(self) -> Iterator[Any]:
+        """Başlık satırından sonraki 'Cari Ünvan' hücrelerini sırayla ver"""
+        if self.column_index is None:
+            return
+
+        index = self.column_index
+        # Önce ön okumada kalan veri satırları
+        for row in self.probe_rows[self.header_row + 1:]:
+            yield row[index] if index < len(row) else None
+
+        # Sonra sayfanın geri kalanı, satır satır
+        yielded = 0
+        try:
+            for value in self._source.column_values(index):
+                if value is not None:
+                    yielded += 1
+                yield value
+        except RawXlsxLayoutError as e:
+            if self.engine == 'openpyxl':
+                raise
+            # Ham XML yolu sayfanın ortasında beklenmeyen bir yapıya rastladı
+            logging.warning(f"Ham XLSX okuma yarıda kaldı ({e}), openpyxl ile devam ediliyor: {self.file_path}")
+            yield from self._resume_with_openpyxl(yielded)
+
+    @property
+    def missing_columns(self) -> List[str]:
+        """Başlık satırında bulunamayan ek anahtar sütunları"""
+        return [name for name in self.extra_columns if name not in self.extra_indexes]
+
+    def records(self) -> Iterator[tuple]:
+        """Başlık satırından sonraki (ünvan, ek sütun değerleri...) demetlerini sırayla ver
+        
+        Ek sütun yoksa değerler tek elemanlı demetlerdir; bulunamayan ek
+        sütunlar için None verilir.
+        """
+        if self.column_index is None:
+            return
+        if not self.extra_columns:
+            for value in self:
+                yield (value,)
+            return
+
+        indexes = (self.column_index,) + tuple(self.extra_indexes.get(name, -1) for name in self.extra_columns)
+        for row in self.probe_rows[self.header_row + 1:]:
+            yield _pick(row, indexes)
+
+        yielded = 0
+        try:
+            for row in self._source.rows():
+                record = _pick(row, indexes)
+                if record[0] is not None:
+                    yielded += 1
+                yield record
+        except RawXlsxLayoutError as e:
+            if self.engine == 'openpyxl':
+                raise
+            logging.warning(f"Ham XLSX okuma yarıda kaldı ({e}), openpyxl ile devam ediliyor: {self.file_path}")
+            yield from self._resume_with_openpyxl(yielded, indexes)
+
+    def rows(self) -> Iterator[tuple]:
+        """Başlık satırından sonraki satırları bütün sütunlarıyla sırayla ver"""
+        if self.header_row == -1:
+            return
+        yield from self.probe_rows[self.header_row + 1:]
+        yield from self._source.rows()
+
+    def _resume_with_openpyxl(self, skip_values: int, indexes: Optional[tuple] = None) -> Iterator[Any]:
+        """Dosyayı openpyxl ile yeniden açıp verilmiş boş olmayan değerlerden sonrasını ver
+        
+        Motorlar boş satırları farklı sayabildiği için konum, verilmiş boş
+        olmayan değer sayısıyla bulunur. indexes verilirse (records) tek
+        değer yerine bu sütunlardan oluşan demetler verilir.
+        """
+        self.close()
+        self.engine = 'openpyxl'
+        self._source = READER_ENGINES['openpyxl'].row_source(self.file_path)
+
+        rows = self._source.rows()
+        for _ in range(len(self.probe_rows)):
+            if next(rows, None) is None:
+                return
+        if indexes is None:
+            values = self._source.column_values(self.column_index)
+        else:
+            values = (_pick(row, indexes) for row in self._source.rows())
+        for value in values:
+            if skip_values:
+                if (value if indexes is None else value[0]) is not None:
+                    skip_values -= 1
+                continue
+            yield value
+
+    def close(self) -> None:
+        """Dosyayı kapat"""
+        try:
+            self._source.close()
+        except Exception as e:
+            logging.debug(f"Workbook kapatma hatası: {e}")
+
+
+def _pick(row: tuple, indexes: tuple) -> tuple:
+    """Satırdan verilen sütunları seç (olmayan sütunlar None)"""
+    return tuple(row[index] if 0 <= index < len(row) else None for index in indexes)
+
+
+def open_key_stream(file_path: str, engine: str = AUTO_ENGINE, detector: Optional[HeaderDetector] = None,
+                    extra_columns: Tuple[str, ...] = ()) -> KeyColumnStream:
+    """Dosyayı sınırlı bellekle okuyan bir KeyColumnStream aç (büyük dosyalar için)
+    
+    Ham XML okuyucu dosyanın yapısını tanımazsa openpyxl ile açılır.
+    """
+    selected = select_engine(file_path, engine, bounded_memory=True)
+    if selected is None:
+        raise ValueError(f"Dosya akış olarak okunamıyor: {file_path}")
+    try:
+        return KeyColumnStream(file_path, engine=selected, detector=detector, extra_columns=extra_columns)
+    except RawXlsxLayoutError as e:
+        logging.warning(f"Ham XLSX okuma başarısız ({e}), openpyxl ile okunuyor: {file_path}")
+        return KeyColumnStream(file_path, engine='openpyxl', detector=detector, extra_columns=extra_columns)
+
+
+class LoadedWorkbook:
+    """Bir kez okunan ve doğrulama, depo adı, başlık arama ve tam veri için kullanılan çalışma kitabı
+    
+    streaming=True ise sayfa seçilen okuma motoruyla (engine, 'auto' dahil) akış
+    olarak okunur ve sadece ilk satırlar ile 'Cari Ünvan' sütunu bellekte
+    tutulur. Dosyayı okuyabilen motor yoksa pandas ile tek seferde okunur.
+    extra_columns ile bileşik anahtarın ek sütunları da ('Cari Kodu' gibi) tutulur.
+    """
+
+    def __init__(self, file_path: str, streaming: bool = False, engine: str = AUTO_ENGINE,
+                 cached: Optional[Dict[str, Any]] = None, detector: Optional[HeaderDetector] = None,
+                 extra_columns: Tuple[str, ...] = ()):
+        self.file_path = str(file_path)
+        self.fingerprint = file_fingerprint(self.file_path)
+        self.detector = detector or DEFAULT_HEADER_DETECTOR
+        self.extra_columns = tuple(extra_columns)
+        self.engine = select_engine(self.file_path, engine) if streaming and cached is None else None
+        self.streaming = self.engine is not None
+        self.raw: Optional[pd.DataFrame] = None
+        self.header_row = -1
+        self.key_column: Optional[str] = None
+        self._probe_rows: List[tuple] = []
+        self._key_values: List[Any] = []
+        self._extra_values: Dict[str, List[str]] = {}
+        self._key_data: Optional[Dict[str, Any]] = None
+        self._names: Optional[pd.Series] = None
+        self._key_parts: Dict[str, pd.Series] = {}
+        self._keys: Dict[str, Any] = {}
+        self._keys_lock = threading.Lock()
+
+        if cached is not None:
+            # Kalıcı önbellekten: Excel hiç okunmaz
+            self._probe_rows = [tuple(row) for row in cached["probe_rows"]]
+            self.header_row = cached["header_row"]
+            self.key_column = cached["key_column"]
+            self._key_values = cached["key_values"]
+            self._extra_values = cached.get("extra_values", {})
+        else:
+            start = time.perf_counter()
+            if self.streaming:
+                try:
+                    self._load_streaming()
+                except RawXlsxLayoutError as e:
+                    # Ham XML yolu bu dosyayı okuyamıyor, pandas yoluna dön
+                    logging.warning(f"Ham XLSX okuma başarısız ({e}), pandas ile okunuyor: {self.file_path}")
+                    self.streaming = False
+                    self.engine = None
+                    self.raw = self._load()
+            else:
+                self.raw = self._load()
+            row_count = len(self.raw) if self.raw is not None else len(self._key_values)
+            logging.info(
+                f"Okuma tamamlandı ({self.engine or 'pandas'}): {time.perf_counter() - start:.2f} sn, "
+                f"{row_count} satır - {self.file_path}"
+            )
+
+    def _load(self) -> pd.DataFrame:
+        """İlk sayfayı başlıksız olarak tek seferde oku"""
+        logging.info(f"Excel dosyası okunuyor: {self.file_path}")
+        return pd.read_excel(self.file_path, header=None)
+
+    def _load_streaming(self) -> None:
+        """Sayfayı akış olarak oku, sadece 'Cari Ünvan' sütununu tut"""
+        logging.info(f"Excel dosyası akış modunda okunuyor ({self.engine}): {self.file_path}")
+        stream = KeyColumnStream(self.file_path, engine=self.engine, detector=self.detector,
+                                 extra_columns=self.extra_columns)
+        try:
+            self._probe_rows = stream.probe_rows
+            self.header_row = stream.header_row
+            self.key_column = stream.column_name
+            if stream.extra_indexes:
+                columns = list(zip(*stream.records())) or [()] * (len(self.extra_columns) + 1)
+                self._key_values = list(columns[0])
+                self._extra_values = {
+                    name: key_text(values).tolist() for name, values in zip(self.extra_columns, columns[1:])
+                    if name in stream.extra_indexes
+                }
+            else:
+                self._key_values = list(stream)
+            self.engine = stream.engine
+        finally:
+            stream.close()
+
+    def is_stale(self) -> bool:
+        """Dosya okunduktan sonra değişmiş mi?"""
+        try:
+            return file_fingerprint(self.file_path) != self.fingerprint
+        except OSError:
+            return True
+
+    def probe(self, nrows: Optional[int] = None) -> pd.DataFrame:
+        """İlk satırları başlıksız olarak döndür (pd.read_excel(header=None, nrows=...) karşılığı)
+        
+        nrows verilmezse başlık arama penceresinin tamamı döner.
+        """
+        if self.raw is not None:
+            return self.raw.head(nrows or self.detector.max_probe_rows)
+        return pd.DataFrame(self._probe_rows[:nrows])
+
+    def frame(self, header_row: int) -> pd.DataFrame:
+        """Verilen satırı başlık kabul eden DataFrame döndür (pd.read_excel(header=...) karşılığı)
+        
+        Akış modunda sadece 'Cari Ünvan' sütununu içerir.
+        """
+        if self.raw is None:
+            if header_row != self.header_row:
+                raise ValueError(f"Akış modunda başlık satırı {self.header_row}, istenen {header_row}")
+            if self.key_column is None:
+                return pd.DataFrame()
+            return pd.DataFrame({self.key_column: self._key_values, **self._extra_values})
+
+        df = self.raw.iloc[header_row + 1:].reset_index(drop=True)
+        df.columns = _make_column_names(self.raw.iloc[header_row].tolist())
+        return df
+
+    def key_data(self) -> Dict[str, Any]:
+        """İlk satırlar, başlık satırı, 'Cari Ünvan' ve ek anahtar sütunları (önbellek ve süreçler arası aktarım için)
+
+        Tam veri bellekteyse bir kez hesaplanır ve saklanır.
+        """
+        if self.raw is None:
+            return {
+                "probe_rows": self._probe_rows,
+                "header_row": self.header_row,
+                "key_column": self.key_column,
+                "key_values": self._key_values,
+                "extra_values": self._extra_values,
+            }
+
+        if self._key_data is None:
+            probe = self.raw.head(self.detector.max_probe_rows)
+            header_row = self.detector.find_row(probe)
+            probe = probe.head(max(self.detector.min_probe_rows, header_row + 1))
+            data = {
+                "probe_rows": [tuple(row) for row in probe.itertuples(index=False)],
+                "header_row": header_row,
+                "key_column": None,
+                "key_values": [],
+                "extra_values": {},
+            }
+            if data["header_row"] != -1:
+                df = self.frame(data["header_row"])
+                columns = [col.strip() if isinstance(col, str) else col for col in df.columns]
+                data["key_column"] = self.detector.find_column(columns)
+                if data["key_column"] is not None:
+                    data["key_values"] = df.iloc[:, columns.index(data["key_column"])].tolist()
+                    for name in self.extra_columns:
+                        index = named_column_index(columns, name)
+                        if index is not None:
+                            data["extra_values"][name] = key_text(df.iloc[:, index]).tolist()
+            self._key_data = data
+        return self._key_data
+
+    @property
+    def missing_columns(self) -> List[str]:
+        """Dosyada bulunamayan ek anahtar sütunları"""
+        found = self.key_data()["extra_values"]
+        return [name for name in self.extra_columns if name not in found]
+
+    def names(self) -> pd.Series:
+        """Temizlenmiş 'Cari Ünvan' değerleri (görüntülenen yazılış, bir kez hesaplanır)"""
+        if self._names is None:
+            data = self.key_data()
+            if data["extra_values"]:
+                self._names, self._key_parts = clean_key_rows(data["key_values"], data["extra_values"])
+            else:
+                self._names = clean_names(data["key_values"])
+        return self._names
+
+    def key_parts(self) -> Dict[str, pd.Series]:
+        """names() ile aynı satırlardaki ek anahtar sütunları (metin olarak)"""
+        self.names()
+        return self._key_parts
+
+    def data_frame(self) -> pd.DataFrame:
+        """names() ile aynı satırlarda tüm sütunlar (değişiklik tespiti için)
+
+        Tam veri bellekteyse oradan alınır; akış modunda veya kalıcı
+        önbellekten gelen kitaplarda sayfa tüm sütunlarıyla bir kez daha okunur
+        (sonuç saklanmaz). Sütun adlarının baş/son boşlukları atılır.
+        """
+        if self.raw is not None:
+            header_row = self.detector.find_row(self.probe())
+            frame = self.frame(header_row) if header_row != -1 else pd.DataFrame()
+        else:
+            frame = self._read_full_frame()
+        frame.columns = [col.strip() if isinstance(col, str) else col for col in frame.columns]
+
+        key_column = self.detector.find_column(frame.columns)
+        if key_column is None:
+            raise ValueError(f"'Cari Ünvan' sütunu bulunamadı: {self.file_path}")
+        values = frame[key_column]
+        text = values.astype(str).str.strip()
+        keep = (values.notna() & (text != '')).to_numpy()
+        if not text[keep].reset_index(drop=True).equals(self.names()):
+            raise ValueError(f"Tam okuma ile 'Cari Ünvan' listesi eşleşmiyor: {self.file_path}")
+        return frame[keep].reset_index(drop=True)
+
+    def _read_full_frame(self) -> pd.DataFrame:
+        """Sayfayı tüm sütunlarıyla tekrar oku; başlık satırı sütun adları olur"""
+        engine = select_engine(self.file_path, self.engine or AUTO_ENGINE)
+        if engine is not None:
+            try:
+                stream = KeyColumnStream(self.file_path, engine=engine, detector=self.detector)
+                try:
+                    if stream.header_row == -1:
+                        return pd.DataFrame()
+                    header = list(stream.probe_rows[stream.header_row])
+                    rows = list(stream.rows())
+                finally:
+                    stream.close()
+                # Motorların verdiği değerler korunur (boş hücre yüzünden float'a dönüşmez)
+                frame = pd.DataFrame(rows, dtype=object).reindex(columns=range(len(header)))
+                frame.columns = _make_column_names(header)
+                return frame
+            except RawXlsxLayoutError as e:
+                logging.warning(f"Ham XLSX okuma başarısız ({e}), pandas ile okunuyor: {self.file_path}")
+
+        raw = self._load()
+        header_row = self.detector.find_row(raw.head(self.detector.max_probe_rows))
+        if header_row == -1:
+            return pd.DataFrame()
+        frame = raw.iloc[header_row + 1:].reset_index(drop=True)
+        frame.columns = _make_column_names(raw.iloc[header_row].tolist())
+        return frame
+
+    def comparison_keys(self, normalizer: NameNormalizer, compute: Optional[Callable[[], Any]] = None,
+                        signature: Optional[str] = None) -> Any:
+        """names() ile aynı sırada normalleştirilmiş anahtarlar
+
+        Her normalleştirme ayarı (veya verilen imza) için bir kez hesaplanır ve
+        saklanır; compute verilirse (kalıcı önbellekten okuma, bileşik anahtar
+        gibi) hesaplama için o kullanılır.
+        """
+        signature = signature or normalizer.signature()
+        with self._keys_lock:
+            keys = self._keys.get(signature)
+            if keys is None:
+                keys = compute() if compute else normalizer.normalize(self.names())
+                self._keys[signature] = keys
+            return keys
+
+    def compact(self) -> None:
+        """Tam veriyi bırakıp sadece ilk satırları ve 'Cari Ünvan' sütununu tut
+        
+        Akış modundaki gibi küçük bir nesne elde edilir; süreçler arası
+        taşınırken DataFrame yerine sadece listeler kopyalanır.
+        """
+        if self.raw is None:
+            return
+
+        data = self.key_data()
+        self._probe_rows = data["probe_rows"]
+        self.header_row = data["header_row"]
+        self.key_column = data["key_column"]
+        self._key_values = data["key_values"]
+        self._extra_values = data["extra_values"]
+        self._key_data = None
+        self.raw = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Kilit süreçler arasında taşınamaz
+        state = self.__dict__.copy()
+        del state["_keys_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._keys_lock = threading.Lock()
+
+
+class WorkbookCache:
+    """Dosya seçimi ile karşılaştırma arasında okunan çalışma kitaplarını saklar
+    
+    key_columns bileşik anahtarın sütunlarıdır (set_key_columns); boşsa
+    karşılaştırma sadece 'Cari Ünvan' ile yapılır. parallel_load kapalıysa
+    get_many dosyaları alt süreç açmadan sırayla okur (zaten alt süreçte
+    çalışan toplu karşılaştırma için).
+    """
+
+    def __init__(self, max_entries: int = WORKBOOK_CACHE_SIZE, streaming: bool = True, engine: str = AUTO_ENGINE,
+                 parse_cache: Optional[ParseCache] = None, detector: Optional[HeaderDetector] = None,
+                 key_columns: Tuple[str, ...] = ()):
+        self.max_entries = max_entries
+        self.streaming = streaming
+        self.engine = engine
+        self.parse_cache = parse_cache
+        self.detector = detector or DEFAULT_HEADER_DETECTOR
+        self.parallel_load = True
+        self._entries: 'OrderedDict[str, LoadedWorkbook]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._path_locks: Dict[str, threading.Lock] = {}
+        self.key_columns: Tuple[str, ...] = ()
+        self.include_name = True
+        self.extra_columns: Tuple[str, ...] = ()
+        self.set_key_columns(key_columns)
+
+    def get(self, file_path: str) -> LoadedWorkbook:
+        """Dosyayı önbellekten döndür, yoksa veya değişmişse oku"""
+        key = _cache_key(file_path)
+
+        # Aynı dosya iki thread'den istenirse ikinci istek ilk okumayı bekler
+        with self._path_lock(key):
+            workbook = self._lookup(key)
+            if workbook is not None:
+                logging.debug(f"Önbellekten kullanıldı: {file_path}")
+                return workbook
+
+            workbook = self._from_parse_cache(file_path)
+            if workbook is None:
+                workbook = LoadedWorkbook(file_path, streaming=self.streaming, engine=self.engine,
+                                          detector=self.detector, extra_columns=self.extra_columns)
+                self._to_parse_cache(workbook)
+            self._store(key, workbook)
+            return workbook
+
+    def get_many(self, file_paths: List[str]) -> List[LoadedWorkbook]:
+        """Birden fazla dosyayı döndür; önbellekte olmayanları paralel süreçlerde oku
+        
+        XLSX ayrıştırma GIL'i tuttuğu için thread yerine süreç kullanılır.
+        Süreçlerden sadece ilk satırlar ve 'Cari Ünvan' listesi geri gelir.
+        Paralel okunan kitaplar önbellekten düşse bile (dosya sayısı
+        max_entries'ten fazlaysa) doğrudan döndürülür, tekrar okunmaz.
+        """
+        missing = [path for path in file_paths if self._lookup(_cache_key(path)) is None]
+        workers = min(len(missing), os.cpu_count() or 1)
+        loaded: Dict[str, LoadedWorkbook] = {}
+        if self.parallel_load and workers > 1 and _total_size_mb(missing) >= PARALLEL_LOAD_MIN_MB:
+            try:
+                loaded = self._load_parallel(missing)
+            except (OSError, RuntimeError, BrokenProcessPool) as e:
+                # Süreç başlatılamazsa (kısıtlı ortam vb.) sırayla okunur
+                logging.warning(f"Paralel okuma başarısız, sırayla okunuyor: {e}")
+
+        return [loaded.get(_cache_key(path)) or self.get(path) for path in file_paths]
+
+    def _load_parallel(self, file_paths: List[str]) -> Dict[str, LoadedWorkbook]:
+        """Dosyaları ayrı süreçlerde okuyup önbelleğe ekle; okunan kitapları anahtarlarıyla döndür"""
+        keys = sorted({_cache_key(path): path for path in file_paths}.items())
+        locks = [self._path_lock(key) for key, _ in keys]
+        loaded: Dict[str, LoadedWorkbook] = {}
+
+        # Kilitler sabit sırayla alınır (ön yükleme thread'leriyle kilitlenme olmaz)
+        for lock in locks:
+            lock.acquire()
+        try:
+            pending = []
+            for key, path in keys:
+                workbook = self._lookup(key) or self._from_parse_cache(path)
+                if workbook is not None:
+                    self._store(key, workbook)
+                    loaded[key] = workbook
+                else:
+                    pending.append((key, path))
+            if len(pending) < 2:
+                return loaded
+
+            logging.info(f"{len(pending)} dosya paralel okunuyor")
+            with ProcessPoolExecutor(max_workers=min(len(pending), os.cpu_count() or 1)) as executor:
+                futures = {
+                    key: executor.submit(_load_compact_workbook, path, self.streaming, self.engine, self.detector,
+                                         self.extra_columns)
+                    for key, path in pending
+                }
+                for key, future in futures.items():
+                    workbook = future.result()
+                    self._to_parse_cache(workbook)
+                    self._store(key, workbook)
+                    loaded[key] = workbook
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+        return loaded
+
+    def comparison_keys(self, workbook: LoadedWorkbook, normalizer: NameNormalizer) -> pd.Series:
+        """Çalışma kitabının normalleştirilmiş anahtarları (bellekte, yoksa kalıcı önbellekte saklanır)"""
+        def compute() -> pd.Series:
+            names = workbook.names()
+            signature = f"{reader_signature(self.detector, self.extra_columns)}|{normalizer.signature()}"
+            if self.parse_cache is not None:
+                cached = self.parse_cache.load_keys(workbook.file_path, signature)
+                if cached is not None and len(cached) == len(names):
+                    return pd.Series(cached, dtype=STRING_DTYPE)
+
+            start = time.perf_counter()
+            keys = normalizer.normalize(names)
+            logging.info(
+                f"Anahtarlar normalleştirildi: {time.perf_counter() - start:.2f} sn, "
+                f"{len(keys)} ad - {workbook.file_path}"
+            )
+            if self.parse_cache is not None:
+                self.parse_cache.store_keys(workbook.file_path, keys.tolist(), signature)
+            return keys
+
+        return workbook.comparison_keys(normalizer, compute)
+
+    def set_key_columns(self, columns: Tuple[str, ...]) -> bool:
+        """Bileşik anahtar sütunlarını ayarla; ek sütunlar değiştiyse okunan dosyaları bırak"""
+        columns = tuple(columns)
+        include_name, extras = self.detector.split_key_columns(columns)
+        changed = extras != self.extra_columns
+        self.key_columns, self.include_name, self.extra_columns = columns, include_name, extras
+        if changed:
+            self.clear()
+        return changed
+
+    @property
+    def composite(self) -> bool:
+        """Anahtar sadece 'Cari Ünvan' değil mi?"""
+        return bool(self.extra_columns) or not self.include_name
+
+    def keyed_names(self, workbook: LoadedWorkbook, normalizer: NameNormalizer) -> Tuple[pd.Series, Any]:
+        """Görüntülenen yazılışlar ve karşılaştırma anahtarları
+        
+        Anahtar sadece ünvansa normalleştirilmiş metin anahtarlardır. Bileşik
+        anahtarda (ünvan + 'Cari Kodu' gibi) anahtarlar 64 bit tamsayı
+        dizisidir ve yazılışlar "ÜNVAN [kod]" biçimindedir; ünvan anahtarları
+        yine normalleştirme önbelleğinden gelir.
+        """
+        names = workbook.names()
+        if not self.composite:
+            return names, self.comparison_keys(workbook, normalizer)
+
+        parts = workbook.key_parts()
+        name_keys = self.comparison_keys(workbook, normalizer) if self.include_name else None
+        keys = workbook.comparison_keys(
+            normalizer, lambda: composite_keys(name_keys, parts, normalizer),
+            signature=f"composite:{self.key_signature(normalizer)}"
+        )
+        return composite_display(names, parts), keys
+
+    def key_signature(self, normalizer: NameNormalizer) -> str:
+        """keyed_names sonucunu etkileyen ayarların imzası (okuma, normalleştirme ve anahtar sütunları)"""
+        return (
+            f"{reader_signature(self.detector, self.extra_columns)}|{normalizer.signature()}|"
+            f"{'ünvan' if self.include_name else '-'}+{'+'.join(self.extra_columns)}"
+        )
+
+    def _from_parse_cache(self, file_path: str) -> Optional[LoadedWorkbook]:
+        """Kalıcı önbellekte varsa Excel okumadan çalışma kitabı oluştur"""
+        if self.parse_cache is None:
+            return None
+        cached = self.parse_cache.load(file_path, reader_signature(self.detector, self.extra_columns))
+        if cached is None:
+            return None
+        return LoadedWorkbook(file_path, cached=cached, detector=self.detector, extra_columns=self.extra_columns)
+
+    def _to_parse_cache(self, workbook: LoadedWorkbook) -> None:
+        """Okunan veriyi kalıcı önbelleğe yaz"""
+        if self.parse_cache is None:
+            return
+        data = workbook.key_data()
+        self.parse_cache.store(
+            workbook.file_path, data["probe_rows"], data["header_row"],
+            data["key_column"], data["key_values"], reader_signature(self.detector, self.extra_columns),
+            data["extra_values"]
+        )
+
+    def _path_lock(self, key: str) -> threading.Lock:
+        """Dosyaya özel okuma kilidi"""
+        with self._lock:
+            return self._path_locks.setdefault(key, threading.Lock())
+
+    def _lookup(self, key: str) -> Optional[LoadedWorkbook]:
+        """Güncel önbellek kaydını döndür"""
+        with self._lock:
+            workbook = self._entries.get(key)
+            if workbook is None or workbook.is_stale():
+                return None
+            self._entries.move_to_end(key)
+            return workbook
+
+    def _store(self, key: str, workbook: LoadedWorkbook) -> None:
+        """Önbelleğe ekle, en eski kayıtları at"""
+        with self._lock:
+            self._entries[key] = workbook
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                old_key, _ = self._entries.popitem(last=False)
+                self._path_locks.pop(old_key, None)
+
+    def discard(self, file_path: str) -> None:
+        """Dosyayı önbellekten çıkar"""
+        with self._lock:
+            self._entries.pop(_cache_key(file_path), None)
+
+    def clear(self) -> None:
+        """Önbelleği temizle"""
+        with self._lock:
+            self._entries.clear()
+
+
+def _load_compact_workbook(file_path: str, streaming: bool, engine: str, detector: HeaderDetector,
+                           extra_columns: Tuple[str, ...] = ()) -> LoadedWorkbook:
+    """Alt süreçte çalışır: dosyayı oku ve sadece gerekli listeleri döndür"""
+    workbook = LoadedWorkbook(file_path, streaming=streaming, engine=engine, detector=detector,
+                              extra_columns=extra_columns)
+    workbook.compact()
+    return workbook
+
+
+def _total_size_mb(file_paths: List[str]) -> float:
+    """Dosyaların toplam boyutu (MB)"""
+    total = 0
+    for path in file_paths:
+        try:
+            total += Path(path).stat().st_size
+        except OSError:
+            pass
+    return total / (1024 * 1024)
+
+
+def reader_signature(detector: Optional[HeaderDetector] = None, extra_columns: Tuple[str, ...] = ()) -> str:
+    """Okuma sonucunu etkileyen ayarların imzası (kalıcı önbellek anahtarı için)"""
+    signature = (detector or DEFAULT_HEADER_DETECTOR).signature()
+    if extra_columns:
+        signature += f"|ek:{'+'.join(extra_columns)}"
+    return signature
+
+
+def find_header_row(df: pd.DataFrame, detector: Optional[HeaderDetector] = None) -> int:
+    """DataFrame içinde başlık satırını bulur"""
+    return (detector or DEFAULT_HEADER_DETECTOR).find_row(df)
+
+
+def find_cari_unvan_column(columns, detector: Optional[HeaderDetector] = None) -> Optional[str]:
+    """Cari Ünvan sütununu bul"""
+    return (detector or DEFAULT_HEADER_DETECTOR).find_column(columns)
+
+
+def extract_depo_name(df: pd.DataFrame) -> Optional[str]:
+    """DataFrame'den depo adını çıkar ('Cari Kategori 3' satırından)"""
+    try:
+        for i in range(min(DEPO_SEARCH_ROWS, len(df))):
+            if len(df.columns) == 0:
+                continue
+                
+            row_str = str(df.iloc[i, 0])
+            if "Cari Kategori 3" in row_str:
+                match = re.search(r'\[(.*?)\]\s*(.*?)(?:\n|\r\n|$)', row_str)
+                if match and match.group(2):
+                    return match.group(2).strip()
+        return None
+    except Exception as e:
+        logging.error(f"Depo adı çıkarma hatası: {e}")
+        return None
+
+
+def _convert_cell(value: Any) -> Any:
+    """Hücre değerini pandas ile aynı şekilde dönüştür (tam sayı float -> int)"""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _convert_calamine_cell(value: Any) -> Any:
+    """calamine boş hücreleri '' olarak verir; pandas ile aynı olması için None"""
+    if value == '':
+        return None
+    return _convert_cell(value)
+
+
+def _first_sheet_member(archive: zipfile.ZipFile) -> str:
+    """Çalışma kitabındaki ilk sayfanın zip içindeki yolunu bul"""
+    names = set(archive.namelist())
+    try:
+        workbook = ET.fromstring(archive.read('xl/workbook.xml'))
+        rels = ET.fromstring(archive.read('xl/_rels/workbook.xml.rels'))
+    except KeyError:
+        if _DEFAULT_SHEET_MEMBER in names:
+            return _DEFAULT_SHEET_MEMBER
+        raise RawXlsxLayoutError("workbook.xml bulunamadı")
+    except ET.ParseError as e:
+        raise RawXlsxLayoutError(f"workbook.xml okunamadı: {e}")
+
+    sheet = workbook.find(f'{_MAIN_NS}sheets/{_MAIN_NS}sheet')
+    if sheet is None:
+        raise RawXlsxLayoutError("Çalışma kitabında sayfa bulunamadı")
+
+    rel_id = sheet.get(f'{_REL_NS}id')
+    for rel in rels.iter(f'{_PACKAGE_REL_NS}Relationship'):
+        if rel.get('Id') == rel_id:
+            target = rel.get('Target', '')
+            member = target.lstrip('/') if target.startswith('/') else f"xl/{target}"
+            if member in names:
+                return member
+            break
+    raise RawXlsxLayoutError(f"Sayfa dosyası bulunamadı: {rel_id}")
+
+
+def _iter_xml_chunks(stream, root_tag: bytes, container_tag: bytes, item_tag: bytes) -> Iterator[bytes]:
+    """Kapsayıcı içindeki tekrar eden elemanları parça parça ver
+    
+    Her parça, kök etiketin (ad alanı tanımlarıyla birlikte) içine alınmış tam
+    elemanlardan oluşan bağımsız bir XML belgesidir; bellek kullanımı parça
+    boyutuyla sınırlıdır.
+    """
+    buffer = b''
+    root_pattern = re.compile(rb'<' + root_tag + rb'\b[^>]*>')
+    container_pattern = re.compile(rb'<' + container_tag + rb'\b[^>]*?(/?)>')
+    item_close = b'</' + item_tag + b'>'
+    container_close = b'</' + container_tag + b'>'
+    root_close = b'</' + root_tag + b'>'
+
+    # Kök etiketi ve kapsayıcının başlangıcı
+    while True:
+        data = stream.read(_XML_BLOCK_SIZE)
+        buffer += data
+        root_match = root_pattern.search(buffer)
+        container_match = container_pattern.search(buffer, root_match.start()) if root_match else None
+        if container_match:
+            break
+        if not data:
+            raise RawXlsxLayoutError(f"<{container_tag.decode()}> elemanı bulunamadı")
+
+    if container_match.group(1):
+        # Boş kapsayıcı (<sheetData/>)
+        return
+
+    head = root_match.group(0)
+    buffer = buffer[container_match.end():]
+
+    while True:
+        data = stream.read(_XML_BLOCK_SIZE)
+        buffer += data
+        if data:
+            end = buffer.rfind(item_close)
+            if end < 0:
+                continue
+            end += len(item_close)
+        else:
+            end = buffer.find(container_close)
+            if end < 0:
+                raise RawXlsxLayoutError(f"</{container_tag.decode()}> bulunamadı")
+
+        chunk, buffer = buffer[:end], buffer[end:]
+        yield head + chunk + root_close
+
+        if not data:
+            return
+
+
+def _parse_xml_chunk(chunk: bytes) -> ET.Element:
+    """Parçayı ElementTree ile ayrıştır"""
+    try:
+        return ET.fromstring(chunk)
+    except ET.ParseError as e:
+        raise RawXlsxLayoutError(f"XML ayrıştırma hatası: {e}")
+
+
+def _xml_text(raw: bytes) -> str:
+    """Ham XML metnini çöz (&amp; gibi varlıklar dahil)"""
+    text = raw.decode('utf-8')
+    return html.unescape(text) if '&' in text else text
+
+
+def _string_item_text(elem: ET.Element) -> str:
+    """<si>/<is> elemanının metni (fonetik <rPh> metinleri hariç)"""
+    text = elem.findtext(_TEXT_TAG)
+    if text is not None:
+        return text
+    return ''.join(run.findtext(_TEXT_TAG) or '' for run in elem.iter(_RUN_TAG))
+
+
+def _column_index(ref: str) -> int:
+    """Hücre referansından 0 tabanlı sütun indeksi ('C5' -> 2)"""
+    index = 0
+    for char in ref:
+        if char.isdigit():
+            break
+        index = index * 26 + (ord(char) - 64)
+    return index - 1
+
+
+def _column_letters(index: int) -> str:
+    """0 tabanlı sütun indeksinden sütun harfleri (2 -> 'C')"""
+    letters = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def file_fingerprint(file_path: str) -> Tuple[int, int]:
+    """Dosyanın boyut ve değişiklik zamanı bilgisi"""
+    stat = Path(file_path).stat()
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _cache_key(file_path: str) -> str:
+    """Önbellek anahtarı için normalize edilmiş yol"""
+    try:
+        return str(Path(file_path).resolve())
+    except OSError:
+        return str(file_path)
+
+
+def _make_column_names(values: list) -> list:
+    """Başlık satırından pandas ile aynı kurallarla sütun adları üret"""
+    names = []
+    seen: Dict[Any, int] = {}
+    for i, value in enumerate(values):
+        name = f"Unnamed: {i}" if pd.isna(value) else value
+        # Tekrarlanan başlıklar: "Ad", "Ad.1", "Ad.2"
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Excel Karşılaştırma Uygulaması - Filo Karşılaştırması
+Bir günün tüm araç dosyalarını bir sonraki günün tüm araç dosyalarıyla
+birlikte karşılaştırır. Bir araçtan eksilen cari başka bir araçta devam
+ediyorsa kayıp değil, araç değişikliği olarak raporlanır.
+"""
+
+import logging
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from comparison import NameDiff
+
+# Constants
+FLEET_COLUMNS = ("Araç", "Cari Ünvan", "Durum", "Diğer Araçlar")
+LOST = "Kayıp"
+MOVED_OUT = "Başka araca geçti"
+NEW = "Yeni"
+MOVED_IN = "Başka araçtan geldi"
+
+VehicleExports = Dict[str, Tuple[pd.Series, Any]]
+
+
+class FleetDiff:
+    """Filo karşılaştırma sonucu
+
+    table: araç bazında eksilen ve eklenen cariler (FLEET_COLUMNS); Durum
+    sütunu carinin filodan tamamen çıkıp çıkmadığını ya da başka araca
+    geçip geçmediğini gösterir. common_count iki günde de filoda bulunan
+    tekrarsız anahtar sayısıdır.
+    """
+
+    def __init__(self, table: pd.DataFrame, common_count: int, old_count: int):
+        self.table = table
+        self.common_count = common_count
+        self.old_count = old_count
+
+    def status_count(self, status: str) -> int:
+        """Verilen durumdaki satır sayısı"""
+        return int((self.table["Durum"] == status).sum())
+
+    def name_diff(self) -> NameDiff:
+        """Sadece gerçek kayıplar ve filoya yeni gelenler ("ÜNVAN (Araç NN)" biçiminde)"""
+        def labels(status: str) -> List[str]:
+            rows = self.table[self.table["Durum"] == status]
+            return [f"{name} (Araç {vehicle})" for vehicle, name in zip(rows["Araç"], rows["Cari Ünvan"])]
+
+        return NameDiff(removed=labels(LOST), added=labels(NEW), common_count=self.common_count)
+
+
+def fleet_diff(old_exports: VehicleExports, new_exports: VehicleExports) -> FleetDiff:
+    """Araç -> (yazılışlar, anahtarlar) sözlükleriyle verilen iki günü karşılaştırır
+
+    Tüm araçların anahtarları tek seferde factorize edilir; (anahtar kodu,
+    araç) çiftleri anahtardan araçlara ters indeks olarak kullanılır. Bir
+    araçtan eksilen anahtar yeni günde başka araçta varsa "Başka araca
+    geçti", hiçbir araçta yoksa "Kayıp" sayılır; eklenenler için de aynı
+    şekilde "Başka araçtan geldi" veya "Yeni". Satırlar araç sırasıyla,
+    araç içinde dosyadaki ilk görülme sırasıyla döner.
+    """
+    vehicles = sorted(set(old_exports) | set(new_exports))
+    for vehicle in vehicles:
+        if vehicle not in old_exports:
+            logging.warning(f"Araç {vehicle} sadece yeni günde var, tüm carileri yeni sayılır")
+        elif vehicle not in new_exports:
+            logging.warning(f"Araç {vehicle} sadece eski günde var, tüm carileri eksik sayılır")
+
+    old_vehicles, old_names, old_keys = _flatten(old_exports, vehicles)
+    new_vehicles, new_names, new_keys = _flatten(new_exports, vehicles)
+    codes, uniques = pd.factorize(np.concatenate([old_keys, new_keys]))
+    old_codes, new_codes = codes[:len(old_keys)], codes[len(old_keys):]
+
+    # Her araçta anahtarın ilk satırı (aynı araçtaki tekrarlar tek sayılır)
+    old_first = _first_per_vehicle(old_codes, old_vehicles, len(vehicles))
+    new_first = _first_per_vehicle(new_codes, new_vehicles, len(vehicles))
+    old_pairs = old_codes[old_first] * len(vehicles) + old_vehicles[old_first]
+    new_pairs = new_codes[new_first] * len(vehicles) + new_vehicles[new_first]
+
+    in_old = np.zeros(len(uniques), dtype=bool)
+    in_new = np.zeros(len(uniques), dtype=bool)
+    in_old[old_codes] = True
+    in_new[new_codes] = True
+
+    removed = old_first[~np.isin(old_pairs, new_pairs)]
+    added = new_first[~np.isin(new_pairs, old_pairs)]
+    removed_codes, added_codes = old_codes[removed], new_codes[added]
+
+    labels = np.asarray(vehicles, dtype=object)
+    table = pd.concat([
+        pd.DataFrame({
+            FLEET_COLUMNS[0]: labels[old_vehicles[removed]],
+            FLEET_COLUMNS[1]: old_names[removed],
+            FLEET_COLUMNS[2]: np.where(in_new[removed_codes], MOVED_OUT, LOST),
+            FLEET_COLUMNS[3]: _other_vehicles(removed_codes, new_codes[new_first], new_vehicles[new_first], labels),
+            "_sıra": removed,
+        }),
+        pd.DataFrame({
+            FLEET_COLUMNS[0]: labels[new_vehicles[added]],
+            FLEET_COLUMNS[1]: new_names[added],
+            FLEET_COLUMNS[2]: np.where(in_old[added_codes], MOVED_IN, NEW),
+            FLEET_COLUMNS[3]: _other_vehicles(added_codes, old_codes[old_first], old_vehicles[old_first], labels),
+            "_sıra": added,
+        }),
+    ], ignore_index=True)
+    table = table.sort_values([FLEET_COLUMNS[0], "_sıra"], kind='stable').drop(columns="_sıra")
+
+    return FleetDiff(
+        table.reset_index(drop=True),
+        common_count=int(np.count_nonzero(in_old & in_new)),
+        old_count=len(old_keys),
+    )
+
+
+def _flatten(exports: VehicleExports, vehicles: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Araçların satırlarını tek dizide birleştir: (araç sırası, yazılışlar, anahtarlar)"""
+    present = [vehicle for vehicle in vehicles if vehicle in exports]
+    if not present:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=object), np.empty(0, dtype=object)
+
+    sizes = [len(exports[vehicle][1]) for vehicle in present]
+    indices = np.repeat([vehicles.index(vehicle) for vehicle in present], sizes).astype(np.int64)
+    names = np.concatenate([pd.Series(exports[vehicle][0]).to_numpy(dtype=object) for vehicle in present])
+    # Bileşik anahtarlar 64 bit tamsayı, ünvan anahtarları metindir; factorize ikisini de kabul eder
+    keys = np.concatenate([np.asarray(exports[vehicle][1], dtype=object) for vehicle in present])
+    return indices, names, keys
+
+
+def _first_per_vehicle(codes: np.ndarray, vehicles: np.ndarray, vehicle_count: int) -> np.ndarray:
+    """Her (anahtar, araç) çiftinin ilk satırının numarası, satır sırasıyla"""
+    pairs = codes.astype(np.int64) * vehicle_count + vehicles
+    return np.flatnonzero(~pd.Series(pairs).duplicated().to_numpy())
+
+
+def _other_vehicles(codes: np.ndarray, index_codes: np.ndarray, index_vehicles: np.ndarray,
+                    labels: np.ndarray) -> List[str]:
+    """Her anahtarın diğer günde bulunduğu araçlar ("03, 07" biçiminde; yoksa boş)"""
+    wanted = np.isin(index_codes, codes)
+    holders = pd.DataFrame({"code": index_codes[wanted], "vehicle": index_vehicles[wanted]})
+    holders = holders.sort_values(["code", "vehicle"], kind='stable')
+    joined = holders.groupby("code")["vehicle"].agg(lambda values: ", ".join(labels[values]))
+    return pd.Series(codes).map(joined).fillna("").tolist()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Excel Karşılaştırma Uygulaması - Benzer Ad Eşleştirme
+Normalleştirilmiş anahtarlar üzerinde karakter üçlüsü (trigram) indeksiyle
+yakın eşleşme arar; sadece yeterince ortak üçlüsü olan adlar puanlanır.
+"""
+
+from typing import Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+# Constants
+DEFAULT_SIMILARITY_THRESHOLD = 0.90
+MAX_POSTING_RATIO = 0.05  # adların %5'inden fazlasında geçen üçlüler aday üretmez ("LTD", " MÜ" gibi)
+MIN_POSTING_LIMIT = 50
+RARE_GRAMS_FALLBACK = 3  # tüm üçlüler yaygınsa en seyrek bu kadarı kullanılır
+
+
+def trigrams(text: str) -> Set[str]:
+    """Başına ve sonuna boşluk eklenmiş metnin karakter üçlüleri"""
+    padded = f" {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """Ad listesi üzerinde üçlü -> ad numaraları ters indeksi
+
+    Gönderim listeleri (posting) tek bir NumPy dizisinde üçlü numarasına göre
+    sıralı tutulur (CSR düzeni). Sorguda adın seyrek üçlülerinin listeleri
+    birleştirilir; adaylar ortak üçlü sayısından hesaplanan üst sınıra göre
+    sıralanır ve sadece en iyi olabilecekler Dice benzerliğiyle
+    (2·ortak / (|A| + |B|)) puanlanır.
+    """
+
+    def __init__(self, keys: Sequence[str], max_posting_ratio: float = MAX_POSTING_RATIO):
+        self.keys = list(keys)
+        self._vocabulary: dict = {}
+        self._grams: List[frozenset] = []
+
+        gram_ids: List[int] = []
+        name_ids: List[int] = []
+        for index, key in enumerate(self.keys):
+            grams = frozenset(self._vocabulary.setdefault(gram, len(self._vocabulary)) for gram in trigrams(key))
+            self._grams.append(grams)
+            gram_ids.extend(grams)
+            name_ids.extend([index] * len(grams))
+
+        gram_array = np.asarray(gram_ids, dtype=np.int64)
+        order = np.argsort(gram_array, kind='stable')
+        self._postings = np.asarray(name_ids, dtype=np.int64)[order]
+        counts = np.bincount(gram_array, minlength=len(self._vocabulary))
+        self._offsets = np.concatenate(([0], np.cumsum(counts)))
+        self._sizes = np.fromiter((len(grams) for grams in self._grams), dtype=np.int64, count=len(self._grams))
+        self._max_postings = max(MIN_POSTING_LIMIT, int(len(self.keys) * max_posting_ratio))
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def best_match(self, key: str) -> Tuple[Optional[int], float]:
+        """En benzer adın numarası ve benzerlik puanı (aday yoksa None, 0.0)"""
+        query = trigrams(key)
+        known = [self._vocabulary[gram] for gram in query if gram in self._vocabulary]
+        if not known:
+            return None, 0.0
+
+        lengths = self._offsets[np.add(known, 1)] - self._offsets[known]
+        selective = [gram for gram, length in zip(known, lengths) if length <= self._max_postings]
+        if not selective:
+            selective = [known[i] for i in np.argsort(lengths)[:RARE_GRAMS_FALLBACK]]
+
+        candidates = np.concatenate([self._postings[self._offsets[g]:self._offsets[g + 1]] for g in selective])
+        ids, shared = np.unique(candidates, return_counts=True)
+
+        # Atlanan yaygın üçlülerin hepsi ortakmış gibi üst sınır; sınırı en
+        # yüksek aday puanlanır, sonra sadece sınırı bu puanı geçen adaylara bakılır
+        skipped = len(known) - len(selective)
+        bounds = 2 * (shared + skipped) / (len(query) + self._sizes[ids])
+        first = int(np.argmax(bounds))
+        if not skipped:
+            return int(ids[first]), float(bounds[first])
+
+        query_ids = frozenset(known)
+        best_index, best_score = int(ids[first]), self._dice(query_ids, len(query), int(ids[first]))
+        rest = np.flatnonzero(bounds > best_score)
+        for position in rest[np.argsort(-bounds[rest], kind='stable')].tolist():
+            if bounds[position] <= best_score:
+                break
+            index = int(ids[position])
+            score = self._dice(query_ids, len(query), index)
+            if score > best_score:
+                best_index, best_score = index, score
+        return best_index, best_score
+
+    def _dice(self, query_ids: frozenset, query_size: int, index: int) -> float:
+        """Sorgu ile indeksteki ad arasındaki Dice benzerliği"""
+        grams = self._grams[index]
+        return 2 * len(query_ids & grams) / (query_size + len(grams))
+
+    def best_matches(self, keys: Iterable[str]) -> List[Tuple[Optional[int], float]]:
+        """Her anahtar için best_match sonucu"""
+        return [self.best_match(key) for key in keys]
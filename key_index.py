@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Excel Karşılaştırma Uygulaması - Sıkıştırılmış Anahtar İndeksi
+Yeni dosyanın anahtarlarını Python set/dict yerine sıralı bir uint64 özet
+dizisinde tutar; metinler tek bir UTF-8 arabelleğinde saklanır. İsteğe bağlı
+Bloom filtresi, dosyada olmayan anahtarları ikili aramadan önce eler.
+"""
+
+import logging
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Constants
+DEFAULT_BLOOM_BITS_PER_KEY = 10  # ~%1 yanlış pozitif
+MAX_BLOOM_HASHES = 8
+KEY_INDEX_VERSION = 1
+
+
+def key_hashes(keys: np.ndarray) -> np.ndarray:
+    """Anahtarların 64 bit özetleri; tamsayı (bileşik) anahtarlar zaten özettir"""
+    if keys.dtype.kind in 'iu':
+        return keys.astype(np.int64).view(np.uint64)
+    return pd.util.hash_array(keys, categorize=False)
+
+
+class KeyIndex:
+    """Sıralı özet dizisi üzerinde üyelik indeksi (ikili arama)
+
+    Her tekrarsız anahtar için özet, ilk görüldüğü satır ve görüntülenen
+    yazılışı tutulur; metinler uzunluk/başlangıç dizileriyle tek arabellekte
+    durur, bu yüzden kayıt başına maliyet birkaç NumPy elemanıdır. Özeti
+    eşleşen metin anahtarlar arabellekteki metinle ayrıca doğrulanır
+    (özet çakışmaları yanlış eşleşme üretmez). Tamsayı anahtarlarda
+    doğrulama gerekmez. mark_many ile bulunan kayıtlar işaretlenir;
+    işaretlenmeyenlerin yazılışları ilk görülme sırasıyla alınabilir.
+    save ile .npz dosyasına yazılıp load_key_index ile tekrar kullanılır.
+    İndeks tamamen bellekte oluşturulur, diske taşmaz: bellek bütçesi
+    (memory_budget_mb) gereken büyük dosyalarda SpillingKeyMap kullanılır.
+    """
+
+    def __init__(self, hashes: np.ndarray, first_rows: np.ndarray, keys: Optional[Tuple[np.ndarray, np.ndarray]],
+                 values: Tuple[np.ndarray, np.ndarray], bloom: Optional[np.ndarray] = None, bloom_hashes: int = 0):
+        self.hashes = hashes
+        self.first_rows = first_rows
+        self._keys = keys  # (başlangıçlar + son, UTF-8 arabellek); tamsayı anahtarlarda None
+        self._values = values
+        self._bloom = bloom
+        self._bloom_hashes = bloom_hashes
+        self._matched = np.zeros(len(hashes), dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+    @property
+    def has_bloom_filter(self) -> bool:
+        """Bloom filtresi oluşturuldu mu?"""
+        return self._bloom is not None
+
+    @property
+    def nbytes(self) -> int:
+        """Dizilerin toplam boyutu (byte)"""
+        arrays = [self.hashes, self.first_rows, *self._values, self._matched]
+        if self._keys is not None:
+            arrays.extend(self._keys)
+        if self._bloom is not None:
+            arrays.append(self._bloom)
+        return sum(array.nbytes for array in arrays)
+
+    def lookup(self, keys: list) -> np.ndarray:
+        """Her anahtarın indeksteki kayıt numarası (yoksa -1)"""
+        values = np.asarray(keys, dtype=np.int64 if keys and isinstance(keys[0], (int, np.integer)) else object)
+        hashes = key_hashes(values)
+        positions = np.full(len(hashes), -1, dtype=np.int64)
+        candidates = np.arange(len(hashes))
+        if self._bloom is not None:
+            candidates = candidates[self._bloom_contains(hashes)]
+        if not len(candidates) or not len(self.hashes):
+            return positions
+
+        found = np.searchsorted(self.hashes, hashes[candidates])
+        found = np.minimum(found, len(self.hashes) - 1)
+        hits = self.hashes[found] == hashes[candidates]
+        candidates, found = candidates[hits], found[hits]
+        if self._keys is None:
+            positions[candidates] = found
+            return positions
+
+        # Metin doğrulaması sadece özeti eşleşenlerde (toplu bayt karşılaştırması)
+        queries = _join([_encode(values[candidates].tolist())])
+        equal = _texts_equal(queries, np.arange(len(candidates)), self._keys, found)
+        positions[candidates[equal]] = found[equal]
+
+        # Özet çakışması: aynı özetli sonraki kayıtlara tek tek bakılır
+        for index in np.flatnonzero(~equal).tolist():
+            row, position = int(candidates[index]), int(found[index]) + 1
+            encoded = self._text(queries, index)
+            while position < len(self.hashes) and self.hashes[position] == hashes[row]:
+                if self._text(self._keys, position) == encoded:
+                    positions[row] = position
+                    break
+                position += 1
+        return positions
+
+    def contains_many(self, keys: list) -> np.ndarray:
+        """Her anahtar indekste var mı?"""
+        return self.lookup(keys) >= 0
+
+    def mark_many(self, keys: list) -> np.ndarray:
+        """Her anahtar için indekste olup olmadığını döndür, bulunanları işaretle"""
+        positions = self.lookup(keys)
+        found = positions >= 0
+        self._matched[positions[found]] = True
+        return found
+
+    def matched_count(self) -> int:
+        """İşaretlenmiş kayıt sayısı"""
+        return int(np.count_nonzero(self._matched))
+
+    def unmatched_values(self) -> List[str]:
+        """İşaretlenmemiş kayıtların yazılışları (ilk görülme sırasıyla)"""
+        rows = np.flatnonzero(~self._matched)
+        rows = rows[np.argsort(self.first_rows[rows], kind='stable')]
+        return [self._text(self._values, row).decode('utf-8') for row in rows.tolist()]
+
+    def _text(self, texts: Tuple[np.ndarray, np.ndarray], position: int) -> bytes:
+        offsets, buffer = texts
+        return buffer[offsets[position]:offsets[position + 1]].tobytes()
+
+    def _bloom_positions(self, hashes: np.ndarray) -> np.ndarray:
+        """Her özet için Bloom filtresindeki bit numaraları (çift özetleme, satır başına bloom_hashes tane)"""
+        size = np.uint64(len(self._bloom) * 8)
+        low = hashes & np.uint64(0xFFFFFFFF)
+        high = (hashes >> np.uint64(32)) | np.uint64(1)
+        steps = np.arange(self._bloom_hashes, dtype=np.uint64)
+        return (low[:, None] + steps[None, :] * high[:, None]) % size
+
+    def _bloom_contains(self, hashes: np.ndarray) -> np.ndarray:
+        bits = self._bloom_positions(hashes)
+        present = (self._bloom[bits >> np.uint64(3)] >> (bits & np.uint64(7)).astype(np.uint8)) & 1
+        return present.all(axis=1)
+
+    def add_bloom_filter(self, bits_per_key: float = DEFAULT_BLOOM_BITS_PER_KEY) -> None:
+        """Kayıtlar için Bloom filtresi oluştur (olmayan anahtarlar ikili aramadan önce elenir)"""
+        size = max(int(len(self.hashes) * bits_per_key), 64)
+        self._bloom = np.zeros((size + 7) // 8, dtype=np.uint8)
+        self._bloom_hashes = int(min(max(round(bits_per_key * np.log(2)), 1), MAX_BLOOM_HASHES))
+        bits = self._bloom_positions(self.hashes).ravel()
+        np.bitwise_or.at(self._bloom, (bits >> np.uint64(3)).astype(np.int64),
+                         np.left_shift(1, bits & np.uint64(7)).astype(np.uint8))
+
+    def save(self, path: str) -> None:
+        """İndeksi .npz dosyasına yaz (işaretler yazılmaz)"""
+        arrays = {
+            "version": np.array([KEY_INDEX_VERSION, self._bloom_hashes], dtype=np.int64),
+            "hashes": self.hashes,
+            "first_rows": self.first_rows,
+            "value_offsets": self._values[0],
+            "value_buffer": self._values[1],
+        }
+        if self._keys is not None:
+            arrays["key_offsets"], arrays["key_buffer"] = self._keys
+        if self._bloom is not None:
+            arrays["bloom"] = self._bloom
+        with open(path, 'wb') as f:
+            np.savez(f, **arrays)
+
+
+def load_key_index(path: str) -> KeyIndex:
+    """save ile yazılmış indeksi oku; sürüm farklıysa ValueError"""
+    with np.load(path, allow_pickle=False) as data:
+        version, bloom_hashes = data["version"].tolist()
+        if version != KEY_INDEX_VERSION:
+            raise ValueError(f"Anahtar indeksi sürümü uyumsuz: {version}")
+        keys = (data["key_offsets"], data["key_buffer"]) if "key_offsets" in data else None
+        return KeyIndex(data["hashes"], data["first_rows"], keys, (data["value_offsets"], data["value_buffer"]),
+                        data["bloom"] if "bloom" in data else None, int(bloom_hashes))
+
+
+class KeyIndexBuilder:
+    """Parça parça gelen (anahtar, yazılış) satırlarından KeyIndex oluşturur
+
+    Parçalar UTF-8 arabellekleri ve özet dizileri olarak biriktirilir;
+    build() özetleri sıralar, tekrarlanan anahtarların ilk satırını tutar.
+    """
+
+    def __init__(self):
+        self._hashes: List[np.ndarray] = []
+        self._keys: List[Tuple[np.ndarray, bytes]] = []
+        self._values: List[Tuple[np.ndarray, bytes]] = []
+        self._integer_keys = False
+        self.row_count = 0
+
+    def add(self, keys: list, values: list) -> None:
+        """Aynı sıra ve uzunluktaki anahtarları ve yazılışları ekle"""
+        if not len(keys):
+            return
+        self._integer_keys = isinstance(keys[0], (int, np.integer))
+        array = np.asarray(keys, dtype=np.int64 if self._integer_keys else object)
+        self._hashes.append(key_hashes(array))
+        if not self._integer_keys:
+            self._keys.append(_encode(keys))
+        self._values.append(_encode(values))
+        self.row_count += len(keys)
+
+    def build(self) -> KeyIndex:
+        """Tekrarsız anahtarların sıralı indeksi"""
+        if not self._hashes:
+            empty = (np.zeros(1, dtype=np.int64), np.zeros(0, dtype=np.uint8))
+            return KeyIndex(np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=np.int64), empty, empty)
+
+        hashes = np.concatenate(self._hashes)
+        keys = _join(self._keys) if not self._integer_keys else None
+        values = _join(self._values)
+        self._hashes, self._keys, self._values = [], [], []
+
+        order = np.argsort(hashes, kind='stable')  # eşit özetlerde ilk satır önde kalır
+        sorted_hashes = hashes[order]
+        keep = np.ones(len(order), dtype=bool)
+        keep[1:] = sorted_hashes[1:] != sorted_hashes[:-1]
+        if keys is not None:
+            keep = _keep_distinct_keys(keys, order, sorted_hashes, keep)
+        rows = order[keep]
+        logging.info(f"Anahtar indeksi: {len(rows)} tekrarsız anahtar ({len(order)} satır)")
+        return KeyIndex(sorted_hashes[keep], rows.astype(np.int64),
+                        _take_texts(keys, rows) if keys is not None else None, _take_texts(values, rows))
+
+
+def _encode(texts: list) -> Tuple[np.ndarray, bytes]:
+    """Metinleri (uzunluklar, birleşik UTF-8 arabellek) olarak kodla"""
+    encoded = [str(text).encode('utf-8') for text in texts]
+    return np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded)), b''.join(encoded)
+
+
+def _join(parts: List[Tuple[np.ndarray, bytes]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Parçaları tek (başlangıçlar + son, arabellek) çiftinde birleştir"""
+    lengths = np.concatenate([part[0] for part in parts])
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    return offsets, np.frombuffer(b''.join(part[1] for part in parts), dtype=np.uint8)
+
+
+def _take_texts(texts: Tuple[np.ndarray, np.ndarray], rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Verilen satırların metinlerini yeni, sıkışık bir arabelleğe kopyala"""
+    offsets, buffer = texts
+    starts, lengths = offsets[rows], offsets[rows + 1] - offsets[rows]
+    new_offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=new_offsets[1:])
+    # Her çıktı baytının kaynaktaki yeri: satırın başlangıcı + satır içindeki sırası
+    gather = np.repeat(starts - new_offsets[:-1], lengths) + np.arange(new_offsets[-1])
+    return new_offsets, buffer[gather]
+
+
+def _texts_equal(left: Tuple[np.ndarray, np.ndarray], left_rows: np.ndarray,
+                 right: Tuple[np.ndarray, np.ndarray], right_rows: np.ndarray) -> np.ndarray:
+    """İki arabellekteki satır çiftlerinin metinleri aynı mı? (önce uzunluk, sonra baytlar, döngüsüz)"""
+    left_offsets, left_buffer = left
+    right_offsets, right_buffer = right
+    lengths = left_offsets[left_rows + 1] - left_offsets[left_rows]
+    equal = lengths == right_offsets[right_rows + 1] - right_offsets[right_rows]
+    check = np.flatnonzero(equal & (lengths > 0))
+    if not len(check):
+        return equal
+
+    lengths = lengths[check]
+    starts = np.zeros(len(check), dtype=np.int64)
+    np.cumsum(lengths[:-1], out=starts[1:])
+    within = np.arange(lengths.sum()) - np.repeat(starts, lengths)
+    left_bytes = left_buffer[np.repeat(left_offsets[left_rows[check]], lengths) + within]
+    right_bytes = right_buffer[np.repeat(right_offsets[right_rows[check]], lengths) + within]
+    differing = np.add.reduceat((left_bytes != right_bytes).astype(np.int64), starts)
+    equal[check] = differing == 0
+    return equal
+
+
+def _keep_distinct_keys(keys: Tuple[np.ndarray, np.ndarray], order: np.ndarray, sorted_hashes: np.ndarray,
+                        keep: np.ndarray) -> np.ndarray:
+    """Aynı özetli satırlardan metni farklı olanları (özet çakışması) da ayrı kayıt olarak tut"""
+    duplicates = np.flatnonzero(~keep)
+    if not len(duplicates):
+        return keep
+    run_starts = np.flatnonzero(keep)
+    firsts = run_starts[np.searchsorted(run_starts, duplicates, side='right') - 1]
+    collisions = ~_texts_equal(keys, order[duplicates], keys, order[firsts])
+    if not collisions.any():
+        return keep
+
+    # Nadir durum: çakışan gruplarda her metnin ilk satırı tutulur
+    offsets, buffer = keys
+    for first in np.unique(firsts[collisions]).tolist():
+        end = first + 1
+        while end < len(order) and not keep[end]:
+            end += 1
+        seen = set()
+        for position in range(first, end):
+            text = buffer[offsets[order[position]]:offsets[order[position] + 1]].tobytes()
+            keep[position] = text not in seen
+            seen.add(text)
+    return keep
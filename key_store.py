@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Excel Karşılaştırma Uygulaması - Sınırlı Bellekli Anahtar Eşlemesi
+Büyük dosyaların anahtarlarını (ve iki yönlü karşılaştırmada görüntülenen
+yazılışlarını) bellek bütçesi aşılınca diske (sqlite3) taşır.
+"""
+
+import logging
+import os
+import sqlite3
+import sys
+import tempfile
+from typing import Optional, Iterable, Iterator, List, Dict, Tuple
+
+# Constants
+DEFAULT_MEMORY_BUDGET_MB = 256
+SET_ENTRY_OVERHEAD = 60  # dict içindeki her anahtar/değerin yaklaşık ek maliyeti (byte)
+SPILL_BATCH_SIZE = 10_000
+LOOKUP_BATCH_SIZE = 500  # sqlite parametre sınırının (999) altında
+
+
+class SpillingKeyMap:
+    """Anahtar -> ilk görülen değer eşlemesi; bütçe aşılınca diske taşar
+
+    İki yönlü akış karşılaştırmasında yeni dosyanın anahtarları ve görüntülenen
+    yazılışları tutulur. Eski dosyada bulunan anahtarlar mark_many ile
+    işaretlenir; sonunda işaretlenmeyenler (yeni eklenenler) ekleme sırasıyla
+    alınır. Diskteyken tablo rowid sırasını, bellekteyken dict sırasını korur.
+    Anahtarlar metin veya (bileşik anahtarda) 64 bit işaretli tamsayı olabilir;
+    tablo sütununun tür yakınlığı olmadığı için tamsayılar tamsayı olarak saklanır.
+    """
+
+    def __init__(self, memory_budget_mb: float = DEFAULT_MEMORY_BUDGET_MB, directory: Optional[str] = None):
+        self.memory_budget_bytes = int(memory_budget_mb * 1024 * 1024)
+        self.directory = directory
+        self._memory: Dict[str, list] = {}  # anahtar -> [değer, işaretli mi]
+        self._memory_bytes = 0
+        self._pending: List[Tuple[str, str]] = []
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_path: Optional[str] = None
+
+    @property
+    def spilled(self) -> bool:
+        """Eşleme diske taşındı mı?"""
+        return self._db is not None
+
+    def add(self, key: str, value: str) -> None:
+        """Anahtar yoksa değeriyle ekle (ilk değer korunur)"""
+        if self._db is not None:
+            self._pending.append((key, value))
+            if len(self._pending) >= SPILL_BATCH_SIZE:
+                self._flush()
+            return
+
+        if key not in self._memory:
+            self._memory[key] = [value, False]
+            self._memory_bytes += sys.getsizeof(key) + sys.getsizeof(value) + 2 * SET_ENTRY_OVERHEAD
+            if self._memory_bytes > self.memory_budget_bytes:
+                self._spill()
+
+    def update(self, items: Iterable[Tuple[str, str]]) -> None:
+        """Birden fazla (anahtar, değer) ekle"""
+        for key, value in items:
+            self.add(key, value)
+
+    def mark_many(self, keys: List[str]) -> List[bool]:
+        """Her anahtar için eşlemede olup olmadığını döndür, bulunanları işaretle"""
+        if self._db is None:
+            found = []
+            for key in keys:
+                entry = self._memory.get(key)
+                if entry is not None:
+                    entry[1] = True
+                found.append(entry is not None)
+            return found
+
+        self._flush()
+        present = set()
+        for start in range(0, len(keys), LOOKUP_BATCH_SIZE):
+            batch = keys[start:start + LOOKUP_BATCH_SIZE]
+            placeholders = ','.join('?' * len(batch))
+            cursor = self._db.execute(f"SELECT key FROM keys WHERE key IN ({placeholders})", batch)
+            present.update(row[0] for row in cursor)
+            self._db.execute(f"UPDATE keys SET matched = 1 WHERE key IN ({placeholders})", batch)
+        self._db.commit()
+        return [key in present for key in keys]
+
+    def matched_count(self) -> int:
+        """İşaretlenmiş anahtar sayısı"""
+        if self._db is None:
+            return sum(1 for _, matched in self._memory.values() if matched)
+        self._flush()
+        return self._db.execute("SELECT COUNT(*) FROM keys WHERE matched = 1").fetchone()[0]
+
+    def unmatched_values(self) -> Iterator[str]:
+        """İşaretlenmemiş anahtarların değerleri (ekleme sırasıyla)"""
+        if self._db is None:
+            return (value for value, matched in self._memory.values() if not matched)
+        self._flush()
+        return (row[0] for row in self._db.execute("SELECT value FROM keys WHERE matched = 0 ORDER BY rowid"))
+
+    def __len__(self) -> int:
+        if self._db is None:
+            return len(self._memory)
+        self._flush()
+        return self._db.execute("SELECT COUNT(*) FROM keys").fetchone()[0]
+
+    def _spill(self) -> None:
+        """Bellekteki eşlemeyi geçici veritabanına aktar"""
+        logging.info(f"Anahtar eşlemesi bellek bütçesini aştı ({len(self._memory)} kayıt), diske taşınıyor")
+        self._db, self._db_path = _create_spill_database(
+            self.directory, self.memory_budget_bytes,
+            "CREATE TABLE keys (key PRIMARY KEY, value TEXT, matched INTEGER NOT NULL DEFAULT 0)"
+        )
+        self._db.executemany(
+            "INSERT INTO keys VALUES (?, ?, ?)",
+            ((key, value, int(matched)) for key, (value, matched) in self._memory.items())
+        )
+        self._db.commit()
+        self._memory = {}
+        self._memory_bytes = 0
+
+    def _flush(self) -> None:
+        """Bekleyen eklemeleri veritabanına yaz"""
+        if not self._pending:
+            return
+        self._db.executemany("INSERT OR IGNORE INTO keys (key, value) VALUES (?, ?)", self._pending)
+        self._db.commit()
+        self._pending = []
+
+    def close(self) -> None:
+        """Belleği bırak, geçici veritabanını sil"""
+        self._memory = {}
+        self._pending = []
+        _remove_spill_database(self._db, self._db_path)
+        self._db = None
+        self._db_path = None
+
+    def __enter__(self) -> 'SpillingKeyMap':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+def _create_spill_database(directory: Optional[str], memory_budget_bytes: int,
+                           schema: str) -> Tuple[sqlite3.Connection, str]:
+    """Taşma için geçici, günlüksüz bir sqlite3 veritabanı oluştur"""
+    fd, db_path = tempfile.mkstemp(prefix="karsilastirma_", suffix=".sqlite", dir=directory)
+    os.close(fd)
+    logging.info(f"Geçici veritabanı: {db_path}")
+
+    db = sqlite3.connect(db_path, check_same_thread=False)
+    db.execute("PRAGMA journal_mode=OFF")
+    db.execute("PRAGMA synchronous=OFF")
+    # Negatif değer KiB cinsinden sayfa önbelleği sınırıdır
+    db.execute(f"PRAGMA cache_size=-{max(memory_budget_bytes // 1024, 1024)}")
+    db.execute(schema)
+    return db, db_path
+
+
+def _remove_spill_database(db: Optional[sqlite3.Connection], db_path: Optional[str]) -> None:
+    """Bağlantıyı kapat ve geçici veritabanı dosyasını sil"""
+    if db is not None:
+        db.close()
+    if db_path is not None:
+        try:
+            os.remove(db_path)
+        except OSError as e:
+            logging.warning(f"Geçici dosya silinemedi {db_path}: {e}")
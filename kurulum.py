@@ -31,7 +31,9 @@ REQUIRED_PACKAGES = [
 ]
 
 OPTIONAL_PACKAGES = [
-    "tkinterdnd2>=0.3.0"
+    "tkinterdnd2>=0.3.0",
+    "pyarrow>=12.0.0",
+    "python-calamine>=0.2.0"
 ]
 
 class InstallationManager:
@@ -284,7 +286,9 @@ class InstallationManager:
         ]
         
         optional_modules = [
-            ("tkinterdnd2", "Drag & Drop desteği")
+            ("tkinterdnd2", "Drag & Drop desteği"),
+            ("pyarrow", "Kalıcı okuma önbelleği"),
+            ("python_calamine", "Hızlı Excel okuma motoru (calamine)")
         ]
         
         missing_modules = []
@@ -6,29 +6,34 @@ Excel Karşılaştırma Uygulaması - Ana Modül
 Türkçe karakter desteği ile geliştirilmiştir.
 """
 
+import sys
+
+if __name__ == "__main__" and sys.argv[1:2] in (["compare"], ["batch"], ["split"], ["watch"]):
+    # Komut satırı modu (python main.py compare ESKI YENI ... / batch ESKI_KLASOR YENI_KLASOR ... /
+    # split ESKI_TUM YENI_TUM ... / watch KLASOR ...): Tk ve arayüz modülleri yüklenmez
+    import multiprocessing
+    multiprocessing.freeze_support()
+    from cli import run_cli, run_batch_cli, run_split_cli, run_watch_cli
+    commands = {"compare": run_cli, "batch": run_batch_cli, "split": run_split_cli, "watch": run_watch_cli}
+    sys.exit(commands[sys.argv[1]](sys.argv[2:]))
+
 import tkinter as tk
 from tkinter import messagebox
+import argparse
 import pandas as pd
-import os
-import re
 import json
-import sys
 import logging
 from datetime import datetime
 from pathlib import Path
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
 import threading
-from typing import Optional, Dict, List, Tuple, Any
+import multiprocessing
+from typing import Optional, Dict, List, Any
 
-# Constants
-MAX_FILE_SIZE_MB = 100
-EXCEL_CHUNK_SIZE = 1000
-SUPPORTED_EXTENSIONS = {'.xlsx', '.xls'}
-CONFIG_FILES = ['config.json', 'vehicle_config.json', 'drivers.json']
-DEFAULT_OUTPUT_NAME = "karşılaştırma_sonucu"
+from excel_reader import open_key_stream
+from comparison import KEY_SEPARATOR
+from engine import (
+    ComparisonEngine, ComparisonError, ComparisonResult, EXCEL_FORMAT, FLEET_OUTPUT_NAME, IMAGE_FORMAT, setup_logging
+)
 
 # UI import kontrolü
 try:
@@ -38,23 +43,6 @@ except ImportError as e:
     print("Lütfen ui.py dosyasının aynı dizinde olduğundan emin olun.")
     sys.exit(1)
 
-# Logging sistemi kurulumu
-def setup_logging() -> None:
-    """Logging sistemini kur"""
-    try:
-        logging.basicConfig(
-            filename='app.log',
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            encoding='utf-8'
-        )
-    except TypeError:  # Python < 3.9 için encoding parametresi desteklenmez
-        logging.basicConfig(
-            filename='app.log',
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s'
-        )
-
 setup_logging()
 
 
@@ -239,11 +227,8 @@ class VehicleDriverSetupDialog:
             messagebox.showwarning("Uyarı", "En az bir araç-plasiyer eşleştirmesi yapmalısınız!")
             return
         
-        config = {"vehicle_drivers": vehicle_drivers}
-        
         try:
-            with open('config.json', 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=4, ensure_ascii=False)
+            update_config_file({"vehicle_drivers": vehicle_drivers})
             
             self.result = vehicle_drivers
             messagebox.showinfo("Başarılı", f"{len(vehicle_drivers)} araç-plasiyer eşleştirmesi kaydedildi!")
@@ -259,53 +244,67 @@ class VehicleDriverSetupDialog:
         self.dialog.destroy()
 
 
-class ExcelComparisonLogic:
-    """Excel karşılaştırma iş mantığı"""
+def update_config_file(updates: Dict[str, Any], config_file: str = 'config.json') -> None:
+    """Config dosyasındaki anahtarları günceller, diğer ayarları korur"""
+    config: Dict[str, Any] = {}
+    if Path(config_file).exists():
+        try:
+            with open(config_file, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+        except json.JSONDecodeError as e:
+            logging.warning(f"Bozuk config dosyası yeniden yazılıyor {config_file}: {e}")
+    
+    config.update(updates)
+    with open(config_file, 'w', encoding='utf-8') as f:
+        json.dump(config, f, indent=4, ensure_ascii=False)
+
+
+class ExcelComparisonLogic(ComparisonEngine):
+    """Excel karşılaştırma iş mantığı (masaüstü arayüzü için)
     
-    def __init__(self):
-        self.file1_path = tk.StringVar()
-        self.file2_path = tk.StringVar()
-        self.output_path = tk.StringVar()
-        self.case_sensitive = tk.BooleanVar(value=False)
-        self.output_path.set("")
+    Seçenekler Tk değişkenleridir; mesajlar ve sonuçlar arayüzün ana
+    thread'inde gösterilir.
+    """
+    
+    def __init__(self, key_columns: Optional[str] = None):
         self.ui: Optional[ModernExcelComparisonUI] = None
-        self.vehicle_drivers: Dict[str, str] = {}
-        self._load_vehicle_drivers()
-        
-    def _load_vehicle_drivers(self) -> None:
-        """Araç-plasiyer eşleştirmesini dosyadan yükler"""
-        try:
-            # Config dosyalarını dene
-            for config_file in CONFIG_FILES:
-                if Path(config_file).exists():
-                    try:
-                        with open(config_file, 'r', encoding='utf-8') as f:
-                            config = json.load(f)
-                            vehicle_drivers = config.get('vehicle_drivers', {})
-                            if vehicle_drivers:
-                                self.vehicle_drivers = vehicle_drivers
-                                logging.info(f"Araç-plasiyer konfigürasyonu yüklendi: {config_file}")
-                                return
-                    except (json.JSONDecodeError, KeyError) as e:
-                        logging.warning(f"Config dosyası okuma hatası {config_file}: {e}")
-                        continue
-            
-            # Çevre değişkenlerini dene
-            env_config = {}
-            for i in range(1, 21):
-                key = f"DRIVER_{i:02d}"
-                if key in os.environ:
-                    env_config[f"{i:02d}"] = os.environ[key]
-            
-            if env_config:
-                self.vehicle_drivers = env_config
-                logging.info("Araç-plasiyer konfigürasyonu çevre değişkenlerinden yüklendi")
-            else:
-                logging.warning("Araç-plasiyer konfigürasyonu bulunamadı!")
-                
-        except Exception as e:
-            logging.error(f"Config yükleme hatası: {e}")
-            self.vehicle_drivers = {}
+        super().__init__(key_columns)
+        self.reader_engine.trace_add('write', self._on_reader_engine_changed)
+    
+    def _option(self, value: Any) -> tk.Variable:
+        """Seçenekleri arayüze bağlanabilen Tk değişkenleri olarak oluştur"""
+        if isinstance(value, bool):
+            return tk.BooleanVar(value=value)
+        if isinstance(value, float):
+            return tk.DoubleVar(value=value)
+        return tk.StringVar(value=value)
+    
+    def _show_error(self, title: str, message: str) -> None:
+        if self.ui:
+            self.ui.root.after(0, lambda: self.ui.show_error(title, message))
+    
+    def _show_warning(self, title: str, message: str) -> None:
+        if self.ui:
+            self.ui.root.after(0, lambda: self.ui.show_warning(title, message))
+    
+    def _show_info(self, title: str, message: str) -> None:
+        if self.ui:
+            self.ui.root.after(0, lambda: self.ui.show_info(title, message))
+    
+    def _publish_results(self, result: ComparisonResult) -> None:
+        if self.ui:
+            self.ui.update_results(result.diff, result.status_text, result.near_matches)
+    
+    def _output_formats(self) -> List[str]:
+        """Arayüzde seçili kaydetme biçimleri (arayüz yoksa Excel)"""
+        if not self.ui:
+            return [EXCEL_FORMAT]
+        formats = []
+        if self.ui.save_excel.get():
+            formats.append(EXCEL_FORMAT)
+        if self.ui.save_image.get():
+            formats.append(IMAGE_FORMAT)
+        return formats
     
     def set_ui(self, ui: 'ModernExcelComparisonUI') -> None:
         """UI referansını ayarla"""
@@ -349,8 +348,7 @@ class ExcelComparisonLogic:
         }
         
         try:
-            with open('config.json', 'w', encoding='utf-8') as f:
-                json.dump(default_config, f, indent=4, ensure_ascii=False)
+            update_config_file(default_config)
             
             logging.info("Varsayılan config.json dosyası oluşturuldu")
             
@@ -394,255 +392,84 @@ class ExcelComparisonLogic:
             self.vehicle_drivers = result
             self.ui.show_info("Başarılı", "Araç-plasiyer eşleştirmesi güncellendi!")
     
-    def validate_file_size(self, file_path: str) -> Tuple[bool, str]:
-        """Dosya boyutunu kontrol et"""
-        try:
-            file_size_mb = Path(file_path).stat().st_size / (1024 * 1024)
-            if file_size_mb > MAX_FILE_SIZE_MB:
-                return False, f"Dosya boyutu çok büyük ({file_size_mb:.1f}MB). Maximum {MAX_FILE_SIZE_MB}MB destekleniyor."
-            return True, ""
-        except Exception as e:
-            return False, f"Dosya boyutu kontrol edilemedi: {e}"
-    
-    def validate_excel_file(self, file_path: str) -> Tuple[bool, str]:
-        """Excel dosyasının geçerli olup olmadığını kontrol eder"""
-        try:
-            path = Path(file_path)
-            
-            if not path.exists():
-                return False, "Dosya bulunamadı!"
-                
-            if path.suffix.lower() not in SUPPORTED_EXTENSIONS:
-                return False, f"Geçersiz dosya formatı! Desteklenen formatlar: {', '.join(SUPPORTED_EXTENSIONS)}"
-                
-            is_valid, error_msg = self.validate_file_size(file_path)
-            if not is_valid:
-                return False, error_msg
-                
-            # Basit Excel okuma testi
-            pd.read_excel(file_path, nrows=1)
-            return True, ""
-            
-        except PermissionError:
-            return False, "Dosyaya erişim izni yok!"
-        except pd.errors.EmptyDataError:
-            return False, "Excel dosyası boş!"
-        except Exception as e:
-            return False, f"Geçersiz Excel dosyası: {e}"
-    
-    def _find_header_row(self, df: pd.DataFrame) -> int:
-        """DataFrame içinde başlık satırını bulur"""
-        try:
-            # String'e çevir ve 'Cari Ünvan' ara
-            df_str = df.astype(str)
-            mask = df_str.apply(
-                lambda row: row.str.contains("Cari Ünvan", case=False, na=False).any(), 
-                axis=1
-            )
-            
-            if mask.any():
-                return mask.idxmax()
-            return -1
-        except Exception as e:
-            logging.error(f"Başlık satırı bulma hatası: {e}")
-            # Alternatif yöntem
-            for i, row in df.iterrows():
-                for value in row.values:
-                    if isinstance(value, str) and "Cari Ünvan" in value:
-                        return i
-            return -1
-    
-    def _extract_vehicle_number(self, depo_text: str) -> Optional[str]:
-        """Depo kartı metninden araç numarasını çıkarır"""
-        if not isinstance(depo_text, str):
-            return None
-                
-        logging.debug(f"Araç numarası çıkarma denemesi: '{depo_text}'")
-                
-        # Optimized regex patterns
-        patterns = [
-            r'[İI][Zz][Mm][İi][Rr]\s+[Aa][Rr][Aa][ÇçĞğ]\s+(\d{1,2})',
-            r'[Aa]ra[çc]\s*(\d{1,2})',
-            r'[Vv]ehicle\s*(\d{1,2})',
-            r'(\d{1,2})\s*[Nn]o',
-            r'\b(\d{1,2})\b'
-        ]
-        
-        for pattern in patterns:
-            try:
-                match = re.search(pattern, depo_text)
-                if match:
-                    vehicle_num = f"{int(match.group(1)):02d}"
-                    logging.debug(f"Araç numarası bulundu: {vehicle_num}")
-                    
-                    if vehicle_num in self.vehicle_drivers:
-                        return vehicle_num
-                    else:
-                        logging.warning(f"Araç {vehicle_num} config'de bulunamadı")
-            except (ValueError, AttributeError) as e:
-                logging.warning(f"Regex hatası: {e}")
-                continue
-                        
-        logging.warning(f"Hiçbir pattern eşleşmedi: '{depo_text}'")
-        return None
-    
-    def _create_filename_with_driver(self, depo_text: str) -> str:
-        """Depo kartından araç numarası çıkarıp plasiyer adıyla dosya adı oluşturur"""
-        try:
-            vehicle_num = self._extract_vehicle_number(depo_text)
-            
-            if vehicle_num and vehicle_num in self.vehicle_drivers:
-                driver_name = self.vehicle_drivers[vehicle_num]
-                filename = f"Arac_{vehicle_num}_{driver_name}"
-                return self._sanitize_filename(filename)
-            else:
-                return self._sanitize_filename(depo_text) if depo_text else DEFAULT_OUTPUT_NAME
-                
-        except Exception as e:
-            logging.error(f"Plasiyerli dosya adı oluşturma hatası: {e}")
-            return self._sanitize_filename(depo_text) if depo_text else DEFAULT_OUTPUT_NAME
-    
-    def _sanitize_filename(self, filename: str) -> str:
-        """Dosya adını güvenli hale getirir"""
-        # Güvenli olmayan karakterleri kaldır
-        invalid_chars = r'[\\/*?:"<>|]'
-        safe_name = re.sub(invalid_chars, '', filename)
-        safe_name = safe_name.strip()
-        
-        # Uzunluk kontrolü
-        if len(safe_name) > 100:
-            safe_name = safe_name[:100]
-            
-        return safe_name if safe_name else DEFAULT_OUTPUT_NAME
-    
     def update_output_filename(self, file_path: str) -> None:
         """Seçilen dosyaya göre çıktı dosya adını günceller"""
         logging.debug(f"update_output_filename çağrıldı: {file_path}")
         
+        is_valid, error_msg = self.validate_file_size(file_path)
+        if not is_valid:
+            logging.warning(f"Dosya boyutu hatası: {error_msg}")
+            if self.ui:
+                self.ui.show_warning("Uyarı", error_msg)
+            default_name = f"output_{datetime.now().strftime('%H%M%S')}"
+            self.output_path.set(default_name)
+            return
+        
+        # Dosya arka planda okunur, karşılaştırmada aynı okuma kullanılır
+        thread = threading.Thread(target=self._update_output_filename_thread, args=(file_path,), daemon=True)
+        thread.start()
+    
+    def _update_output_filename_thread(self, file_path: str) -> None:
+        """Dosyayı okuyup depo adından çıktı dosya adını oluşturur"""
         try:
-            is_valid, error_msg = self.validate_file_size(file_path)
-            if not is_valid:
-                logging.warning(f"Dosya boyutu hatası: {error_msg}")
-                if self.ui:
-                    self.ui.show_warning("Uyarı", error_msg)
-                default_name = f"output_{datetime.now().strftime('%H%M%S')}"
-                self.output_path.set(default_name)
-                return
-            
-            # Sadece ilk 10 satırı oku
-            df = pd.read_excel(file_path, header=None, nrows=10)
-            logging.debug(f"Excel dosyası okundu, {len(df)} satır")
-            
-            depo_name = None
-            for i in range(min(10, len(df))):
-                if len(df.columns) == 0:
-                    continue
-                    
-                row_str = str(df.iloc[i, 0])
-                logging.debug(f"Satır {i}: '{row_str[:100]}...'")
-                
-                if "Cari Kategori 3" in row_str:
-                    logging.debug(f"CARİ KATEGORİ 3 BULUNDU: {row_str[:100]}...")
-                    match = re.search(r'\[(.*?)\]\s*(.*?)(?:\n|\r\n|$)', row_str)
-                    if match and match.group(2):
-                        depo_name = match.group(2).strip()
-                        logging.debug(f"Araç adı çıkarıldı: '{depo_name}'")
-                        break
+            if self.is_large_file(file_path):
+                stream = open_key_stream(file_path, self.reader_engine.get(), self.header_detector)
+                stream.close()
+                depo_name = self._extract_depo_name(pd.DataFrame(stream.probe_rows))
+            else:
+                workbook = self.workbook_cache.get(file_path)
+                depo_name = self._extract_depo_name(workbook.probe(10))
             
             if depo_name:
+                logging.debug(f"Araç adı çıkarıldı: '{depo_name}'")
                 filename_with_driver = self._create_filename_with_driver(depo_name)
                 logging.debug(f"Oluşturulan dosya adı: '{filename_with_driver}'")
-                self.output_path.set(filename_with_driver)
+                self._set_output_path(filename_with_driver)
             else:
                 default_name = f"karşılaştırma_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
                 logging.debug(f"Varsayılan ad kullanılıyor: '{default_name}'")
-                self.output_path.set(default_name)
+                self._set_output_path(default_name)
                 
         except Exception as e:
             default_name = f"karşılaştırma_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            self.output_path.set(default_name)
+            self._set_output_path(default_name)
             logging.error(f"Filename güncelleme hatası: {e}")
             if self.ui:
                 self.ui.show_warning("Uyarı", f"Dosya adı güncellenemedi: {default_name}")
     
-    def _save_results_as_image(self, unique_cari_unvan_list: List[str], output_path: str, depo_name: Optional[str] = None) -> Tuple[bool, str]:
-        """Sonuçları resim dosyası olarak kaydeder"""
-        try:
-            fig, ax = plt.subplots(figsize=(12, 8), dpi=150)
-            plt.rcParams['font.family'] = 'DejaVu Sans'
-            
-            if depo_name:
-                vehicle_num = self._extract_vehicle_number(depo_name)
-                if vehicle_num and vehicle_num in self.vehicle_drivers:
-                    driver_name = self.vehicle_drivers[vehicle_num]
-                    title = f"Araç {vehicle_num} - {driver_name}"
-                else:
-                    title = depo_name
-                plt.suptitle(title, fontsize=16, fontweight='bold')
-            else:
-                plt.suptitle("Eksik Cari Ünvanlar", fontsize=16, fontweight='bold')
-                
-            cell_text = []
-            for i, unvan in enumerate(unique_cari_unvan_list, 1):
-                display_unvan = unvan if len(str(unvan)) <= 80 else str(unvan)[:77] + "..."
-                cell_text.append([i, display_unvan])
-                
-            if not cell_text:
-                cell_text = [["", "Tüm cari ünvanlar her iki dosyada da mevcut."]]
-                
-            plt.axis('off')
-            table = plt.table(
-                cellText=cell_text,
-                colLabels=["#", "Cari Ünvan"],
-                loc='center',
-                cellLoc='left',
-                colWidths=[0.1, 0.9]
-            )
-            
-            table.auto_set_font_size(False)
-            table.set_fontsize(9)
-            table.scale(1, 1.5)
-            
-            # Tablo styling
-            for (i, j), cell in table.get_celld().items():
-                if i == 0:
-                    cell.set_text_props(fontweight='bold')
-                    cell.set_facecolor('#e6e6e6')
-                else:
-                    if i % 2 == 0:
-                        cell.set_facecolor('#f9f9f9')
-            
-            full_output_path = str(Path(output_path).resolve())
-            
-            # Dizin oluştur
-            output_dir = Path(full_output_path).parent
-            output_dir.mkdir(parents=True, exist_ok=True)
-            
-            plt.savefig(full_output_path, bbox_inches='tight', dpi=150, 
-                       facecolor='white', edgecolor='none')
-            plt.close(fig)  # Memory leak önleme
-            
-            return True, full_output_path
-            
-        except PermissionError as e:
-            error_msg = f"Resim kaydetme izin hatası: {output_path} - {e}"
-            logging.error(error_msg)
-            return False, error_msg
-        except Exception as e:
-            error_msg = f"Resim kaydetme hatası: {e}"
-            logging.error(error_msg)
-            return False, error_msg
-        finally:
-            plt.close('all')  # Tüm figürleri temizle
+    def _set_output_path(self, name: str) -> None:
+        """Çıktı dosya adını ana thread'de güncelle"""
+        if self.ui:
+            self.ui.root.after(0, lambda: self.output_path.set(name))
+        else:
+            self.output_path.set(name)
+    
+    def preload_workbook(self, file_path: str) -> None:
+        """Seçilen dosyayı arka planda okuyup önbelleğe al (büyük dosyalar hariç)"""
+        if self.is_large_file(file_path):
+            return
+        
+        self._apply_options()
+        
+        def _preload():
+            try:
+                self.workbook_cache.get(file_path)
+            except Exception as e:
+                # Hata karşılaştırma sırasındaki doğrulamada kullanıcıya gösterilir
+                logging.warning(f"Dosya ön yükleme hatası {file_path}: {e}")
+        
+        threading.Thread(target=_preload, daemon=True).start()
     
     def compare_files_thread(self) -> None:
         """Dosya karşılaştırmasını ayrı thread'de çalıştır"""
         try:
-            self._compare_files_internal()
+            result = self.run(self.file1_path.get(), self.file2_path.get())
+            self.report_results(result, self.output_path.get())
+        except ComparisonError as e:
+            self._show_error("Hata", str(e))
         except Exception as e:
             logging.error(f"Thread hatası: {e}")
-            if self.ui:
-                self.ui.root.after(0, lambda: self.ui.show_error("Hata", f"İşlem sırasında beklenmeyen hata: {e}"))
+            self._show_error("Hata", f"İşlem sırasında beklenmeyen hata: {e}")
         finally:
             # UI'ı reset et
             if self.ui:
@@ -653,312 +480,74 @@ class ExcelComparisonLogic:
         thread = threading.Thread(target=self.compare_files_thread, daemon=True)
         thread.start()
     
-    def _compare_files_internal(self) -> None:
-        """Excel dosyalarını karşılaştırır ve sonuçları gösterir"""
-        file1_path = self.file1_path.get()
-        file2_path = self.file2_path.get()
-        output_path = self.output_path.get()
-        
-        # Input validation
-        if not file1_path or not file2_path:
-            if self.ui:
-                self.ui.root.after(0, lambda: self.ui.show_error("Hata", "Lütfen her iki Excel dosyasını da seçin!"))
-            return
-        
-        # File validation
-        for file_path, file_desc in [(file1_path, "Eski tarihli"), (file2_path, "Yeni tarihli")]:
-            is_valid, error_msg = self.validate_excel_file(file_path)
-            if not is_valid:
-                if self.ui:
-                    self.ui.root.after(0, lambda e=error_msg, d=file_desc: self.ui.show_error("Hata", f"{d} dosya hatası: {e}"))
-                return
-        
-        self.clear_results()
-        
-        try:
-            logging.info(f"Dosyalar okunuyor: {file1_path}, {file2_path}")
-            
-            # İlk 15 satırı oku (header detection için)
-            df1_header_search = pd.read_excel(file1_path, header=None, nrows=15)
-            df2_header_search = pd.read_excel(file2_path, header=None, nrows=15)
-            
-            # Depo adını bul
-            depo_name = self._extract_depo_name(df1_header_search)
-            
-            # Header satırlarını bul
-            header_row1 = self._find_header_row(df1_header_search)
-            header_row2 = self._find_header_row(df2_header_search)
-            
-            if header_row1 == -1 or header_row2 == -1:
-                if self.ui:
-                    self.ui.root.after(0, lambda: self.ui.show_error("Hata", "Excel dosyalarında 'Cari Ünvan' başlığı bulunamadı!"))
-                return
-            
-            # Tam dosyaları oku
-            df1 = pd.read_excel(file1_path, header=header_row1)
-            df2 = pd.read_excel(file2_path, header=header_row2)
-            
-            # Sütun adlarını temizle
-            df1.columns = [col.strip() if isinstance(col, str) else col for col in df1.columns]
-            df2.columns = [col.strip() if isinstance(col, str) else col for col in df2.columns]
-            
-            # Cari Ünvan sütunlarını bul
-            cari_unvan_col1 = self._find_cari_unvan_column(df1.columns)
-            cari_unvan_col2 = self._find_cari_unvan_column(df2.columns)
-            
-            if not cari_unvan_col1 or not cari_unvan_col2:
+    def compare_snapshot_folder(self, folder: str) -> None:
+        """Klasördeki günlük dosyaları seri olarak karşılaştırır (ayrı thread'de)"""
+        def _run():
+            try:
+                self.report_results(self.run_snapshot_chain(folder), self.output_path.get())
+            except ComparisonError as e:
+                self._show_error("Hata", str(e))
+            except Exception as e:
+                logging.error(f"Günlük seri hatası: {e}")
+                self._show_error("Hata", f"Günlük seri karşılaştırılamadı: {e}")
+            finally:
                 if self.ui:
-                    self.ui.root.after(0, lambda: self.ui.show_error("Hata", "Bir veya daha fazla Excel dosyasında 'Cari Ünvan' sütunu bulunamadı."))
-                return
-            
-            # Veri işleme ve karşılaştırma
-            cari_unvan_list1 = self._extract_cari_unvan_list(df1, cari_unvan_col1)
-            cari_unvan_list2 = self._extract_cari_unvan_list(df2, cari_unvan_col2)
-            
-            # Karşılaştırma yap
-            unique_cari_unvan_list = self._perform_comparison(cari_unvan_list1, cari_unvan_list2)
-            
-            # Sonuçları göster
-            status_text = f"Toplam {len(cari_unvan_list1)} cari ünvandan {len(unique_cari_unvan_list)} tanesi yeni dosyada bulunmuyor."
-            if self.ui:
-                self.ui.update_results(unique_cari_unvan_list, status_text)
-            
-            logging.info(f"Karşılaştırma tamamlandı. {len(unique_cari_unvan_list)} farklılık bulundu.")
-            
-            # Sonuçları kaydet
-            self._save_results(unique_cari_unvan_list, output_path, depo_name)
+                    self.ui.root.after(0, self.ui.reset_ui)
         
-        except MemoryError:
-            if self.ui:
-                self.ui.root.after(0, lambda: self.ui.show_error("Hata", "Dosyalar çok büyük, bellek yetersiz!"))
-        except pd.errors.EmptyDataError:
-            if self.ui:
-                self.ui.root.after(0, lambda: self.ui.show_error("Hata", "Excel dosyalarından biri boş veya bozuk!"))
-        except PermissionError:
-            if self.ui:
-                self.ui.root.after(0, lambda: self.ui.show_error("Hata", "Dosyalara erişim izni yok!"))
-        except Exception as e:
-            logging.error(f"Karşılaştırma hatası: {e}")
-            if self.ui:
-                self.ui.root.after(0, lambda: self.ui.show_error("Hata", f"İşlem sırasında bir hata oluştu: {e}"))
-    
-    def _extract_depo_name(self, df: pd.DataFrame) -> Optional[str]:
-        """DataFrame'den depo adını çıkar"""
-        try:
-            for i in range(min(10, len(df))):
-                if len(df.columns) == 0:
-                    continue
-                    
-                row_str = str(df.iloc[i, 0])
-                if "Cari Kategori 3" in row_str:
-                    match = re.search(r'\[(.*?)\]\s*(.*?)(?:\n|\r\n|$)', row_str)
-                    if match and match.group(2):
-                        return match.group(2).strip()
-            return None
-        except Exception as e:
-            logging.error(f"Depo adı çıkarma hatası: {e}")
-            return None
-    
-    def _find_cari_unvan_column(self, columns) -> Optional[str]:
-        """Cari Ünvan sütununu bul"""
-        for col in columns:
-            if isinstance(col, str) and "Cari Ünvan" in col:
-                return col
-        return None
+        threading.Thread(target=_run, daemon=True).start()
     
-    def _extract_cari_unvan_list(self, df: pd.DataFrame, cari_unvan_col: str) -> List[str]:
-        """Cari ünvan listesini çıkar ve temizle"""
-        cari_unvan_list = df[cari_unvan_col].dropna().apply(
-            lambda x: x.strip() if isinstance(x, str) else str(x).strip()
-        ).tolist()
-        
-        # Boş değerleri filtrele
-        return [x for x in cari_unvan_list if x and x.strip()]
-    
-    def _perform_comparison(self, list1: List[str], list2: List[str]) -> List[str]:
-        """İki liste arasında karşılaştırma yap"""
-        if not self.case_sensitive.get():
-            # Case-insensitive karşılaştırma
-            list2_upper_set = {unvan.upper() for unvan in list2}
-            unique_list = [
-                unvan for unvan in list1 
-                if unvan.upper() not in list2_upper_set
-            ]
-        else:
-            # Case-sensitive karşılaştırma
-            list2_set = set(list2)
-            unique_list = [unvan for unvan in list1 if unvan not in list2_set]
+    def compare_fleet_folders(self, old_folder: str, new_folder: str) -> None:
+        """İki günün tüm araç dosyalarını birlikte karşılaştırır (ayrı thread'de)"""
+        def _run():
+            try:
+                output_path = f"{FLEET_OUTPUT_NAME}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+                self.report_results(self.run_fleet(old_folder, new_folder), output_path)
+            except ComparisonError as e:
+                self._show_error("Hata", str(e))
+            except Exception as e:
+                logging.error(f"Filo karşılaştırma hatası: {e}")
+                self._show_error("Hata", f"Filo karşılaştırılamadı: {e}")
+            finally:
+                if self.ui:
+                    self.ui.root.after(0, self.ui.reset_ui)
         
-        # Duplicate'leri kaldır (sırayı koruyarak)
-        seen = set()
-        return [x for x in unique_list if not (x in seen or seen.add(x))]
+        threading.Thread(target=_run, daemon=True).start()
     
-    def _save_results(self, unique_cari_unvan_list: List[str], output_path: str, depo_name: Optional[str]) -> None:
-        """Sonuçları kaydet"""
-        if not output_path or output_path.strip() == "":
-            output_path = f"{DEFAULT_OUTPUT_NAME}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            logging.warning(f"Output path boş, varsayılan oluşturuldu: {output_path}")
-            
-        current_dir = Path.cwd()
-        logging.info(f"Çalışma dizini: {current_dir}")
-        logging.info(f"Output path: {output_path}")
-        logging.info(f"Sonuç listesi uzunluğu: {len(unique_cari_unvan_list)}")
-            
-        try:
-            save_excel = self.ui.save_excel.get() if self.ui else True
-            save_image = self.ui.save_image.get() if self.ui else False
-            
-            logging.info(f"Save Excel: {save_excel}, Save Image: {save_image}")
-            
-            saved_files = []
-            
-            if save_excel:
-                success, result_path = self._save_as_excel(unique_cari_unvan_list, output_path, depo_name)
-                if success:
-                    saved_files.append(f"Excel: {result_path}")
-                elif self.ui:
-                    self.ui.root.after(0, lambda: self.ui.show_error("Hata", result_path))
-            
-            if save_image:
-                image_path = str(current_dir / f"{output_path}.png")
-                success, result_msg = self._save_results_as_image(unique_cari_unvan_list, image_path, depo_name)
-                if success:
-                    saved_files.append(f"Resim: {result_msg}")
-                elif self.ui:
-                    self.ui.root.after(0, lambda: self.ui.show_error("Hata", result_msg))
-            
-            # Sonuç mesajı göster
-            self._show_save_result(saved_files, save_excel, save_image)
-                    
-        except Exception as e:
-            error_msg = f"Sonuç kaydetme genel hatası: {e}"
-            logging.error(error_msg)
-            if self.ui:
-                self.ui.root.after(0, lambda: self.ui.show_error("Hata", error_msg))
-    
-    def _save_as_excel(self, unique_cari_unvan_list: List[str], output_path: str, depo_name: Optional[str]) -> Tuple[bool, str]:
-        """Excel olarak kaydet"""
-        try:
-            excel_path = Path.cwd() / f"{output_path}.xlsx"
-            logging.info(f"Excel dosyası kaydediliyor: {excel_path}")
-            
-            # Dizin oluştur
-            excel_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            # Tablo verisi oluştur
-            table_data = [[i, unvan] for i, unvan in enumerate(unique_cari_unvan_list, 1)]
-            result_df = pd.DataFrame(table_data, columns=["#", "Cari Ünvan"])
-            
+    def compare_combined_files(self, old_file: str, new_file: str) -> None:
+        """Tüm depoları içeren iki dosyayı araç bazında karşılaştırır (ayrı thread'de)"""
+        def _run():
             try:
-                # Gelişmiş Excel formatı ile kaydet
-                self._save_excel_with_formatting(result_df, excel_path, depo_name)
-            except ImportError:
-                # Basit format ile kaydet
-                logging.warning("openpyxl.styles import edilemedi, basit format kullanılıyor")
-                result_df.to_excel(excel_path, index=False)
-            
-            logging.info(f"Excel dosyası başarıyla kaydedildi: {excel_path}")
-            return True, str(excel_path)
-            
-        except PermissionError as e:
-            error_msg = f"Excel dosyası kaydetme izni yok: {e}"
-            logging.error(error_msg)
-            return False, error_msg
-        except Exception as e:
-            error_msg = f"Excel dosyası kaydedilemedi: {e}"
-            logging.error(error_msg)
-            return False, error_msg
-    
-    def _save_excel_with_formatting(self, result_df: pd.DataFrame, excel_path: Path, depo_name: Optional[str]) -> None:
-        """Formatlanmış Excel kaydet"""
-        from openpyxl.styles import Font, Border, Side, Alignment
+                self.report_vehicle_results(self.run_combined(old_file, new_file))
+            except ComparisonError as e:
+                self._show_error("Hata", str(e))
+            except Exception as e:
+                logging.error(f"Birleşik dosya karşılaştırma hatası: {e}")
+                self._show_error("Hata", f"Birleşik dosya karşılaştırılamadı: {e}")
+            finally:
+                if self.ui:
+                    self.ui.root.after(0, self.ui.reset_ui)
         
-        with pd.ExcelWriter(excel_path, engine='openpyxl') as writer:
-            if depo_name:
-                # Header ekle
-                vehicle_num = self._extract_vehicle_number(depo_name)
-                if vehicle_num and vehicle_num in self.vehicle_drivers:
-                    driver_name = self.vehicle_drivers[vehicle_num]
-                    header_text = f"Araç {vehicle_num} - {driver_name}"
-                else:
-                    header_text = depo_name
-                
-                header_df = pd.DataFrame({"A": [header_text], "B": [""]})
-                header_df.to_excel(writer, sheet_name='Sheet1', index=False, header=False, startrow=0)
-                result_df.to_excel(writer, sheet_name='Sheet1', index=False, startrow=2)
-                
-                # Styling uygula
-                self._apply_excel_styling(writer, header_text, len(result_df))
-            else:
-                result_df.to_excel(writer, sheet_name='Sheet1', index=False)
+        threading.Thread(target=_run, daemon=True).start()
     
-    def _apply_excel_styling(self, writer, header_text: str, data_rows: int) -> None:
-        """Excel styling uygula"""
-        from openpyxl.styles import Font, Border, Side, Alignment
-        
-        workbook = writer.book
-        worksheet = writer.sheets['Sheet1']
-        
-        # Font ve border tanımları
-        bold_font = Font(bold=True, color="000000", size=12)
-        header_font = Font(bold=True, color="000000", size=10)
-        normal_font = Font(color="000000", size=10)
-        
-        thin_border = Border(
-            left=Side(style='thin'), right=Side(style='thin'),
-            top=Side(style='thin'), bottom=Side(style='thin')
-        )
-        
-        center_alignment = Alignment(horizontal='center', vertical='center')
-        left_alignment = Alignment(horizontal='left', vertical='center')
-        
-        # Header styling
-        worksheet.merge_cells('A1:B1')
-        worksheet['A1'] = header_text
-        worksheet['A1'].font = bold_font
-        worksheet['A1'].alignment = center_alignment
-        worksheet['A1'].border = thin_border
-        
-        # Tablo header styling
-        worksheet['A3'].font = header_font
-        worksheet['A3'].alignment = center_alignment
-        worksheet['A3'].border = thin_border
-        
-        worksheet['B3'].font = header_font
-        worksheet['B3'].alignment = center_alignment
-        worksheet['B3'].border = thin_border
-        
-        # Veri satırları styling
-        for row in range(4, data_rows + 4):
-            worksheet[f'A{row}'].font = normal_font
-            worksheet[f'A{row}'].alignment = center_alignment
-            worksheet[f'A{row}'].border = thin_border
-            
-            worksheet[f'B{row}'].font = normal_font
-            worksheet[f'B{row}'].alignment = left_alignment
-            worksheet[f'B{row}'].border = thin_border
+    def compare_batch_folders(self, old_folder: str, new_folder: str) -> None:
+        """İki günün araç dosyalarını araç bazında ayrı ayrı karşılaştırır (ayrı thread'de)"""
+        def _run():
+            try:
+                summary = self.run_batch(old_folder, new_folder)
+                message = summary.status_text
+                if summary.summary_paths:
+                    message += "\n\nÖzet: " + "\n".join(summary.summary_paths)
+                self._show_info("Toplu Karşılaştırma", message)
+            except ComparisonError as e:
+                self._show_error("Hata", str(e))
+            except Exception as e:
+                logging.error(f"Toplu karşılaştırma hatası: {e}")
+                self._show_error("Hata", f"Toplu karşılaştırma yapılamadı: {e}")
+            finally:
+                if self.ui:
+                    self.ui.root.after(0, self.ui.reset_ui)
         
-        # Sütun genişlikleri
-        worksheet.column_dimensions['A'].width = 8
-        worksheet.column_dimensions['B'].width = 60
-    
-    def _show_save_result(self, saved_files: List[str], save_excel: bool, save_image: bool) -> None:
-        """Kaydetme sonucunu göster"""
-        if saved_files:
-            success_message = "Sonuçlar başarıyla kaydedildi:\n\n" + "\n".join(saved_files)
-            logging.info(success_message)
-            if self.ui:
-                self.ui.root.after(0, lambda: self.ui.show_info("Başarılı", success_message))
-        elif not save_excel and not save_image:
-            warning_msg = "Lütfen en az bir kaydetme formatı seçin (Excel veya Resim)!"
-            logging.warning(warning_msg)
-            if self.ui:
-                self.ui.root.after(0, lambda: self.ui.show_warning("Uyarı", warning_msg))
-        else:
-            error_msg = "Hiçbir dosya kaydedilemedi. Lütfen log dosyasını kontrol edin."
-            logging.error(error_msg)
-            if self.ui:
-                self.ui.root.after(0, lambda: self.ui.show_error("Hata", error_msg))
+        threading.Thread(target=_run, daemon=True).start()
     
     def clear_results(self) -> None:
         """Sonuç listesini temizler"""
@@ -966,12 +555,13 @@ class ExcelComparisonLogic:
             self.ui.clear_results()
 
 
+
 class ExcelComparisonApp:
     """Ana uygulama sınıfı"""
     
-    def __init__(self, root: tk.Tk):
+    def __init__(self, root: tk.Tk, key_columns: Optional[str] = None):
         self.root = root
-        self.logic = ExcelComparisonLogic()
+        self.logic = ExcelComparisonLogic(key_columns)
         self.ui = ModernExcelComparisonUI(root, self.logic)
         self.logic.set_ui(self.ui)
 
@@ -1014,8 +604,20 @@ def create_root_window() -> tk.Tk:
         return root
 
 
+def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Komut satırı seçenekleri"""
+    parser = argparse.ArgumentParser(description="Excel cari ünvan karşılaştırma")
+    parser.add_argument(
+        "--key", dest="key_columns", default=None,
+        help=f"Karşılaştırma anahtarı sütunları, '{KEY_SEPARATOR}' ile ayrılır (örn. \"Cari Kodu + Cari Ünvan\"); "
+             "verilmezse ayarlardaki 'key_columns', o da yoksa sadece Cari Ünvan"
+    )
+    return parser.parse_args(argv)
+
+
 def main():
     """Ana program fonksiyonu"""
+    args = parse_arguments()
     try:
         # Bağımlılık kontrolü
         if not check_dependencies():
@@ -1028,7 +630,7 @@ def main():
         
         # Uygulamayı başlat
         try:
-            app = ExcelComparisonApp(root)
+            app = ExcelComparisonApp(root, args.key_columns)
             if not app.logic or not app.ui:
                 raise RuntimeError("Uygulama bileşenleri başlatılamadı")
         except Exception as e:
@@ -1068,4 +670,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Paketlenmiş (PyInstaller) sürümde alt süreçler için gerekli
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
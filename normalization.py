@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Excel Karşılaştırma Uygulaması - Ad Normalleştirme
+Cari ünvanlardan karşılaştırma anahtarı üretir: Unicode NFKC, Türkçe
+büyük harf dönüşümü, noktalama ve boşluk temizliği, şirket türü ekleri.
+"""
+
+import sys
+import unicodedata
+from functools import lru_cache
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    STRING_DTYPE = "string[pyarrow]"  # str işlemleri Arrow çekirdeklerinde (RE2) çalışır
+except ImportError:
+    STRING_DTYPE = object
+
+# Constants
+NORMALIZATION_VERSION = 2
+
+# Türkçe büyük harf: str.upper() 'i' -> 'I' yapar, doğrusu 'i' -> 'İ', 'ı' -> 'I'.
+# Python'un lower() ile ürettiği 'i̇' (i + U+0307) birleşik noktası atılır.
+TURKISH_UPPER_TABLE = (('̇', ''), ('i', 'İ'), ('ı', 'I'))
+
+# NFKC'nin değiştirmediği karakterler: ASCII ve birleşik (tek kod noktalı) Türkçe harfler.
+# Sadece bunların dışında karakter içeren adlar (tam genişlik harfler, ayrık
+# noktalı harfler vb.) Python'un unicodedata.normalize fonksiyonuna gönderilir.
+NFKC_STABLE_CHARS = "çğıöşüÇĞİÖŞÜâîûÂÎÛ"
+NFKC_CANDIDATE_PATTERN = f"[^\\x00-\\x7F{NFKC_STABLE_CHARS}]"
+
+# Şirket türü ekleri: (kanonik yazılış, büyük harfli metinde eşleşen kelimeler).
+# Noktalama boşluğa çevrilip boşluklar teke indirildikten sonra sadece adın sonundaki
+# ek dizisine uygulanır ("AS YAPI" gibi baştaki/ortadaki kelimeler değişmez); sıra
+# önemlidir ("ANONİM ŞİRKETİ" önce "ANONİM ŞTİ" olur, sonra "AŞ").
+LEGAL_SUFFIXES = (
+    ('LTD', r'L[İI]M[İI]TE[DT]'),
+    ('ŞTİ', r'Ş[İI]RKET[İI]|[ŞS]T[İI]'),
+    ('AŞ', r'ANON[İI]M ŞTİ|A ?[ŞS]'),
+    ('SAN', r'SANAY[İI][İI]?'),
+    ('TİC', r'T[İI]CARET[İI]?|T[İI]C'),
+    ('KOLL', r'KOLLEKT[İI]F'),
+)
+# Adın sonundaki ek dizisi: başta en az bir başka kelime, sonra boşlukla ayrılmış ekler
+SUFFIX_TAIL_PATTERN = (
+    r'^(.*?)((?: (?:' + '|'.join(pattern for _, pattern in LEGAL_SUFFIXES) + r'|ANON[İI]M))+)$'
+)
+
+
+class NameNormalizer:
+    """Ayarlanabilir cari ünvan normalleştirme adımları
+
+    Adımlar sırasıyla: NFKC, Türkçe büyük harf (case_sensitive=False ise),
+    noktalamanın boşluğa çevrilmesi, boşlukların tek boşluğa indirilmesi ve
+    adın sonundaki şirket türü eklerinin kanonik yazılışa çevrilmesi
+    ("Ltd. Şti.", "LİMİTED ŞİRKETİ" -> "LTD ŞTİ"; "A.Ş.", "ANONİM ŞİRKETİ"
+    -> "AŞ"). Baştaki veya ortadaki "AS", "TİC" gibi kelimeler değişmez.
+
+    Dönüşüm tabloları pandas str erişimcisinin replace/normalize/upper
+    işlemleriyle sadece tekrarsız adlara uygulanır; NFKC yalnızca ASCII ve
+    Türkçe harfler dışında karakter içeren adlarda çalıştırılır. pyarrow kuruluysa bu
+    işlemler Arrow çekirdeklerinde çalışır; desenler açık karakter sınıfları
+    kullandığı için Python re ile de aynı sonucu verir.
+    """
+
+    def __init__(self, case_sensitive: bool = False, nfkc: bool = True, collapse_whitespace: bool = True,
+                 strip_punctuation: bool = True, canonical_suffixes: bool = True):
+        self.case_sensitive = case_sensitive
+        self.nfkc = nfkc
+        self.collapse_whitespace = collapse_whitespace
+        self.strip_punctuation = strip_punctuation
+        # Ekler büyük harfli, tek boşluklu metinde tanınır
+        self.canonical_suffixes = canonical_suffixes and not case_sensitive and collapse_whitespace
+
+    def signature(self) -> str:
+        """Üretilen anahtarları etkileyen ayarların imzası (önbellek anahtarı için)"""
+        flags = (self.case_sensitive, self.nfkc, self.collapse_whitespace,
+                 self.strip_punctuation, self.canonical_suffixes)
+        return f"v{NORMALIZATION_VERSION}|" + ''.join('1' if flag else '0' for flag in flags)
+
+    def normalize(self, names: pd.Series) -> pd.Series:
+        """Her ad için karşılaştırma anahtarı (aynı sıra ve uzunlukta)"""
+        names = pd.Series(names).reset_index(drop=True).astype(STRING_DTYPE)
+        codes, uniques = pd.factorize(names)
+        keys = self._normalize_unique(pd.Series(uniques, dtype=STRING_DTYPE))
+        return keys.take(codes).reset_index(drop=True)
+
+    def _normalize_unique(self, keys: pd.Series) -> pd.Series:
+        """Adımları tekrarsız adlara uygula"""
+        if self.nfkc:
+            candidates = keys.str.contains(NFKC_CANDIDATE_PATTERN, regex=True)
+            if candidates.any():
+                keys = keys.mask(candidates, keys[candidates].str.normalize('NFKC'))
+
+        if not self.case_sensitive:
+            for old, new in TURKISH_UPPER_TABLE:
+                keys = keys.str.replace(old, new, regex=False)
+            keys = keys.str.upper()
+
+        separators = _separator_class(self.strip_punctuation, self.collapse_whitespace)
+        if separators:
+            keys = keys.str.replace(separators, ' ', regex=True)
+        if self.collapse_whitespace:
+            keys = keys.str.strip()
+
+        if self.canonical_suffixes:
+            parts = keys.str.extract(SUFFIX_TAIL_PATTERN, expand=True)
+            has_tail = parts[1].notna()
+            if has_tail.any():
+                tails = parts.loc[has_tail, 1]
+                for canonical, pattern in LEGAL_SUFFIXES:
+                    tails = tails.str.replace(f'( )(?:{pattern})( |$)', f'\\1{canonical}\\2', regex=True)
+                keys = keys.mask(has_tail, parts.loc[has_tail, 0] + tails)
+        return keys
+
+
+@lru_cache(maxsize=4)
+def _separator_class(punctuation: bool, whitespace: bool) -> str:
+    """Boşluğa çevrilecek karakterlerin açık listesiyle regex sınıfı
+
+    Unicode kategorilerinden üretilir (P*: noktalama, Z* ve boşluk
+    karakterleri); RE2 ve Python re'de aynı davranır.
+    """
+    chars = []
+    for code in range(min(sys.maxunicode, 0xFFFF) + 1):
+        char = chr(code)
+        category = unicodedata.category(char)
+        if (punctuation and category.startswith('P')) or (whitespace and (category.startswith('Z') or char.isspace())):
+            chars.append(char)
+    if not chars:
+        return ''
+    escaped = ''.join(f'\\{char}' if char in '\\]^-[' else char for char in chars)
+    return f'[{escaped}]+'
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Excel Karşılaştırma Uygulaması - Kalıcı Okuma Önbelleği
+Okunan dosyaların 'Cari Ünvan' sütununu (varsa ek anahtar sütunlarıyla) ve
+normalleştirilmiş karşılaştırma anahtarlarını diskte Arrow IPC formatında saklar.
+Aynı dosya tekrar karşılaştırıldığında Excel hiç okunmaz.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Dict, List, Any, Tuple
+
+from key_index import KeyIndex, load_key_index
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# Constants
+DEFAULT_CACHE_DIR = "parse_cache"
+DEFAULT_MAX_SIZE_MB = 500
+CACHE_FORMAT_VERSION = 1
+INDEX_FILE = "index.json"
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class ParseCache:
+    """Dosya içeriğine göre anahtarlanan, boyut sınırlı (LRU) okuma önbelleği
+
+    Anahtar dosyanın içerik özetidir (blake2b). Yol, boyut ve değişiklik zamanı
+    aynı kaldıkça özet yeniden hesaplanmaz.
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, max_size_mb: float = DEFAULT_MAX_SIZE_MB):
+        self.directory = Path(directory)
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.enabled = HAS_PYARROW
+        self._lock = threading.Lock()
+        self._index: Dict[str, Any] = {"version": CACHE_FORMAT_VERSION, "entries": {}, "paths": {}}
+
+        if not HAS_PYARROW:
+            logging.info("pyarrow bulunamadı - kalıcı okuma önbelleği kapalı")
+            return
+
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._index = self._read_index()
+        except OSError as e:
+            logging.warning(f"Okuma önbelleği dizini kullanılamıyor {self.directory}: {e}")
+            self.enabled = False
+
+    def load(self, file_path: str, signature: str = "") -> Optional[Dict[str, Any]]:
+        """Önbellekteki kaydı döndür: probe_rows, header_row, key_column, key_values, extra_values"""
+        if not self.enabled:
+            return None
+
+        try:
+            found = self._read_entry(self._entry_key(file_path, signature))
+            if found is None:
+                return None
+            meta, columns = found
+            extra_names = meta.get("extra_columns", [])
+            logging.info(f"Okuma önbelleğinden kullanıldı: {file_path}")
+            return dict(meta, key_values=columns[0], extra_values=dict(zip(extra_names, columns[1:])))
+
+        except (OSError, KeyError, ValueError, pa.ArrowException) as e:
+            logging.warning(f"Okuma önbelleği okunamadı {file_path}: {e}")
+            return None
+
+    def store(self, file_path: str, probe_rows: List[tuple], header_row: int,
+              key_column: Optional[str], key_values: List[Any], signature: str = "",
+              extra_values: Optional[Dict[str, List[Any]]] = None) -> None:
+        """Okunan dosyanın verisini önbelleğe yaz (extra_values: ek anahtar sütunları, metin olarak)"""
+        if not self.enabled:
+            return
+
+        try:
+            extra_values = extra_values or {}
+            meta = {
+                "probe_rows": [[None if _is_missing(v) else v for v in row] for row in probe_rows],
+                "header_row": int(header_row),
+                "key_column": key_column,
+                "extra_columns": list(extra_values),
+            }
+            self._write_entry(self._entry_key(file_path, signature), [key_values, *extra_values.values()], meta)
+
+        except (OSError, TypeError, ValueError, pa.ArrowException) as e:
+            logging.warning(f"Okuma önbelleğine yazılamadı {file_path}: {e}")
+
+    def load_keys(self, file_path: str, signature: str) -> Optional[List[Optional[str]]]:
+        """Dosyanın normalleştirilmiş karşılaştırma anahtarlarını döndür
+
+        signature okuma ayarlarını ve normalleştirme ayarlarını birlikte içerir.
+        """
+        if not self.enabled:
+            return None
+
+        try:
+            found = self._read_entry(self._entry_key(file_path, f"keys:{signature}"))
+            if found is None:
+                return None
+            logging.info(f"Normalleştirilmiş anahtarlar önbellekten kullanıldı: {file_path}")
+            return found[1][0]
+
+        except (OSError, KeyError, ValueError, pa.ArrowException) as e:
+            logging.warning(f"Anahtar önbelleği okunamadı {file_path}: {e}")
+            return None
+
+    def store_keys(self, file_path: str, keys: List[Optional[str]], signature: str) -> None:
+        """Normalleştirilmiş anahtarları görüntülenen adların yanına yaz (aynı LRU sınırı içinde)"""
+        if not self.enabled:
+            return
+
+        try:
+            self._write_entry(self._entry_key(file_path, f"keys:{signature}"), [keys], {})
+
+        except (OSError, TypeError, ValueError, pa.ArrowException) as e:
+            logging.warning(f"Anahtar önbelleğine yazılamadı {file_path}: {e}")
+
+    def load_key_index(self, file_path: str, signature: str) -> Optional[KeyIndex]:
+        """Dosyanın kayıtlı anahtar indeksi (akış modunda yeni dosyanın anahtarları için)"""
+        if not self.enabled:
+            return None
+
+        try:
+            key = self._entry_key(file_path, f"index:{signature}")
+            with self._lock:
+                entry = self._index["entries"].get(key)
+                if entry is None:
+                    return None
+            index = load_key_index(str(self.directory / entry["file"]))
+            self._touch(entry)
+            logging.info(f"Anahtar indeksi önbellekten kullanıldı: {file_path}")
+            return index
+
+        except (OSError, KeyError, ValueError) as e:
+            logging.warning(f"Anahtar indeksi okunamadı {file_path}: {e}")
+            return None
+
+    def store_key_index(self, file_path: str, signature: str, index: KeyIndex) -> None:
+        """Anahtar indeksini .npz olarak yaz (aynı LRU sınırı içinde)"""
+        if not self.enabled:
+            return
+
+        try:
+            key = self._entry_key(file_path, f"index:{signature}")
+            file_name = f"{key}.npz"
+            temp_path = self.directory / f"{key}.tmp"
+            index.save(str(temp_path))
+            os.replace(temp_path, self.directory / file_name)
+            self._register_entry(key, file_name, {})
+
+        except (OSError, ValueError) as e:
+            logging.warning(f"Anahtar indeksi yazılamadı {file_path}: {e}")
+
+    def _read_entry(self, key: str) -> Optional[Tuple[Dict[str, Any], List[List[Optional[str]]]]]:
+        """Kaydın meta verisini ve Arrow dosyasındaki sütunları oku"""
+        with self._lock:
+            entry = self._index["entries"].get(key)
+            if entry is None:
+                return None
+            data_path = self.directory / entry["file"]
+
+        with pa.OSFile(str(data_path), 'rb') as source:
+            table = pa_ipc.open_file(source).read_all()
+        columns = [column.to_pylist() for column in table.columns]
+
+        self._touch(entry)
+        return entry["meta"], columns
+
+    def _touch(self, entry: Dict[str, Any]) -> None:
+        """Kaydın son kullanım zamanını güncelle"""
+        with self._lock:
+            entry["last_access"] = time.time()
+            self._write_index()
+
+    def _write_entry(self, key: str, columns: List[List[Any]], meta: Dict[str, Any]) -> None:
+        """Sütunları ("key", ardından ek sütunlar) Arrow dosyasına yaz, indekse ekle ve sınırı aşan kayıtları sil"""
+        file_name = f"{key}.arrow"
+        data_path = self.directory / file_name
+
+        arrays = {}
+        for position, values in enumerate(columns):
+            values = [None if _is_missing(v) else (v if isinstance(v, str) else str(v)) for v in values]
+            arrays["key" if position == 0 else f"extra_{position}"] = pa.array(values, type=pa.string())
+        table = pa.table(arrays)
+        temp_path = data_path.with_suffix(".tmp")
+        with pa.OSFile(str(temp_path), 'wb') as sink:
+            with pa_ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(temp_path, data_path)
+        self._register_entry(key, file_name, meta)
+
+    def _register_entry(self, key: str, file_name: str, meta: Dict[str, Any]) -> None:
+        """Yazılan dosyayı indekse ekle ve sınırı aşan kayıtları sil"""
+        with self._lock:
+            self._index["entries"][key] = {
+                "file": file_name,
+                "size": (self.directory / file_name).stat().st_size,
+                "last_access": time.time(),
+                "meta": meta,
+            }
+            self._evict()
+            self._write_index()
+
+    def clear(self) -> None:
+        """Tüm önbelleği sil"""
+        if not self.enabled:
+            return
+        with self._lock:
+            for entry in self._index["entries"].values():
+                _remove_file(self.directory / entry["file"])
+            self._index = {"version": CACHE_FORMAT_VERSION, "entries": {}, "paths": {}}
+            self._write_index()
+
+    def _entry_key(self, file_path: str, signature: str) -> str:
+        """İçerik özeti + okuma ayarları imzası"""
+        file_hash = self._content_hash(file_path)
+        return hashlib.blake2b(f"{file_hash}:{signature}".encode('utf-8'), digest_size=16).hexdigest()
+
+    def _content_hash(self, file_path: str) -> str:
+        """Dosya içeriğinin özeti; yol/boyut/zaman değişmediyse kayıtlı özeti kullan"""
+        path = Path(file_path).resolve()
+        stat = path.stat()
+        path_key = str(path)
+
+        with self._lock:
+            known = self._index["paths"].get(path_key)
+        if known and known["size"] == stat.st_size and known["mtime_ns"] == stat.st_mtime_ns:
+            return known["hash"]
+
+        digest = content_hash(path)
+
+        with self._lock:
+            self._index["paths"][path_key] = {
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "hash": digest,
+            }
+        return digest
+
+    def _evict(self) -> None:
+        """Boyut sınırı aşıldıysa en uzun süredir kullanılmayan kayıtları sil"""
+        entries = self._index["entries"]
+        total = sum(entry["size"] for entry in entries.values())
+        for key, entry in sorted(entries.items(), key=lambda item: item[1]["last_access"]):
+            if total <= self.max_size_bytes:
+                break
+            _remove_file(self.directory / entry["file"])
+            total -= entry["size"]
+            del entries[key]
+            logging.info(f"Okuma önbelleğinden silindi: {entry['file']}")
+
+        # Artık var olmayan dosyaların yol kayıtlarını temizle
+        paths = self._index["paths"]
+        for path_key in [p for p in paths if not Path(p).exists()]:
+            del paths[path_key]
+
+    def _read_index(self) -> Dict[str, Any]:
+        """İndeks dosyasını oku; sürüm uyuşmuyorsa boş indeks döndür"""
+        index_path = self.directory / INDEX_FILE
+        empty = {"version": CACHE_FORMAT_VERSION, "entries": {}, "paths": {}}
+        if not index_path.exists():
+            return empty
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            if index.get("version") != CACHE_FORMAT_VERSION:
+                logging.info("Okuma önbelleği sürümü değişti, önbellek sıfırlanıyor")
+                for entry in index.get("entries", {}).values():
+                    _remove_file(self.directory / entry["file"])
+                return empty
+            return index
+        except (json.JSONDecodeError, OSError, KeyError) as e:
+            logging.warning(f"Okuma önbelleği indeksi okunamadı: {e}")
+            return empty
+
+    def _write_index(self) -> None:
+        """İndeksi atomik olarak yaz"""
+        index_path = self.directory / INDEX_FILE
+        temp_path = index_path.with_suffix(".tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._index, f, ensure_ascii=False, default=str)
+        os.replace(temp_path, index_path)
+
+
+def content_hash(file_path) -> str:
+    """Dosya içeriğinin blake2b özeti (yol ve zamandan bağımsız)"""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _is_missing(value: Any) -> bool:
+    """None veya NaN mı?"""
+    return value is None or (isinstance(value, float) and value != value)
+
+
+def _remove_file(path: Path) -> None:
+    """Dosyayı sessizce sil"""
+    try:
+        path.unlink()
+    except OSError:
+        pass
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Excel Karşılaştırma Uygulaması - Bölümlenmiş Diskte Karşılaştırma
+Belleğe sığmayan anahtar listelerini anahtar özetine göre bölümlere
+(bucket) ayırıp diske yazar; bölümler birbirinden bağımsız olarak,
+paralel süreçlerde karşılaştırılır.
+"""
+
+import logging
+import os
+import pickle
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from comparison import NameDiff
+
+# Constants
+DEFAULT_PARTITIONS = 64
+OLD_SIDE = "eski"
+NEW_SIDE = "yeni"
+
+PartitionResult = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, int]
+
+
+def partition_of(keys: np.ndarray, partitions: int) -> np.ndarray:
+    """Her anahtarın bölüm numarası (anahtarın 64 bit özetine göre)"""
+    return (pd.util.hash_array(keys, categorize=False) % np.uint64(partitions)).astype(np.int64)
+
+
+class PartitionedDiff:
+    """Diske bölümlenmiş iki yönlü karşılaştırma (hash join)
+
+    Her iki dosyanın (satır numarası, anahtar, yazılış) kayıtları anahtar
+    özetine göre bölüm dosyalarına eklenir; aynı anahtar iki tarafta da
+    aynı numaralı bölüme düşer. diff() her bölüm çiftini ayrı bir süreçte
+    factorize ile karşılaştırır, bu yüzden bir süreçteki en yüksek bellek
+    kullanımı bir bölüm kadardır. Eksik ve yeni adlar saklanan satır
+    numaralarına göre sıralanarak ilk görülme sırası korunur.
+    Anahtarlar metin veya (bileşik anahtarda) 64 bit tamsayı olabilir.
+    """
+
+    def __init__(self, partitions: int = DEFAULT_PARTITIONS, directory: Optional[str] = None,
+                 workers: Optional[int] = None):
+        self.partitions = max(int(partitions), 1)
+        self.workers = max(int(workers or os.cpu_count() or 1), 1)
+        self._directory = tempfile.mkdtemp(prefix="karsilastirma_bolum_", dir=directory)
+        self._files = {OLD_SIDE: [None] * self.partitions, NEW_SIDE: [None] * self.partitions}
+        self._row_counts = {OLD_SIDE: 0, NEW_SIDE: 0}
+        logging.info(f"Bölümlenmiş karşılaştırma: {self.partitions} bölüm, dizin {self._directory}")
+
+    @property
+    def old_count(self) -> int:
+        """Eski dosyadan eklenen satır sayısı"""
+        return self._row_counts[OLD_SIDE]
+
+    def add_old(self, names: pd.Series, keys: list) -> None:
+        """Eski dosyanın bir parçasını (yazılışlar ve aynı sıradaki anahtarlar) bölümlere yaz"""
+        self._add(OLD_SIDE, names, keys)
+
+    def add_new(self, names: pd.Series, keys: list) -> None:
+        """Yeni dosyanın bir parçasını bölümlere yaz"""
+        self._add(NEW_SIDE, names, keys)
+
+    def _add(self, side: str, names: pd.Series, keys: list) -> None:
+        """Parçayı bölüm numarasına göre sıralayıp her bölümün dosyasına ekle"""
+        if not len(keys):
+            return
+        keys = np.asarray(keys, dtype=np.int64 if isinstance(keys[0], (int, np.integer)) else object)
+        names = pd.Series(names).to_numpy(dtype=object)
+        start = self._row_counts[side]
+        positions = np.arange(start, start + len(keys), dtype=np.int64)
+        self._row_counts[side] += len(keys)
+
+        buckets = partition_of(keys, self.partitions)
+        order = np.argsort(buckets, kind='stable')
+        bounds = np.searchsorted(buckets[order], np.arange(self.partitions + 1))
+        for bucket in np.flatnonzero(np.diff(bounds)).tolist():
+            rows = order[bounds[bucket]:bounds[bucket + 1]]
+            pickle.dump((positions[rows], keys[rows], names[rows]), self._file(side, bucket),
+                        protocol=pickle.HIGHEST_PROTOCOL)
+
+    def _file(self, side: str, bucket: int):
+        """Bölüm dosyası (ilk yazmada açılır)"""
+        handle = self._files[side][bucket]
+        if handle is None:
+            handle = open(self._path(side, bucket), 'wb')
+            self._files[side][bucket] = handle
+        return handle
+
+    def _path(self, side: str, bucket: int) -> str:
+        return os.path.join(self._directory, f"{side}_{bucket:04d}.bin")
+
+    def diff(self) -> NameDiff:
+        """Bölümleri karşılaştır ve sonuçları satır sırasıyla birleştir
+
+        Süreç başlatılamazsa (kısıtlı ortam vb.) bölümler sırayla
+        karşılaştırılır.
+        """
+        self._close_files()
+        tasks = [
+            (self._existing_path(OLD_SIDE, bucket), self._existing_path(NEW_SIDE, bucket))
+            for bucket in range(self.partitions)
+        ]
+        tasks = [task for task in tasks if task != (None, None)]
+
+        results: List[PartitionResult] = []
+        workers = min(self.workers, len(tasks))
+        if workers > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    results = list(executor.map(_diff_partition, *zip(*tasks)))
+            except (OSError, RuntimeError, BrokenProcessPool) as e:
+                logging.warning(f"Paralel bölüm karşılaştırması başarısız, sırayla yapılıyor: {e}")
+                results = []
+        if not results:
+            results = [_diff_partition(old_path, new_path) for old_path, new_path in tasks]
+
+        return NameDiff(
+            removed=_in_row_order([(r[0], r[1]) for r in results]),
+            added=_in_row_order([(r[2], r[3]) for r in results]),
+            common_count=sum(r[4] for r in results),
+        )
+
+    def _existing_path(self, side: str, bucket: int) -> Optional[str]:
+        """Bölüme hiç kayıt yazılmadıysa None"""
+        return self._path(side, bucket) if self._files[side][bucket] is not None else None
+
+    def _close_files(self) -> None:
+        """Açık bölüm dosyalarını kapat (kayıtlar diskte kalır)"""
+        for handles in self._files.values():
+            for handle in handles:
+                if handle is not None and not handle.closed:
+                    handle.close()
+
+    def close(self) -> None:
+        """Bölüm dosyalarını ve geçici dizini sil"""
+        self._close_files()
+        shutil.rmtree(self._directory, ignore_errors=True)
+
+    def __enter__(self) -> 'PartitionedDiff':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+def _read_partition(path: Optional[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Bölüm dosyasındaki tüm parçalar: (satır numaraları, anahtarlar, yazılışlar)"""
+    chunks = []
+    if path is not None:
+        with open(path, 'rb') as f:
+            while True:
+                try:
+                    chunks.append(pickle.load(f))
+                except EOFError:
+                    break
+    if not chunks:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=object), np.empty(0, dtype=object)
+    return tuple(np.concatenate(parts) for parts in zip(*chunks))
+
+
+def _diff_partition(old_path: Optional[str], new_path: Optional[str]) -> PartitionResult:
+    """Tek bölümün karşılaştırması (süreçte çalışır)
+
+    Dönen değer: (eksiklerin satır numaraları ve yazılışları, yenilerin
+    satır numaraları ve yazılışları, ortak anahtar sayısı). Bölüm içinde
+    tekrarlanan yazılışların sadece ilk satırı döner.
+    """
+    old_positions, old_keys, old_names = _read_partition(old_path)
+    new_positions, new_keys, new_names = _read_partition(new_path)
+
+    codes, uniques = pd.factorize(np.concatenate([old_keys, new_keys]))
+    old_codes, new_codes = codes[:len(old_keys)], codes[len(old_keys):]
+    in_old = np.zeros(len(uniques), dtype=bool)
+    in_new = np.zeros(len(uniques), dtype=bool)
+    in_old[old_codes] = True
+    in_new[new_codes] = True
+
+    removed = _first_rows(old_positions, old_names, ~in_new[old_codes])
+    added = _first_rows(new_positions, new_names, ~in_old[new_codes])
+    return (*removed, *added, int(np.count_nonzero(in_old & in_new)))
+
+
+def _first_rows(positions: np.ndarray, names: np.ndarray, mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Maskedeki satırlardan her yazılışın en küçük satır numaralı olanı"""
+    positions, names = positions[mask], names[mask]
+    order = np.argsort(positions, kind='stable')
+    positions, names = positions[order], names[order]
+    first = ~pd.Series(names).duplicated().to_numpy()
+    return positions[first], names[first]
+
+
+def _in_row_order(parts: List[Tuple[np.ndarray, np.ndarray]]) -> List[str]:
+    """Bölümlerin sonuçlarını satır numarasına göre birleştir (tekrarsız, ilk görülme sırasıyla)"""
+    if not parts:
+        return []
+    positions = np.concatenate([part[0] for part in parts])
+    names = np.concatenate([part[1] for part in parts])
+    return pd.unique(pd.Series(names[np.argsort(positions, kind='stable')], dtype=object)).tolist()
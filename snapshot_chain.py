@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Excel Karşılaştırma Uygulaması - Günlük Seri (Snapshot) Karşılaştırması
+Bir klasördeki günlük ihracat dosyalarını araç bazında tarih sırasıyla
+karşılaştırır.
+Her günün anahtar listesi kalıcı bir SQLite deposunda tutulur; yeni bir
+gün eklendiğinde sadece o dosya okunur ve bir önceki günün kayıtlı
+anahtarlarıyla karşılaştırılır.
+"""
+
+import logging
+import re
+import sqlite3
+import time
+from datetime import date, datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from comparison import KeyValues, NameDiff, diff_names, iter_batches
+from excel_reader import SUPPORTED_EXTENSIONS
+from parse_cache import content_hash
+
+# Constants
+DEFAULT_SNAPSHOT_DB = "snapshots.db"
+CHURN_COLUMNS = ("Tarih", "Dosya", "Toplam", "Eksik", "Yeni", "Ortak", "Değişim (%)")
+SNAPSHOT_SCHEMA_VERSION = 1
+INSERT_BATCH_SIZE = 10_000
+
+# Dosya adındaki tarih: 2024-05-31, 2024_05_31, 20240531 veya 31.05.2024
+_ISO_DATE_PATTERN = re.compile(r'(?<!\d)(20\d{2})[-_.]?(\d{2})[-_.]?(\d{2})(?!\d)')
+_TURKISH_DATE_PATTERN = re.compile(r'(?<!\d)(\d{2})[-_.](\d{2})[-_.](20\d{2})(?!\d)')
+
+
+def snapshot_date(file_path: Path) -> date:
+    """Dosyanın günü: adındaki tarih, yoksa değişiklik zamanı"""
+    name = Path(file_path).stem
+    for pattern, order in ((_ISO_DATE_PATTERN, (0, 1, 2)), (_TURKISH_DATE_PATTERN, (2, 1, 0))):
+        for match in pattern.finditer(name):
+            year, month, day = (int(match.group(i + 1)) for i in order)
+            try:
+                return date(year, month, day)
+            except ValueError:
+                continue
+    return datetime.fromtimestamp(Path(file_path).stat().st_mtime).date()
+
+
+def export_files(folder: str) -> List[Path]:
+    """Klasördeki Excel dosyaları, güne ve ada göre sıralı (Excel'in '~$' kilit dosyaları hariç)"""
+    files = [
+        path for path in Path(folder).iterdir()
+        if path.is_file() and path.suffix.lower() in SUPPORTED_EXTENSIONS and not path.name.startswith('~$')
+    ]
+    return sorted(files, key=lambda path: (snapshot_date(path), path.name))
+
+
+def vehicle_chains(files: List[Path], vehicle_of: Callable[[Path], Optional[str]]) -> Dict[str, List[Path]]:
+    """Sıralı dosyaları araç bazında günlük serilere ayırır (araç -> dosyalar, sıra korunur)
+
+    Klasörde hiçbir dosyanın aracı bulunamazsa tüm dosyalar tek seri olarak
+    ('' anahtarıyla) döner. Başka araçların dosyaları varsa aracı
+    bulunamayan dosyalar hiçbir seriye eklenmez.
+    """
+    chains: Dict[str, List[Path]] = {}
+    unknown: List[Path] = []
+    for file_path in files:
+        vehicle = vehicle_of(file_path)
+        if vehicle is None:
+            unknown.append(file_path)
+        else:
+            chains.setdefault(vehicle, []).append(file_path)
+    if not chains:
+        return {"": unknown}
+    for file_path in unknown:
+        logging.warning(f"Günlük seri: aracı bulunamayan dosya atlandı {file_path}")
+    return chains
+
+
+class SnapshotStore:
+    """Günlük anahtar listelerinin ve günler arası değişim sayılarının kalıcı deposu
+
+    Her dosya yolu ve anahtar imzasıyla (okuma, normalleştirme ve anahtar
+    sütunu ayarları) bir kez kaydedilir. Aynı yol, boyut ve değişiklik
+    zamanı için içerik özeti yeniden hesaplanmaz; içeriği kayıtlı başka bir
+    dosyayla aynı olan dosyanın anahtarları Excel okunmadan kopyalanır. Metin
+    anahtarlar metin, bileşik (uint64) anahtarlar işaretli 64 bit tamsayı
+    olarak saklanır.
+    """
+
+    def __init__(self, path: str = DEFAULT_SNAPSHOT_DB):
+        self.path = str(path)
+        self._db = sqlite3.connect(self.path)
+        self._create_schema()
+
+    def _create_schema(self) -> None:
+        """Tabloları oluştur; şema sürümü değiştiyse depoyu sıfırla"""
+        version = self._db.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, SNAPSHOT_SCHEMA_VERSION):
+            logging.info("Günlük seri deposunun sürümü değişti, depo sıfırlanıyor")
+            for table in ('churn', 'snapshot_keys', 'snapshots'):
+                self._db.execute(f"DROP TABLE IF EXISTS {table}")
+
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS snapshots (
+                id INTEGER PRIMARY KEY,
+                file_path TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                content_hash TEXT NOT NULL,
+                signature TEXT NOT NULL,
+                snapshot_date TEXT NOT NULL,
+                row_count INTEGER NOT NULL,
+                key_type TEXT NOT NULL,
+                created REAL NOT NULL,
+                UNIQUE (file_path, signature)
+            );
+            CREATE INDEX IF NOT EXISTS snapshots_content ON snapshots (content_hash, signature);
+            CREATE TABLE IF NOT EXISTS snapshot_keys (
+                snapshot_id INTEGER NOT NULL,
+                position INTEGER NOT NULL,
+                key,
+                name TEXT NOT NULL,
+                PRIMARY KEY (snapshot_id, position)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS churn (
+                previous_id INTEGER NOT NULL,
+                snapshot_id INTEGER NOT NULL,
+                removed INTEGER NOT NULL,
+                added INTEGER NOT NULL,
+                common INTEGER NOT NULL,
+                PRIMARY KEY (previous_id, snapshot_id)
+            );
+        """)
+        self._db.execute(f"PRAGMA user_version = {SNAPSHOT_SCHEMA_VERSION}")
+        self._db.commit()
+
+    def find(self, file_path: Path, signature: str, day: date) -> Tuple[Optional[int], Optional[str]]:
+        """Dosyanın kayıtlı günü: (snapshot numarası veya None, hesaplandıysa içerik özeti)"""
+        path = Path(file_path).resolve()
+        stat = path.stat()
+        row = self._db.execute(
+            "SELECT id FROM snapshots WHERE file_path = ? AND size = ? AND mtime_ns = ? AND signature = ?",
+            (str(path), stat.st_size, stat.st_mtime_ns, signature)
+        ).fetchone()
+        if row is not None:
+            return row[0], None
+
+        digest = content_hash(path)
+        row = self._db.execute(
+            "SELECT id, file_path FROM snapshots WHERE content_hash = ? AND signature = ? ORDER BY file_path = ? DESC",
+            (digest, signature, str(path))
+        ).fetchone()
+        if row is None:
+            return None, digest
+
+        source_id, source_path = row
+        if source_path == str(path):
+            # Sadece değişiklik zamanı değişmiş: kaydı güncelle
+            self._db.execute("UPDATE snapshots SET size = ?, mtime_ns = ? WHERE id = ?",
+                             (stat.st_size, stat.st_mtime_ns, source_id))
+            self._db.commit()
+            return source_id, digest
+        return self._copy(source_id, path, signature, day, digest), digest
+
+    def add(self, file_path: Path, signature: str, day: date, names: pd.Series, keys: KeyValues,
+            digest: Optional[str] = None) -> int:
+        """Günün anahtarlarını kaydet; aynı yolun eski kaydı (dosya değiştiyse) silinir"""
+        path = Path(file_path).resolve()
+        digest = digest or content_hash(path)
+        composite = isinstance(keys, np.ndarray)
+        key_values = keys.view(np.int64).tolist() if composite else pd.Series(keys).tolist()
+
+        snapshot_id = self._insert(path, signature, day, digest, len(names), 'uint64' if composite else 'text')
+        rows = zip(range(len(names)), key_values, names.tolist())
+        for batch in iter_batches(rows, INSERT_BATCH_SIZE):
+            self._db.executemany("INSERT INTO snapshot_keys VALUES (?, ?, ?, ?)",
+                                 [(snapshot_id, position, key, name) for position, key, name in batch])
+        self._db.commit()
+        return snapshot_id
+
+    def _copy(self, source_id: int, path: Path, signature: str, day: date, digest: str) -> int:
+        """Aynı içerikli kayıtlı dosyanın anahtarlarını yeni yol için kopyala"""
+        row_count, key_type = self._db.execute(
+            "SELECT row_count, key_type FROM snapshots WHERE id = ?", (source_id,)
+        ).fetchone()
+        snapshot_id = self._insert(path, signature, day, digest, row_count, key_type)
+        self._db.execute(
+            "INSERT INTO snapshot_keys SELECT ?, position, key, name FROM snapshot_keys WHERE snapshot_id = ?",
+            (snapshot_id, source_id)
+        )
+        self._db.commit()
+        return snapshot_id
+
+    def _insert(self, path: Path, signature: str, day: date, digest: str, row_count: int, key_type: str) -> int:
+        """Gün kaydını ekle; aynı yolun eski kaydı (dosya değiştiyse) silinir"""
+        stat = path.stat()
+        for (old_id,) in self._db.execute(
+            "SELECT id FROM snapshots WHERE file_path = ? AND signature = ?", (str(path), signature)
+        ).fetchall():
+            self._delete(old_id)
+        cursor = self._db.execute(
+            "INSERT INTO snapshots (file_path, size, mtime_ns, content_hash, signature, snapshot_date, row_count, "
+            "key_type, created) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (str(path), stat.st_size, stat.st_mtime_ns, digest, signature, day.isoformat(), row_count,
+             key_type, time.time())
+        )
+        return cursor.lastrowid
+
+    def load(self, snapshot_id: int) -> Tuple[pd.Series, KeyValues]:
+        """Kayıtlı günün görüntülenen adları ve anahtarları (kaydedildiği sırayla)"""
+        key_type = self._db.execute("SELECT key_type FROM snapshots WHERE id = ?", (snapshot_id,)).fetchone()[0]
+        rows = self._db.execute(
+            "SELECT key, name FROM snapshot_keys WHERE snapshot_id = ? ORDER BY position", (snapshot_id,)
+        ).fetchall()
+        keys = [row[0] for row in rows]
+        names = pd.Series([row[1] for row in rows], dtype=object)
+        if key_type == 'uint64':
+            return names, np.asarray(keys, dtype=np.int64).view(np.uint64)
+        return names, pd.Series(keys, dtype=object)
+
+    def info(self, snapshot_id: int) -> Tuple[str, str, int]:
+        """(gün, dosya adı, satır sayısı)"""
+        day, file_path, row_count = self._db.execute(
+            "SELECT snapshot_date, file_path, row_count FROM snapshots WHERE id = ?", (snapshot_id,)
+        ).fetchone()
+        return day, Path(file_path).name, row_count
+
+    def churn(self, previous_id: int, snapshot_id: int) -> Optional[Tuple[int, int, int]]:
+        """Kayıtlı (eksik, yeni, ortak) sayıları"""
+        return self._db.execute(
+            "SELECT removed, added, common FROM churn WHERE previous_id = ? AND snapshot_id = ?",
+            (previous_id, snapshot_id)
+        ).fetchone()
+
+    def save_churn(self, previous_id: int, snapshot_id: int, diff: NameDiff) -> Tuple[int, int, int]:
+        """İki gün arasındaki değişim sayılarını kaydet"""
+        counts = (len(diff.removed), len(diff.added), diff.common_count)
+        self._db.execute("INSERT OR REPLACE INTO churn VALUES (?, ?, ?, ?, ?)", (previous_id, snapshot_id, *counts))
+        self._db.commit()
+        return counts
+
+    def _delete(self, snapshot_id: int) -> None:
+        """Günü, anahtarlarını ve değişim kayıtlarını sil"""
+        self._db.execute("DELETE FROM snapshot_keys WHERE snapshot_id = ?", (snapshot_id,))
+        self._db.execute("DELETE FROM churn WHERE previous_id = ? OR snapshot_id = ?", (snapshot_id, snapshot_id))
+        self._db.execute("DELETE FROM snapshots WHERE id = ?", (snapshot_id,))
+
+    def close(self) -> None:
+        """Veritabanını kapat"""
+        self._db.close()
+
+    def __enter__(self) -> 'SnapshotStore':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+def update_chain(files: List[Path], load: Callable[[Path], Tuple[pd.Series, KeyValues]],
+                 store: SnapshotStore, signature: str) -> Tuple[pd.DataFrame, Optional[NameDiff]]:
+    """Günlük seriyi güncelle ve günlük değişim tablosunu döndür
+
+    Depoda olmayan dosyalar load ile okunup kaydedilir; kayıtlı günler hiç
+    okunmaz. Kayıtlı olmayan ardışık gün çiftleri depodaki anahtarlarla
+    karşılaştırılır. Okunamayan dosyalar uyarıyla atlanır. İkinci dönen
+    değer son iki günün karşılaştırmasıdır (en az iki gün yoksa None).
+    """
+    rows = []
+    previous_id: Optional[int] = None
+    last_pair: Optional[Tuple[int, int]] = None
+    for file_path in files:
+        day = snapshot_date(file_path)
+        snapshot_id, digest = store.find(file_path, signature, day)
+        if snapshot_id is None:
+            try:
+                names, keys = load(file_path)
+            except (ValueError, OSError) as e:
+                logging.warning(f"Günlük seri: dosya atlandı {file_path}: {e}")
+                continue
+            snapshot_id = store.add(file_path, signature, day, names, keys, digest)
+            logging.info(f"Günlük seri: yeni gün kaydedildi ({len(names)} ad) - {file_path}")
+
+        stored_day, file_name, total = store.info(snapshot_id)
+        counts: Tuple[Optional[int], ...] = (None, None, None)
+        change = None
+        if previous_id is not None:
+            counts = store.churn(previous_id, snapshot_id)
+            if counts is None:
+                counts = store.save_churn(previous_id, snapshot_id, _diff_snapshots(store, previous_id, snapshot_id))
+            previous_total = store.info(previous_id)[2]
+            change = round((counts[0] + counts[1]) * 100 / previous_total, 1) if previous_total else None
+            last_pair = (previous_id, snapshot_id)
+        rows.append((stored_day, file_name, total, *counts, change))
+        previous_id = snapshot_id
+
+    churn = pd.DataFrame(rows, columns=list(CHURN_COLUMNS))
+    last_diff = _diff_snapshots(store, *last_pair) if last_pair else None
+    return churn, last_diff
+
+
+def _diff_snapshots(store: SnapshotStore, previous_id: int, snapshot_id: int) -> NameDiff:
+    """İki kayıtlı günü anahtarlarıyla karşılaştır (Excel okunmaz)"""
+    old_names, old_keys = store.load(previous_id)
+    new_names, new_keys = store.load(snapshot_id)
+    return diff_names(old_names, new_names, old_keys=old_keys, new_keys=new_keys)
+
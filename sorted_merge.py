@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Excel Karşılaştırma Uygulaması - Sıralı Birleştirme (Merge) Karşılaştırması
+ERP'den 'Cari Ünvan'a göre sıralı gelen dosyaları küme kurmadan, iki satır
+akışını aynı anda ilerleterek karşılaştırır. Sıra bozuksa UnsortedInputError
+verilir; çağıran taraf özet (hash) tabanlı karşılaştırmaya döner.
+"""
+
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Constants
+SORT_SAMPLE_ROWS = 10_000  # ön kontrolde sırası denetlenen ilk satırlar
+REMOVED_SIDE = "eksik"
+ADDED_SIDE = "yeni"
+
+# Türk alfabesi sırası: Ç, Ğ, İ, Ö, Ş, Ü kod noktası sırasında Z'den sonra gelir,
+# ERP sıralamasında ise C, G, I, O, S, U'nun hemen arkasındadır. Harfler bu
+# sırayla özel kullanım alanındaki karakterlere çevrilir (rakam ve boşluklar harflerden önce kalır).
+TURKISH_ALPHABET = "ABCÇDEFGĞHIİJKLMNOÖPQRSŞTUÜVWXYZ"
+COLLATION_TABLE = {ord(char): chr(0xE000 + index) for index, char in enumerate(TURKISH_ALPHABET)}
+
+
+class UnsortedInputError(ValueError):
+    """Dosya satırları karşılaştırma anahtarına göre sıralı değil"""
+
+
+def collation_keys(keys: Iterable[str]) -> List[str]:
+    """Normalleştirilmiş anahtarların Türk alfabesi sırasıyla karşılaştırılabilen biçimi"""
+    return [key.translate(COLLATION_TABLE) for key in keys]
+
+
+def is_sorted(keys: List[str]) -> bool:
+    """Anahtarlar azalmayan sırada mı? (eşit anahtarlar art arda olabilir)"""
+    if len(keys) < 2:
+        return True
+    values = np.asarray(keys, dtype=object)
+    return bool(np.all(values[:-1] <= values[1:]))
+
+
+class SortedMergeDiff:
+    """Sıralı iki (sıralama anahtarı, yazılış) akışının birleştirmeli karşılaştırması
+
+    Yineleme (REMOVED_SIDE veya ADDED_SIDE, yazılış) çiftleri verir; sonuçlar
+    bulundukça tüketilebilir. Bellekte sadece o anki anahtar grubunun
+    yazılışları tutulur: aynı anahtar sıralı akışta art arda geldiği için
+    tekrarsızlık grup içinde sağlanır. Her akış okunurken de sıra denetlenir;
+    önceki anahtardan küçük bir anahtar gelirse UnsortedInputError verilir.
+    Yineleme bitince old_count ve common_count (ortak tekrarsız anahtar
+    sayısı) hazırdır.
+    """
+
+    def __init__(self, old_rows: Iterable[Tuple[str, str]], new_rows: Iterable[Tuple[str, str]]):
+        self._old_rows = old_rows
+        self._new_rows = new_rows
+        self.old_count = 0
+        self.common_count = 0
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        old = _Cursor(self._old_rows, "Eski")
+        new = _Cursor(self._new_rows, "Yeni")
+        while old.row is not None or new.row is not None:
+            if new.row is None or (old.row is not None and old.row[0] < new.row[0]):
+                for name in old.take_group():
+                    yield REMOVED_SIDE, name
+            elif old.row is None or new.row[0] < old.row[0]:
+                for name in new.take_group():
+                    yield ADDED_SIDE, name
+            else:
+                self.common_count += 1
+                old.take_group()
+                new.take_group()
+        self.old_count = old.count
+
+
+class _Cursor:
+    """Sıralı akışta bir satır ileriyi gösteren okuyucu (sırayı denetler)"""
+
+    def __init__(self, rows: Iterable[Tuple[str, str]], label: str):
+        self._rows = iter(rows)
+        self._label = label
+        self.count = 0
+        self.row: Optional[Tuple[str, str]] = None
+        self._advance()
+
+    def _advance(self) -> None:
+        previous = self.row
+        self.row = next(self._rows, None)
+        if self.row is None:
+            return
+        self.count += 1
+        if previous is not None and self.row[0] < previous[0]:
+            raise UnsortedInputError(
+                f"{self._label} dosya {self.count}. satırda sıralı değil: '{self.row[1]}' < '{previous[1]}'"
+            )
+
+    def take_group(self) -> List[str]:
+        """Aynı anahtarlı art arda satırların tekrarsız yazılışları (akış grubun sonrasına ilerler)"""
+        return list(dict.fromkeys(self._group_names(self.row[0])))
+
+    def _group_names(self, key: str) -> Iterator[str]:
+        while self.row is not None and self.row[0] == key:
+            yield self.row[1]
+            self._advance()
+
+
+def sorted_rows(batches: Iterable[Tuple[pd.Series, List[str]]]) -> Iterator[Tuple[str, str]]:
+    """(yazılışlar, normalleştirilmiş anahtarlar) parçalarından (sıralama anahtarı, yazılış) satırları
+
+    İlk parçanın ilk SORT_SAMPLE_ROWS satırı önceden denetlenir; sıralı
+    değilse daha hiçbir sonuç üretilmeden UnsortedInputError verilir.
+    """
+    checked = False
+    for names, keys in batches:
+        keys = collation_keys(keys)
+        if not checked:
+            if not is_sorted(keys[:SORT_SAMPLE_ROWS]):
+                raise UnsortedInputError("Dosyanın ilk satırları sıralı değil")
+            checked = True
+        yield from zip(keys, names.tolist())
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Excel Karşılaştırma Uygulaması - Test Yardımcıları
+ERP dosyası düzeninde (rapor başlığı, depo kartı, boş satır, başlık satırı)
+Excel dosyası yazan ve geçici klasörde çalışan bir motor veren fixture'lar.
+"""
+
+from typing import List, Optional
+
+import pandas as pd
+import pytest
+
+from engine import ComparisonEngine
+
+
+@pytest.fixture
+def write_export(tmp_path):
+    """write_export(ad, ünvanlar, kodlar=None) -> dosya yolu"""
+    def write(file_name: str, names: List[Optional[str]], codes: Optional[List[str]] = None,
+              depot: str = "[120.01] İZMİR ARAÇ 01") -> str:
+        rows = [["Rapor: Cari Liste", None], [f"Cari Kategori 3 : {depot}", None], [None, None],
+                ["Cari Kodu", "Cari Ünvan"]]
+        codes = codes or [f"C{number}" for number in range(len(names))]
+        rows.extend([code, name] for code, name in zip(codes, names))
+        path = tmp_path / file_name
+        pd.DataFrame(rows).to_excel(path, header=False, index=False)
+        return str(path)
+    return write
+
+
+@pytest.fixture
+def make_engine(tmp_path, monkeypatch):
+    """make_engine(anahtar sütunları=None): geçici klasörde (config dosyası olmadan) çalışan, kalıcı önbelleği kapalı motor"""
+    monkeypatch.chdir(tmp_path)
+
+    def make(key_columns: Optional[str] = None) -> ComparisonEngine:
+        comparison_engine = ComparisonEngine(key_columns)
+        comparison_engine.workbook_cache.parse_cache = None
+        comparison_engine.spill_directory = str(tmp_path)
+        return comparison_engine
+    return make
+
+
+@pytest.fixture
+def engine(make_engine):
+    return make_engine()
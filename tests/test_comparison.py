@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+İki yönlü karşılaştırma (diff_names) testleri: eksik, yeni ve ortak
+cariler tek geçişte, ilk görülme sırasıyla ve orijinal yazılışlarıyla.
+"""
+
+import numpy as np
+import pandas as pd
+
+from comparison import clean_names, diff_names, missing_names
+
+OLD = ["İzmir Gıda Ltd. Şti.", "ışık market", None, "Öz Uğur", "ışık market", "", "Kaya İnşaat", "  ", "Irmak"]
+NEW = ["izmir gıda limited şirketi", "Yılmaz Bakkal", "IŞIK MARKET", float("nan"), "Yılmaz Bakkal", "irmak"]
+
+
+def test_removed_added_and_common_in_one_pass():
+    diff = diff_names(clean_names(OLD), clean_names(NEW))
+
+    assert diff.removed == ["Öz Uğur", "Kaya İnşaat", "Irmak"]  # 'Irmak' ile 'irmak' farklı harfle başlar
+    assert diff.added == ["Yılmaz Bakkal", "irmak"]
+    assert diff.common == ["İzmir Gıda Ltd. Şti.", "ışık market"]  # eski dosyadaki yazılışlar
+    assert diff.common_count == 2
+
+
+def test_removed_side_agrees_with_one_way_comparison():
+    old, new = clean_names(OLD), clean_names(NEW)
+    assert diff_names(old, new).removed == missing_names(old, new)
+    assert diff_names(new, old).removed == diff_names(old, new).added
+
+
+def test_blank_cells_are_dropped_before_comparison():
+    assert clean_names(OLD).tolist() == [
+        "İzmir Gıda Ltd. Şti.", "ışık market", "Öz Uğur", "ışık market", "Kaya İnşaat", "Irmak"
+    ]
+    assert clean_names(pd.Series([12.0, " 7 ", None])).tolist() == ["12.0", "7"]
+
+
+def test_precomputed_integer_keys():
+    names = pd.Series(["a", "b", "c"])
+    diff = diff_names(names, pd.Series(["B", "d"]), old_keys=np.array([1, 2, 3], dtype=np.uint64),
+                      new_keys=np.array([2, 4], dtype=np.uint64))
+    assert (diff.removed, diff.added, diff.common) == (["a", "c"], ["d"], ["b"])
+
+
+def test_engine_lists_both_directions(engine, write_export):
+    result = engine.run(write_export("eski.xlsx", OLD), write_export("yeni.xlsx", NEW))
+
+    assert result.method == "in_memory"
+    assert (result.removed_count, result.added_count, result.common_count) == (3, 2, 2)
+    assert result.has_differences
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Bileşik anahtar (Cari Kodu + Cari Ünvan) testleri: hücrelerin metne
+çevrilmesi, 64 bit özetlerin birleştirilmesi ve dosya karşılaştırması.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from comparison import combine_hashes, composite_display, composite_keys, key_text, parse_key_columns
+from normalization import NameNormalizer
+
+
+def test_key_text_is_engine_independent():
+    cells = pd.Series([120.0, "120", 120, " 120 ", None, float("nan"), 1.5, "C-7"], dtype=object)
+    assert key_text(cells).tolist() == ["120", "120", "120", "120", "", "", "1.5", "C-7"]
+    assert key_text(pd.Series(["120.0", True], dtype=object)).tolist() == ["120.0", "True"]  # metinler aynen kalır
+    assert key_text(pd.Series([120.0, None, 1.5])).tolist() == ["120", "", "1.5"]  # boş hücreyle float'a dönmüş sütun
+
+
+def test_parse_key_columns():
+    assert parse_key_columns("Cari Kodu + Cari Ünvan") == ("Cari Kodu", "Cari Ünvan")
+    assert parse_key_columns("") == ()
+
+
+def test_codes_separate_customers_with_the_same_name():
+    normalizer = NameNormalizer()
+    names = normalizer.normalize(pd.Series(["Işık Market", "IŞIK MARKET", "Işık Market"]))
+    keys = composite_keys(names, {"Cari Kodu": pd.Series(["c1", "C1", "C2"])}, normalizer)
+
+    assert keys.dtype == np.uint64
+    assert keys[0] == keys[1]  # kod büyük/küçük harf duyarsız, ünvan normalleştirilmiş
+    assert keys[0] != keys[2]
+
+
+def test_column_order_matters_and_a_column_is_required():
+    first, second = np.array([1, 2], dtype=np.uint64), np.array([3, 4], dtype=np.uint64)
+    assert (combine_hashes([first, second]) != combine_hashes([second, first])).all()
+    with pytest.raises(ValueError):
+        composite_keys(None, {})
+
+
+def test_display_shows_the_code():
+    shown = composite_display(pd.Series(["Işık", "Öz"]), {"Cari Kodu": pd.Series([120.0, None])})
+    assert shown.tolist() == ["Işık [120]", "Öz []"]
+
+
+@pytest.mark.parametrize("threshold_mb", [100, 0])
+def test_changed_code_is_reported_as_removed_and_added(make_engine, write_export, threshold_mb):
+    old = write_export("eski.xlsx", ["Işık Market", "İzmir Gıda", "Öz Uğur"], codes=["C1", "C2", "C3"])
+    new = write_export("yeni.xlsx", ["IŞIK MARKET", "İzmir Gıda", "Öz Uğur"], codes=["c1", "C9", "C3"])
+    engine = make_engine("Cari Kodu + Cari Ünvan")
+    engine.large_file_threshold_mb = threshold_mb
+
+    result = engine.run(old, new)
+    assert result.method == ("streaming" if threshold_mb == 0 else "in_memory")
+    assert result.diff.removed == ["İzmir Gıda [C2]"]
+    assert result.diff.added == ["İzmir Gıda [C9]"]
+    assert result.common_count == 2
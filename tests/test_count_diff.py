@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Satır sayısı karşılaştırması (count_diff) testleri: cari başına adet
+farkları, ilk görülme sırası ve ilk yazılış.
+"""
+
+import numpy as np
+import pandas as pd
+
+from comparison import COUNT_COLUMNS, count_diff
+
+
+def test_only_changed_counts_in_first_seen_order():
+    table = count_diff(["Öz Uğur", "ışık market", "Öz Uğur", "Kaya", "Irmak"],
+                       ["IŞIK MARKET", "Irmak", "ışık market", "Dilek", "Dilek"])
+
+    assert list(table.columns) == list(COUNT_COLUMNS)
+    assert table.values.tolist() == [
+        ["Öz Uğur", 2, 0, -2],
+        ["ışık market", 1, 2, 1],  # eski dosyadaki ilk yazılış
+        ["Kaya", 1, 0, -1],
+        ["Dilek", 0, 2, 2],
+    ]
+
+
+def test_first_row_of_each_key_is_used():
+    old_keys = np.array([7, 3, 7, 3, 9], dtype=np.uint64)
+    new_keys = np.array([5, 9, 5], dtype=np.uint64)
+    table = count_diff(pd.Series(["a1", "b1", "a2", "b2", "c1"]), pd.Series(["d1", "c2", "d2"]),
+                       old_keys=old_keys, new_keys=new_keys)
+    assert table[COUNT_COLUMNS[0]].tolist() == ["a1", "b1", "d1"]
+
+
+def test_no_rows():
+    assert count_diff([], []).empty
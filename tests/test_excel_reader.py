@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Bir kez okunan çalışma kitabı (LoadedWorkbook) testleri: tam veri bellekteyken
+anahtar verisinin bir kez hesaplanması.
+"""
+
+from excel_reader import LoadedWorkbook
+
+
+def test_key_data_is_computed_once_for_in_memory_workbooks(write_export, monkeypatch):
+    path = write_export("eski.xlsx", ["Işık Market", "Öz Uğur"], codes=["C1", "C2"])
+    workbook = LoadedWorkbook(path, extra_columns=("Cari Kodu", "Vergi No"))
+    assert workbook.raw is not None
+
+    frames = []
+    original_frame = workbook.frame
+    monkeypatch.setattr(workbook, "frame", lambda header_row: frames.append(header_row) or original_frame(header_row))
+
+    assert workbook.missing_columns == ["Vergi No"]
+    assert workbook.missing_columns == ["Vergi No"]
+    assert workbook.names().tolist() == ["Işık Market", "Öz Uğur"]
+    assert workbook.key_data() is workbook.key_data()
+    assert frames == [3]  # başlık satırı, tek okuma
+
+    workbook.compact()
+    assert workbook.raw is None
+    assert workbook.key_data()["extra_values"] == {"Cari Kodu": ["C1", "C2"]}
+    assert workbook.missing_columns == ["Vergi No"]
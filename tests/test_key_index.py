@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Anahtar indeksi (KeyIndex) testleri: tekrarlı anahtarlar, özet çakışması,
+Bloom filtresinin yanlış pozitifleri, .npz kaydı ve akış modunda kullanımı.
+"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import key_index
+from comparison import diff_names
+from key_index import KeyIndexBuilder, load_key_index
+from normalization import NameNormalizer
+
+
+def _index(keys, values=None, bloom_bits=None):
+    builder = KeyIndexBuilder()
+    builder.add(keys, values if values is not None else [f"ad {key}" for key in keys])
+    index = builder.build()
+    if bloom_bits is not None:
+        index.add_bloom_filter(bloom_bits)
+    return index
+
+
+def test_duplicate_keys_keep_first_value_in_first_seen_order():
+    index = _index(["İZMİR GIDA", "IŞIK", "İZMİR GIDA", "ÇİĞDEM"], ["İzmir Gıda", "Işık", "İZMİR GIDA", "Çiğdem"])
+
+    assert len(index) == 3
+    assert index.mark_many(["IŞIK", "IŞIK", "YOK"]).tolist() == [True, True, False]
+    assert index.matched_count() == 1
+    assert index.unmatched_values() == ["İzmir Gıda", "Çiğdem"]
+
+
+def test_hash_collisions_are_resolved_by_text(monkeypatch):
+    """Tüm anahtarlar aynı özeti alsa da metin doğrulaması doğru kaydı bulur"""
+    monkeypatch.setattr(key_index, "key_hashes", lambda keys: np.zeros(len(keys), dtype=np.uint64))
+    index = _index(["A", "B", "C", "B"])
+
+    assert len(index) == 3
+    assert index.lookup(["C", "A", "D", "B"]).tolist() == [2, 0, -1, 1]
+
+
+def test_bloom_false_positives_fall_through_to_binary_search():
+    keys = [f"CARİ {number}" for number in range(500)]
+    absent = [f"YOK {number}" for number in range(500)]
+    index = _index(keys, bloom_bits=0.1)  # çok küçük filtre: yanlış pozitif kaçınılmaz
+
+    assert index.has_bloom_filter
+    assert index._bloom_contains(key_index.key_hashes(np.asarray(absent, dtype=object))).any()
+    assert not index.contains_many(absent).any()
+    assert index.contains_many(keys).all()
+
+
+def test_integer_keys_skip_text_verification():
+    index = _index([5, -3, 5, 2**62], ["beş", "eksi üç", "BEŞ", "büyük"])
+
+    assert index.contains_many([2**62, 7, -3]).tolist() == [True, False, True]
+    assert index.mark_many([5, 2**62]).tolist() == [True, True]
+    assert index.unmatched_values() == ["eksi üç"]
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = str(tmp_path / "index.npz")
+    index = _index(["İ", "I", "ı"], bloom_bits=10)
+    index.save(path)
+
+    loaded = load_key_index(path)
+    assert loaded.has_bloom_filter
+    assert loaded.contains_many(["I", "i", "İ"]).tolist() == [True, False, True]
+
+    with np.load(path) as data:
+        arrays = dict(data)
+    arrays["version"] = np.array([key_index.KEY_INDEX_VERSION + 1, 0])
+    np.savez(path, **arrays)
+    with pytest.raises(ValueError):
+        load_key_index(path)
+
+
+@pytest.mark.parametrize("bloom", [False, True])
+def test_streaming_with_index_matches_key_map(engine, write_export, bloom):
+    old = write_export("eski.xlsx", ["Işık Market", "İzmir Gıda", None, "Öz Uğur", "Işık Market", "Kaya"])
+    new = write_export("yeni.xlsx", ["IŞIK MARKET", "", "Yılmaz Bakkal", "izmir gıda", "Yılmaz Bakkal"])
+    engine.large_file_threshold_mb = 0
+    expected = engine.run(old, new).diff
+
+    engine.compact_key_index = True
+    engine.bloom_filter = bloom
+    result = engine.run(old, new)
+    assert result.method == "streaming"
+    assert (result.diff.removed, result.diff.added, result.common_count) == \
+        (expected.removed, expected.added, expected.common_count) == (["Öz Uğur", "Kaya"], ["Yılmaz Bakkal"], 2)
+
+
+def test_index_over_memory_budget_warns(engine, write_export, caplog):
+    old = write_export("eski.xlsx", ["A", "B"])
+    new = write_export("yeni.xlsx", ["B", "C"])
+    engine.large_file_threshold_mb = 0
+    engine.compact_key_index = True
+    engine.memory_budget_mb = 1e-9
+
+    with caplog.at_level(logging.WARNING):
+        engine.run(old, new)
+    assert "bellek bütçesini aşıyor" in caplog.text
+
+
+def test_index_matches_in_memory_diff_on_turkish_names():
+    old = pd.Series(["Işık", "ışık", "İnci", "Irmak", "Öz"])
+    new = pd.Series(["IŞIK", "inci", "irmak", "Şahin"])
+    normalizer = NameNormalizer()
+    index = _index(normalizer.normalize(new).tolist(), new.tolist())
+    found = index.mark_many(normalizer.normalize(old).tolist())
+
+    expected = diff_names(old, new, normalizer)
+    assert pd.unique(old[~found]).tolist() == expected.removed == ["Irmak", "Öz"]
+    assert index.unmatched_values() == expected.added == ["irmak", "Şahin"]
+    assert index.matched_count() == 2
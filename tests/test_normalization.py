@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Ad normalleştirme testleri: Türkçe büyük harf dönüşümü, noktalama ve
+boşluk temizliği, sadece ad sonundaki şirket türü eklerinin kanonik yazılışı.
+"""
+
+import pandas as pd
+import pytest
+
+import normalization
+from normalization import NameNormalizer
+
+
+def _normalize(*names, **options):
+    return NameNormalizer(**options).normalize(pd.Series(names)).tolist()
+
+
+@pytest.fixture(params=["default", "object"])
+def string_dtype(request, monkeypatch):
+    """Aynı sonuç pyarrow ile ve pyarrow olmadan (Python re) alınmalı"""
+    if request.param == "object":
+        monkeypatch.setattr(normalization, "STRING_DTYPE", object)
+
+
+def test_turkish_case_folding(string_dtype):
+    assert _normalize("istanbul", "İSTANBUL", "ısparta", "ISPARTA", "Irmak", "irmak") == \
+        ["İSTANBUL", "İSTANBUL", "ISPARTA", "ISPARTA", "IRMAK", "İRMAK"]
+    assert _normalize("istanbul", case_sensitive=True) == ["istanbul"]
+
+
+def test_punctuation_and_whitespace(string_dtype):
+    assert _normalize("  Öz-Uğur,  Gıda.  ", "ÖZ UĞUR GIDA") == ["ÖZ UĞUR GIDA", "ÖZ UĞUR GIDA"]
+    assert _normalize("ＡＢＣ Gıda") == ["ABC GIDA"]  # NFKC: tam genişlik harfler
+
+
+def test_trailing_legal_suffixes_are_canonical(string_dtype):
+    assert len(set(_normalize("İzmir Gıda Ltd. Şti.", "izmir gıda limited şirketi", "İZMİR GIDA LTD. STİ"))) == 1
+    assert _normalize("Isparta Un A.Ş.", "ısparta un anonim şirketi", "Isparta Un A S") == ["ISPARTA UN AŞ"] * 3
+    assert _normalize("Öz Ticaret Sanayi Limited Şirketi") == ["ÖZ TİC SAN LTD ŞTİ"]
+
+
+def test_leading_and_middle_suffix_words_are_unchanged(string_dtype):
+    assert _normalize("AS YAPI MALZEME", "AŞ YAPI MALZEME", "A S K GIDA", "ST İNŞAAT", "YAPI AS MALZEME",
+                      "TİC MERKEZİ GIDA") == \
+        ["AS YAPI MALZEME", "AŞ YAPI MALZEME", "A S K GIDA", "ST İNŞAAT", "YAPI AS MALZEME", "TİC MERKEZİ GIDA"]
+    assert _normalize("AS") == ["AS"]  # ad sadece ekten oluşuyorsa değişmez
+
+
+def test_signature_changes_with_options():
+    assert NameNormalizer().signature() != NameNormalizer(canonical_suffixes=False).signature()
+    assert NameNormalizer().signature().startswith(f"v{normalization.NORMALIZATION_VERSION}|")
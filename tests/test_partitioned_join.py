@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Bölümlenmiş diskte karşılaştırma (PartitionedDiff) testleri: bölüm
+numaraları, bölüm dosyaları, satır sırası ve dosya karşılaştırması.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from comparison import diff_names
+from normalization import NameNormalizer
+from partitioned_join import PartitionedDiff, partition_of
+
+OLD = pd.Series(["Işık Market", "İzmir Gıda", "Öz Uğur", "Işık Market", "Kaya", "Çiğdem", "Irmak"] * 3)
+NEW = pd.Series(["IŞIK MARKET", "Dilek", "izmir gıda", "Dilek", "Çiğdem", "irmak"] * 3)
+
+
+def _keys(names: pd.Series) -> list:
+    return NameNormalizer().normalize(names).tolist()
+
+
+@pytest.mark.parametrize("partitions", [1, 3, 64])
+def test_partition_numbers_are_in_range_and_stable(partitions):
+    keys = np.asarray(_keys(OLD) + _keys(NEW), dtype=object)
+    buckets = partition_of(keys, partitions)
+
+    assert buckets.min() >= 0 and buckets.max() < partitions
+    assert (buckets == partition_of(keys.copy(), partitions)).all()
+    if partitions > 1:
+        assert len(set(buckets.tolist())) > 1  # anahtarlar bölümlere dağılır
+
+
+def _buckets(names: pd.Series, partitions: int) -> set:
+    return set(partition_of(np.asarray(_keys(names), dtype=object), partitions).tolist())
+
+
+@pytest.mark.parametrize("partitions", [1, 4, 64])
+def test_bucket_files_and_row_order(tmp_path, partitions):
+    with PartitionedDiff(partitions=partitions, directory=str(tmp_path), workers=1) as join:
+        for start in range(0, len(OLD), 5):  # parça parça eklenir
+            join.add_old(OLD[start:start + 5], _keys(OLD[start:start + 5]))
+        join.add_new(NEW, _keys(NEW))
+        directory = join._directory
+        diff = join.diff()
+
+        # Her taraf için sadece kayıt düşen bölümlerin dosyası açılır
+        files = os.listdir(directory)
+        assert sorted(files) == sorted([f"eski_{bucket:04d}.bin" for bucket in _buckets(OLD, partitions)]
+                                       + [f"yeni_{bucket:04d}.bin" for bucket in _buckets(NEW, partitions)])
+        assert join.old_count == len(OLD)
+    assert not os.path.exists(directory)
+
+    expected = diff_names(OLD, NEW)
+    assert diff.removed == expected.removed  # satır numarasıyla ilk görülme sırası korunur
+    assert diff.added == expected.added
+    assert diff.common_count == expected.common_count
+
+
+def test_integer_keys(tmp_path):
+    with PartitionedDiff(partitions=8, directory=str(tmp_path), workers=1) as join:
+        join.add_old(pd.Series(["a", "b", "c"]), [-1, 2**62, 5])
+        join.add_new(pd.Series(["B", "d"]), [2**62, 9])
+        diff = join.diff()
+    assert (diff.removed, diff.added, diff.common_count) == (["a", "c"], ["d"], 1)
+
+
+def test_engine_partitioned_join(engine, write_export):
+    old = write_export("eski.xlsx", OLD.tolist())
+    new = write_export("yeni.xlsx", NEW.tolist())
+    expected = engine.run(old, new)
+
+    engine.large_file_threshold_mb = 0
+    engine.partitioned_join = True
+    engine.partition_count = 4
+    engine.partition_workers = 1
+    result = engine.run(old, new)
+    assert result.method == "partitioned"
+    assert (result.diff.removed, result.diff.added, result.common_count) == \
+        (expected.diff.removed, expected.diff.added, expected.common_count)
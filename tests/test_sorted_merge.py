@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Sıralı birleştirme (SortedMergeDiff) testleri: Türk alfabesi sırası,
+sıra denetimi ve sıralı olmayan dosyalarda diğer yönteme geçiş.
+"""
+
+import logging
+
+import pandas as pd
+import pytest
+
+from normalization import NameNormalizer
+from sorted_merge import (
+    ADDED_SIDE, REMOVED_SIDE, SortedMergeDiff, UnsortedInputError, collation_keys, is_sorted, sorted_rows
+)
+
+# ERP sırası: C < Ç < D, G < Ğ < H, I < İ < J, O < Ö < P, S < Ş < T, U < Ü < V
+OLD_SORTED = ["CAN", "ÇAĞ", "ÇAĞ", "DENİZ", "IRMAK", "İNCİ", "ÖZ", "ŞAHİN", "ÜMİT"]
+NEW_SORTED = ["ÇAĞ", "GÜL", "ĞÜNEŞ", "IRMAK", "IŞIK", "İNCİ", "İNCİ", "ÜMİT", "ZEHRA"]
+
+
+def _rows(names):
+    names = pd.Series(names)
+    return sorted_rows([(names, NameNormalizer().normalize(names).tolist())])
+
+
+def test_turkish_collation_order():
+    assert sorted(["ZEHRA", "ÇAĞ", "CAN", "DENİZ", "İNCİ", "IRMAK", "JALE"], key=lambda key: collation_keys([key])[0]) \
+        == ["CAN", "ÇAĞ", "DENİZ", "IRMAK", "İNCİ", "JALE", "ZEHRA"]
+    assert is_sorted(collation_keys(OLD_SORTED)) and is_sorted(collation_keys(NEW_SORTED))
+    assert not is_sorted(OLD_SORTED)  # kod noktası sırasında Türkçe harfler Z'den sonra gelir
+
+
+def test_merge_emits_each_side_once_per_key():
+    merge = SortedMergeDiff(_rows(OLD_SORTED), _rows(NEW_SORTED))
+    results = list(merge)
+
+    assert [name for side, name in results if side == REMOVED_SIDE] == ["CAN", "DENİZ", "ÖZ", "ŞAHİN"]
+    assert [name for side, name in results if side == ADDED_SIDE] == ["GÜL", "ĞÜNEŞ", "IŞIK", "ZEHRA"]
+    assert merge.common_count == 4  # ÇAĞ, IRMAK, İNCİ, ÜMİT
+    assert merge.old_count == len(OLD_SORTED)
+
+
+def test_unsorted_start_fails_before_any_result():
+    rows = _rows(["ZEHRA", "CAN"])
+    with pytest.raises(UnsortedInputError):
+        next(rows)
+
+
+def test_unsorted_row_later_in_the_stream_is_detected():
+    old = [(key, key) for key in collation_keys(["CAN", "DENİZ", "ÇAĞ"])]
+    new = [(key, key) for key in collation_keys(["ZEHRA"])]
+    with pytest.raises(UnsortedInputError, match="3. satırda"):
+        list(SortedMergeDiff(old, new))
+
+
+def test_engine_uses_merge_for_sorted_files(engine, write_export):
+    old = write_export("eski.xlsx", [name.title() for name in OLD_SORTED])
+    new = write_export("yeni.xlsx", NEW_SORTED)
+    expected = engine.run(old, new)
+
+    engine.sorted_input = True
+    result = engine.run(old, new)
+    assert result.method == "sorted"
+    assert (set(result.diff.removed), set(result.diff.added), result.common_count) == \
+        (set(expected.diff.removed), set(expected.diff.added), expected.common_count)
+
+
+def test_engine_falls_back_when_files_are_not_sorted(engine, write_export, caplog):
+    old = write_export("eski.xlsx", list(reversed(OLD_SORTED)))
+    new = write_export("yeni.xlsx", NEW_SORTED)
+    engine.sorted_input = True
+
+    with caplog.at_level(logging.WARNING):
+        result = engine.run(old, new)
+    assert result.method == "in_memory"
+    assert "sıralı değil" in caplog.text
+    assert result.diff.removed == ["ŞAHİN", "ÖZ", "DENİZ", "CAN"]
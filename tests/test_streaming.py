@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Sınırlı bellekli akış modu testleri: bellek bütçesi aşılınca diske taşan
+anahtar eşlemesi (SpillingKeyMap) ve eşiğin üzerindeki dosyaların akışla
+karşılaştırılması.
+"""
+
+import os
+import sys
+
+import pytest
+
+from key_store import SET_ENTRY_OVERHEAD, SpillingKeyMap
+
+
+def _entry_bytes(key: str, value: str) -> int:
+    return sys.getsizeof(key) + sys.getsizeof(value) + 2 * SET_ENTRY_OVERHEAD
+
+
+def test_spills_exactly_when_budget_is_crossed(tmp_path):
+    items = [(f"ANAHTAR {number}", f"Ad {number}") for number in range(10)]
+    budget = sum(_entry_bytes(*item) for item in items[:4])  # dört kayıt sığar, beşincisi taşırır
+
+    with SpillingKeyMap(memory_budget_mb=budget / (1024 * 1024), directory=str(tmp_path)) as key_map:
+        key_map.update(items[:4])
+        assert not key_map.spilled
+        key_map.add(*items[4])
+        assert key_map.spilled
+        assert len(os.listdir(tmp_path)) == 1
+        key_map.update(items[5:])
+        assert len(key_map) == 10
+    assert os.listdir(tmp_path) == []  # close() geçici veritabanını siler
+
+
+@pytest.mark.parametrize("budget_mb", [256, 1e-6])
+def test_first_value_and_insertion_order_survive_spill(tmp_path, budget_mb):
+    with SpillingKeyMap(memory_budget_mb=budget_mb, directory=str(tmp_path)) as key_map:
+        key_map.update([("IŞIK", "Işık"), ("İNCİ", "İnci"), ("IŞIK", "IŞIK"), ("ÖZ", "Öz"), ("ŞAHİN", "Şahin")])
+        assert key_map.spilled == (budget_mb < 1)
+        assert key_map.mark_many(["ÖZ", "YOK", "IŞIK"]) == [True, False, True]
+        assert key_map.matched_count() == 2
+        assert list(key_map.unmatched_values()) == ["İnci", "Şahin"]
+
+
+def test_integer_keys_round_trip_through_disk(tmp_path):
+    with SpillingKeyMap(memory_budget_mb=1e-6, directory=str(tmp_path)) as key_map:
+        key_map.update([(-2**63, "en küçük"), (2**63 - 1, "en büyük"), (7, "yedi")])
+        assert key_map.mark_many([7, 2**63 - 1, 8]) == [True, True, False]
+        assert list(key_map.unmatched_values()) == ["en küçük"]
+
+
+@pytest.mark.parametrize("budget_mb", [256, 1e-6])
+def test_large_files_are_streamed_with_the_in_memory_result(engine, write_export, budget_mb):
+    old = write_export("eski.xlsx", ["Işık Market", None, "İzmir Gıda", "Kaya", "Işık Market", "  ", "Öz Uğur"])
+    new = write_export("yeni.xlsx", ["IŞIK MARKET", "Dilek", "", "izmir gıda", "Dilek", "Irmak"])
+    expected = engine.run(old, new)
+    assert expected.method == "in_memory"
+
+    engine.large_file_threshold_mb = 0
+    engine.memory_budget_mb = budget_mb
+    result = engine.run(old, new)
+    assert result.method == "streaming"
+    assert result.diff.common is None  # akışta ortaklar listelenmez, sadece sayılır
+    assert (result.diff.removed, result.diff.added, result.common_count, result.total_count) == \
+        (expected.diff.removed, expected.diff.added, expected.common_count, expected.total_count)
+    assert result.depo_name == expected.depo_name == "İZMİR ARAÇ 01"
@@ -14,15 +14,21 @@ import sys
 import platform
 import logging
 from pathlib import Path
-from typing import Optional, Dict, List, Callable, TYPE_CHECKING
+from typing import Optional, Dict, List, Tuple, Callable, TYPE_CHECKING
+
+from excel_reader import SUPPORTED_EXTENSIONS, available_engines
 
 if TYPE_CHECKING:
+    import pandas as pd
     from main import ExcelComparisonLogic
+    from comparison import NameDiff
 
 # Constants
-SUPPORTED_EXTENSIONS = ['.xlsx', '.xls']
+EXCEL_PATTERNS = " ".join(f"*{extension}" for extension in SUPPORTED_EXTENSIONS)
 WINDOW_MIN_SIZE = (850, 600)
 DIALOG_SIZE = (900, 650)
+RESULT_TABS = (('removed', "Eksik"), ('added', "Yeni"), ('common', "Ortak"), ('changed', "Değişen"), ('counts', "Adet"))
+KEY_COLUMN_PRESETS = ("", "Cari Kodu + Cari Ünvan", "Cari Kodu")  # boş: sadece Cari Ünvan
 
 
 class ModernExcelComparisonUI:
@@ -36,7 +42,9 @@ class ModernExcelComparisonUI:
         self.has_dnd = self._check_dnd_support()
         
         # UI bileşenleri
-        self.result_tree: Optional[ttk.Treeview] = None
+        self.result_tree: Optional[ttk.Treeview] = None  # eksik adlar sekmesi
+        self.result_trees: Dict[str, ttk.Treeview] = {}
+        self.result_notebook: Optional[ttk.Notebook] = None
         self.status_var: Optional[tk.StringVar] = None
         self.progress: Optional[ttk.Progressbar] = None
         self.compare_btn: Optional[ttk.Button] = None
@@ -373,6 +381,8 @@ class ModernExcelComparisonUI:
                             # Eğer file1 ise output filename'i güncelle
                             if text_var == self.app_logic.file1_path:
                                 self.app_logic.update_output_filename(file_path)
+                            else:
+                                self.app_logic.preload_workbook(file_path)
                         else:
                             self._show_entry_error(entry_widget)
                 except Exception as e:
@@ -504,6 +514,85 @@ class ModernExcelComparisonUI:
         )
         case_check.pack(anchor=tk.W, pady=2)
         
+        # Ortak carilerde değişen alanlar (bakiye, adres, kategori...)
+        ttk.Checkbutton(
+            content_frame,
+            text="Değişen Alanları Bul",
+            variable=self.app_logic.change_detection,
+            style='Small.TCheckbutton'
+        ).pack(anchor=tk.W, pady=2)
+        
+        # Tekrarlı carilerde adet (teslimat noktası sayısı) farkları
+        ttk.Checkbutton(
+            content_frame,
+            text="Adet Farklarını Bul",
+            variable=self.app_logic.count_comparison,
+            style='Small.TCheckbutton'
+        ).pack(anchor=tk.W, pady=2)
+        
+        # Benzer ad eşleştirme ve benzerlik eşiği
+        fuzzy_frame = tk.Frame(content_frame, bg=self.colors['card'])
+        fuzzy_frame.pack(anchor=tk.W, pady=2)
+        
+        ttk.Checkbutton(
+            fuzzy_frame,
+            text="Benzer Adları Eşleştir",
+            variable=self.app_logic.fuzzy_matching,
+            style='Small.TCheckbutton'
+        ).pack(side=tk.LEFT)
+        
+        ttk.Spinbox(
+            fuzzy_frame,
+            textvariable=self.app_logic.similarity_threshold,
+            from_=0.50,
+            to=1.00,
+            increment=0.05,
+            format='%.2f',
+            width=5,
+            font=(self.font_family, 9)
+        ).pack(side=tk.LEFT, padx=(6, 0))
+        
+        # Karşılaştırma anahtarı (boş: sadece Cari Ünvan)
+        key_frame = tk.Frame(content_frame, bg=self.colors['card'])
+        key_frame.pack(anchor=tk.W, pady=2)
+        
+        tk.Label(
+            key_frame,
+            text="Anahtar Sütunları:",
+            font=(self.font_family, 9),
+            bg=self.colors['card'],
+            fg=self.colors['text']
+        ).pack(side=tk.LEFT)
+        
+        ttk.Combobox(
+            key_frame,
+            textvariable=self.app_logic.key_columns,
+            values=KEY_COLUMN_PRESETS,
+            width=22,
+            font=(self.font_family, 9)
+        ).pack(side=tk.LEFT, padx=(6, 0))
+        
+        # Okuma motoru
+        engine_frame = tk.Frame(content_frame, bg=self.colors['card'])
+        engine_frame.pack(anchor=tk.W, pady=2)
+        
+        tk.Label(
+            engine_frame,
+            text="Okuma Motoru:",
+            font=(self.font_family, 9),
+            bg=self.colors['card'],
+            fg=self.colors['text']
+        ).pack(side=tk.LEFT)
+        
+        ttk.Combobox(
+            engine_frame,
+            textvariable=self.app_logic.reader_engine,
+            values=available_engines(),
+            state='readonly',
+            width=10,
+            font=(self.font_family, 9)
+        ).pack(side=tk.LEFT, padx=(6, 0))
+        
         # Kaydetme formatı
         tk.Label(
             content_frame,
@@ -554,6 +643,42 @@ class ModernExcelComparisonUI:
         )
         self.compare_btn.pack(fill=tk.X, pady=(0, 6))
         
+        # Günlük seri butonu (klasördeki günlük dosyalar)
+        snapshot_btn = ttk.Button(
+            button_frame,
+            text="📅 Günlük Seri",
+            command=self._safe_compare_snapshots,
+            style='Small.TButton'
+        )
+        snapshot_btn.pack(fill=tk.X, pady=(0, 6))
+        
+        # Filo butonu (iki günün tüm araç dosyaları)
+        fleet_btn = ttk.Button(
+            button_frame,
+            text="🚚 Filo Karşılaştırma",
+            command=self._safe_compare_fleet,
+            style='Small.TButton'
+        )
+        fleet_btn.pack(fill=tk.X, pady=(0, 6))
+        
+        # Toplu karşılaştırma butonu (her araç çifti ayrı çıktıya)
+        batch_btn = ttk.Button(
+            button_frame,
+            text="📦 Toplu Karşılaştırma",
+            command=self._safe_compare_batch,
+            style='Small.TButton'
+        )
+        batch_btn.pack(fill=tk.X, pady=(0, 6))
+        
+        # Birleşik dosya butonu (tüm depolar tek dosyada, araçlara ayrılır)
+        combined_btn = ttk.Button(
+            button_frame,
+            text="🗂 Birleşik Dosya",
+            command=self._safe_compare_combined,
+            style='Small.TButton'
+        )
+        combined_btn.pack(fill=tk.X, pady=(0, 6))
+        
         # Araç-Plasiyer Ayarları butonu
         settings_btn = ttk.Button(
             button_frame,
@@ -616,6 +741,115 @@ class ModernExcelComparisonUI:
             self.show_error("Hata", f"Karşılaştırma başlatılamadı: {e}")
             self.reset_ui()
     
+    def _safe_compare_snapshots(self) -> None:
+        """Günlük dosyaların bulunduğu klasörü seçip seri karşılaştırmayı başlat"""
+        try:
+            folder = filedialog.askdirectory(
+                title="Günlük Excel Dosyalarının Klasörünü Seç",
+                initialdir=str(Path.home())
+            )
+            if not folder:
+                return
+            
+            self.compare_btn.configure(text="⏳ İşleniyor...", state='disabled')
+            self.progress.pack(fill=tk.X, pady=5)
+            self.progress.start(10)
+            self.root.update()
+            
+            self.app_logic.compare_snapshot_folder(folder)
+            
+        except Exception as e:
+            logging.error(f"Snapshot compare error: {e}")
+            self.show_error("Hata", f"Günlük seri başlatılamadı: {e}")
+            self.reset_ui()
+    
+    def _safe_compare_fleet(self) -> None:
+        """Eski ve yeni günün araç dosyalarının klasörlerini seçip filo karşılaştırmasını başlat"""
+        try:
+            old_folder = filedialog.askdirectory(
+                title="Eski Tarihli Araç Dosyalarının Klasörünü Seç",
+                initialdir=str(Path.home())
+            )
+            if not old_folder:
+                return
+            new_folder = filedialog.askdirectory(
+                title="Yeni Tarihli Araç Dosyalarının Klasörünü Seç",
+                initialdir=str(Path(old_folder).parent)
+            )
+            if not new_folder:
+                return
+            
+            self.compare_btn.configure(text="⏳ İşleniyor...", state='disabled')
+            self.progress.pack(fill=tk.X, pady=5)
+            self.progress.start(10)
+            self.root.update()
+            
+            self.app_logic.compare_fleet_folders(old_folder, new_folder)
+            
+        except Exception as e:
+            logging.error(f"Fleet compare error: {e}")
+            self.show_error("Hata", f"Filo karşılaştırması başlatılamadı: {e}")
+            self.reset_ui()
+    
+    def _safe_compare_combined(self) -> None:
+        """Tüm depoları içeren eski ve yeni dosyayı seçip araç bazında karşılaştır"""
+        try:
+            filetypes = [("Excel dosyaları", EXCEL_PATTERNS), ("Tüm dosyalar", "*.*")]
+            old_file = filedialog.askopenfilename(
+                title="Eski Tarihli Birleşik Dosyayı Seç",
+                filetypes=filetypes,
+                initialdir=str(Path.home())
+            )
+            if not old_file:
+                return
+            new_file = filedialog.askopenfilename(
+                title="Yeni Tarihli Birleşik Dosyayı Seç",
+                filetypes=filetypes,
+                initialdir=str(Path(old_file).parent)
+            )
+            if not new_file:
+                return
+            
+            self.compare_btn.configure(text="⏳ İşleniyor...", state='disabled')
+            self.progress.pack(fill=tk.X, pady=5)
+            self.progress.start(10)
+            self.root.update()
+            
+            self.app_logic.compare_combined_files(old_file, new_file)
+            
+        except Exception as e:
+            logging.error(f"Combined compare error: {e}")
+            self.show_error("Hata", f"Birleşik dosya karşılaştırması başlatılamadı: {e}")
+            self.reset_ui()
+    
+    def _safe_compare_batch(self) -> None:
+        """Eski ve yeni günün klasörlerini seçip her aracı ayrı ayrı karşılaştır"""
+        try:
+            old_folder = filedialog.askdirectory(
+                title="Eski Tarihli Araç Dosyalarının Klasörünü Seç",
+                initialdir=str(Path.home())
+            )
+            if not old_folder:
+                return
+            new_folder = filedialog.askdirectory(
+                title="Yeni Tarihli Araç Dosyalarının Klasörünü Seç",
+                initialdir=str(Path(old_folder).parent)
+            )
+            if not new_folder:
+                return
+            
+            self.compare_btn.configure(text="⏳ İşleniyor...", state='disabled')
+            self.progress.pack(fill=tk.X, pady=5)
+            self.progress.start(10)
+            self.root.update()
+            
+            self.app_logic.compare_batch_folders(old_folder, new_folder)
+            
+        except Exception as e:
+            logging.error(f"Batch compare error: {e}")
+            self.show_error("Hata", f"Toplu karşılaştırma başlatılamadı: {e}")
+            self.reset_ui()
+    
     def reset_ui(self) -> None:
         """UI'ı sıfırla"""
         try:
@@ -652,17 +886,57 @@ class ModernExcelComparisonUI:
         table_frame = tk.Frame(card_frame, bg=self.colors['card'])
         table_frame.pack(fill=tk.BOTH, expand=True, padx=12, pady=(0, 12))
         
+        # Eksik, yeni, ortak adlar ve değişen alanlar ayrı sekmelerde
+        self.result_notebook = ttk.Notebook(table_frame)
+        self.result_notebook.pack(fill=tk.BOTH, expand=True)
+        
+        for key, title in RESULT_TABS:
+            self.result_trees[key] = self._create_result_tree(self.result_notebook, title)
+        self.result_tree = self.result_trees['removed']
+        
+        # Değişen sekmesi: her satır bir alan (Alan, Eski -> Yeni)
+        changed_tree = self.result_trees['changed']
+        changed_tree.heading("benzer", text="Alan")
+        changed_tree.heading("skor", text="Eski → Yeni")
+        changed_tree.column("benzer", width=120)
+        changed_tree.column("skor", width=200, anchor=tk.W)
+        changed_tree.configure(displaycolumns=("no", "unvan", "benzer", "skor"))
+        
+        # Adet sekmesi: Eski / Yeni adet ve fark
+        count_tree = self.result_trees['counts']
+        count_tree.heading("benzer", text="Eski / Yeni")
+        count_tree.heading("skor", text="Fark")
+        count_tree.column("benzer", width=100, anchor=tk.CENTER)
+        count_tree.configure(displaycolumns=("no", "unvan", "benzer", "skor"))
+        
+        # Durum bilgisi
+        status_frame = tk.Frame(card_frame, bg=self.colors['card'])
+        status_frame.pack(fill=tk.X, padx=12, pady=(0, 8))
+        
+        self.status_var = tk.StringVar(value="Henüz karşılaştırma yapılmadı.")
+        status_label = tk.Label(
+            status_frame,
+            textvariable=self.status_var,
+            font=(self.font_family, 8, 'italic'),
+            bg=self.colors['card'],
+            fg=self.colors['text_light'],
+            wraplength=350
+        )
+        status_label.pack(anchor=tk.W)
+    
+    def _create_result_tree(self, notebook: ttk.Notebook, title: str) -> ttk.Treeview:
+        """Sonuç sekmesi: kaydırma çubuklu Treeview"""
         # Treeview ve scrollbar
-        tree_frame = tk.Frame(table_frame, bg=self.colors['card'])
-        tree_frame.pack(fill=tk.BOTH, expand=True)
+        tree_frame = tk.Frame(notebook, bg=self.colors['card'])
+        notebook.add(tree_frame, text=title)
         
         # Scrollbar
         scrollbar = ttk.Scrollbar(tree_frame)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
         # Treeview
-        columns = ("no", "unvan")
-        self.result_tree = ttk.Treeview(
+        columns = ("no", "unvan", "benzer", "skor")
+        tree = ttk.Treeview(
             tree_frame,
             columns=columns,
             show="headings",
@@ -671,30 +945,67 @@ class ModernExcelComparisonUI:
         )
         
         # Başlıkları ayarla
-        self.result_tree.heading("no", text="#")
-        self.result_tree.heading("unvan", text="Cari Ünvan")
+        tree.heading("no", text="#")
+        tree.heading("unvan", text="Cari Ünvan")
+        tree.heading("benzer", text="En Yakın Eşleşme")
+        tree.heading("skor", text="%")
         
         # Sütun genişlikleri
-        self.result_tree.column("no", width=50, anchor=tk.CENTER)
-        self.result_tree.column("unvan", width=350)
+        tree.column("no", width=50, anchor=tk.CENTER)
+        tree.column("unvan", width=350)
+        tree.column("benzer", width=250)
+        tree.column("skor", width=50, anchor=tk.CENTER)
         
-        self.result_tree.pack(fill=tk.BOTH, expand=True)
-        scrollbar.config(command=self.result_tree.yview)
+        # Benzerlik sütunları sadece bulanık modda gösterilir
+        tree.configure(displaycolumns=("no", "unvan"))
         
-        # Durum bilgisi
-        status_frame = tk.Frame(card_frame, bg=self.colors['card'])
-        status_frame.pack(fill=tk.X, padx=12, pady=(0, 8))
+        tree.pack(fill=tk.BOTH, expand=True)
+        scrollbar.config(command=tree.yview)
+        return tree
+    
+    def _fill_result_tree(self, tree: ttk.Treeview, results: List[str],
+                          near_matches: Optional[Dict[str, Tuple[Optional[str], float]]] = None) -> None:
+        """Sekmedeki sonuçları yenile"""
+        # Mevcut sonuçları temizle
+        for item in tree.get_children():
+            tree.delete(item)
+            
+        if near_matches is None:
+            tree.configure(displaycolumns=("no", "unvan"))
+        else:
+            tree.configure(displaycolumns=("no", "unvan", "benzer", "skor"))
+            
+        # Yeni sonuçları ekle
+        for i, unvan in enumerate(results, 1):
+            # Çok uzun ünvanları kısalt
+            display_unvan = unvan if len(str(unvan)) <= 50 else str(unvan)[:47] + "..."
+            values = (i, display_unvan)
+            if near_matches is not None:
+                near_name, score = near_matches.get(unvan, (None, 0.0))
+                values += (near_name or "-", f"{score * 100:.0f}")
+            tree.insert("", tk.END, values=values)
+    
+    def _fill_change_tree(self, tree: ttk.Treeview, changes: Optional['pd.DataFrame']) -> None:
+        """Değişen sekmesini yenile (her satır bir cari ve bir alan)"""
+        for item in tree.get_children():
+            tree.delete(item)
+        if changes is None:
+            return
         
-        self.status_var = tk.StringVar(value="Henüz karşılaştırma yapılmadı.")
-        status_label = tk.Label(
-            status_frame,
-            textvariable=self.status_var,
-            font=(self.font_family, 8, 'italic'),
-            bg=self.colors['card'],
-            fg=self.colors['text_light'],
-            wraplength=350
-        )
-        status_label.pack(anchor=tk.W)
+        for i, (unvan, field, old, new) in enumerate(changes.itertuples(index=False), 1):
+            display_unvan = unvan if len(str(unvan)) <= 50 else str(unvan)[:47] + "..."
+            tree.insert("", tk.END, values=(i, display_unvan, field, f"{old} → {new}"))
+    
+    def _fill_count_tree(self, tree: ttk.Treeview, count_changes: Optional['pd.DataFrame']) -> None:
+        """Adet sekmesini yenile (her satır bir cari: eski/yeni adet ve fark)"""
+        for item in tree.get_children():
+            tree.delete(item)
+        if count_changes is None:
+            return
+        
+        for i, (unvan, old, new, delta) in enumerate(count_changes.itertuples(index=False), 1):
+            display_unvan = unvan if len(str(unvan)) <= 50 else str(unvan)[:47] + "..."
+            tree.insert("", tk.END, values=(i, display_unvan, f"{old} / {new}", f"{delta:+d}"))
     
     def _validate_file_selection(self, file_path: str, file_type: str) -> tuple[bool, str]:
         """Dosya seçimini doğrula"""
@@ -709,15 +1020,8 @@ class ModernExcelComparisonUI:
         if path.suffix.lower() not in SUPPORTED_EXTENSIONS:
             return False, f"Geçersiz dosya formatı! Desteklenen formatlar: {', '.join(SUPPORTED_EXTENSIONS)}"
         
-        # Dosya boyutu kontrolü
-        try:
-            file_size_mb = path.stat().st_size / (1024 * 1024)
-            if file_size_mb > 100:  # 100MB limit
-                return False, f"Dosya boyutu çok büyük ({file_size_mb:.1f}MB). Maximum 100MB destekleniyor."
-        except Exception as e:
-            return False, f"Dosya boyutu kontrolü hatası: {e}"
-            
-        return True, ""
+        # Dosya boyutu kontrolü (büyük dosyalar akış modunda karşılaştırılır)
+        return self.app_logic.validate_file_size(file_path)
         
     def _browse_file1(self) -> None:
         """Eski Excel dosyasını seç"""
@@ -725,7 +1029,7 @@ class ModernExcelComparisonUI:
             file_path = filedialog.askopenfilename(
                 title="Eski Tarihli Excel Dosyasını Seç",
                 filetypes=[
-                    ("Excel Dosyaları", "*.xlsx *.xls"), 
+                    ("Excel Dosyaları", EXCEL_PATTERNS), 
                     ("Excel 2007-2019", "*.xlsx"),
                     ("Excel 97-2003", "*.xls"),
                     ("Tüm Dosyalar", "*.*")
@@ -751,7 +1055,7 @@ class ModernExcelComparisonUI:
             file_path = filedialog.askopenfilename(
                 title="Yeni Tarihli Excel Dosyasını Seç",
                 filetypes=[
-                    ("Excel Dosyaları", "*.xlsx *.xls"), 
+                    ("Excel Dosyaları", EXCEL_PATTERNS), 
                     ("Excel 2007-2019", "*.xlsx"),
                     ("Excel 97-2003", "*.xls"),
                     ("Tüm Dosyalar", "*.*")
@@ -764,26 +1068,40 @@ class ModernExcelComparisonUI:
                 
                 if is_valid:
                     self.app_logic.file2_path.set(file_path)
+                    self.app_logic.preload_workbook(file_path)
                 else:
                     self.show_error("Dosya Seçim Hatası", error_msg)
         except Exception as e:
             logging.error(f"File2 browse error: {e}")
             self.show_error("Hata", f"Dosya seçim hatası: {e}")
             
-    def update_results(self, results: List[str], status_text: str) -> None:
-        """Sonuçları güncelle - Thread-safe"""
+    def update_results(self, diff: 'NameDiff', status_text: str,
+                       near_matches: Optional[Dict[str, Tuple[Optional[str], float]]] = None) -> None:
+        """Sonuçları güncelle - Thread-safe
+        
+        Eksik, yeni ve ortak adlar, değişen alanlar ve adet farkları kendi sekmelerine yazılır. near_matches
+        verilirse (bulanık mod) eksik ve yeni adların en yakın eşleşmesi ve
+        benzerliği de gösterilir. Akış modunda ortak adlar listelenmez.
+        """
         def _update():
             try:
-                if self.result_tree:
-                    # Mevcut sonuçları temizle
-                    for item in self.result_tree.get_children():
-                        self.result_tree.delete(item)
-                        
-                    # Yeni sonuçları ekle
-                    for i, unvan in enumerate(results, 1):
-                        # Çok uzun ünvanları kısalt
-                        display_unvan = unvan if len(str(unvan)) <= 50 else str(unvan)[:47] + "..."
-                        self.result_tree.insert("", tk.END, values=(i, display_unvan))
+                if self.result_trees:
+                    self._fill_result_tree(self.result_trees['removed'], diff.removed, near_matches)
+                    self._fill_result_tree(self.result_trees['added'], diff.added, near_matches)
+                    self._fill_result_tree(self.result_trees['common'], diff.common or [])
+                    self._fill_change_tree(self.result_trees['changed'], diff.changes)
+                    self._fill_count_tree(self.result_trees['counts'], diff.count_changes)
+                    
+                    # Sekme başlıklarında sayılar (değişen: alanı değişen cari sayısı)
+                    counts = {'removed': len(diff.removed), 'added': len(diff.added), 'common': diff.common_count}
+                    if diff.changes is not None:
+                        counts['changed'] = diff.changes.iloc[:, 0].nunique()
+                    if diff.count_changes is not None:
+                        counts['counts'] = len(diff.count_changes)
+                    for index, (key, title) in enumerate(RESULT_TABS):
+                        text = f"{title} ({counts[key]})" if key in counts else title
+                        self.result_notebook.tab(index, text=text)
+                    self.result_notebook.select(0)
                         
                     # Durum metnini güncelle
                     if self.status_var:
@@ -801,9 +1119,12 @@ class ModernExcelComparisonUI:
     def clear_results(self) -> None:
         """Sonuçları temizle"""
         try:
-            if self.result_tree:
-                for item in self.result_tree.get_children():
-                    self.result_tree.delete(item)
+            for index, (key, title) in enumerate(RESULT_TABS):
+                tree = self.result_trees.get(key)
+                if tree:
+                    for item in tree.get_children():
+                        tree.delete(item)
+                    self.result_notebook.tab(index, text=title)
             if self.status_var:
                 self.status_var.set("Henüz karşılaştırma yapılmadı.")
         except Exception as e:
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Excel Karşılaştırma Uygulaması - Klasör İzleme
+ERP'nin gece paylaşılan klasöre bıraktığı dosyaları izler. Yeni veya
+güncellenen her Excel dosyası yazımı bitince aynı aracın bir önceki
+dosyasıyla karşılaştırılır. Linux'ta inotify, diğer sistemlerde (veya
+inotify açılamazsa) dizin taraması kullanılır; dosyalar sadece arka
+plandaki süreçlerde okunup karşılaştırılır.
+"""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+import time
+import zipfile
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from batch import BATCH_COLUMNS
+from engine import ComparisonEngine, SUPPORTED_EXTENSIONS, compare_pair, probe_export
+from snapshot_chain import export_files
+
+# Constants
+DEFAULT_SETTLE_SECONDS = 3.0  # Dosya bu süre değişmeden kalınca yazımı bitmiş sayılır
+DEFAULT_POLL_INTERVAL = 2.0
+WATCH_OUTPUT_NAME = "izleme_sonuçları"
+WATCH_SUMMARY_NAME = "Izleme_Ozet.csv"
+
+# inotify olayları (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+WATCH_EVENTS = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+# inotify sadece Linux'ta; libc'de yoksa dizin taraması kullanılır
+_libc = None
+if sys.platform.startswith("linux"):
+    try:
+        _libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    except OSError:
+        _libc = None
+HAS_INOTIFY = _libc is not None and hasattr(_libc, "inotify_init1")
+
+
+class InotifySource:
+    """Klasördeki değişen dosya adlarını inotify ile bildirir"""
+
+    def __init__(self, folder: str):
+        self.fd = _libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, f"inotify başlatılamadı: {os.strerror(error)}")
+        if _libc.inotify_add_watch(self.fd, os.fsencode(folder), WATCH_EVENTS) < 0:
+            error = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(error, f"Klasör izlenemiyor {folder}: {os.strerror(error)}")
+
+    def wait(self, timeout: float) -> List[str]:
+        """En fazla timeout saniye bekle; değişen dosya adlarını döndür"""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        names, offset = [], 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            _, _, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            if name:
+                names.append(os.fsdecode(name))
+        return names
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class PollingSource:
+    """Klasörü aralıklarla tarayıp boyutu veya zamanı değişen dosya adlarını bildirir"""
+
+    def __init__(self, folder: str, interval: float = DEFAULT_POLL_INTERVAL):
+        self.folder = Path(folder)
+        self.interval = interval
+        self._seen = self._scan()
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        found = {}
+        for entry in os.scandir(self.folder):
+            try:
+                if entry.is_file():
+                    stat = entry.stat()
+                    found[entry.name] = (stat.st_size, stat.st_mtime_ns)
+            except OSError:
+                continue  # tarama sırasında silinen dosya
+        return found
+
+    def wait(self, timeout: float) -> List[str]:
+        time.sleep(min(timeout, self.interval))
+        current = self._scan()
+        changed = [name for name, signature in current.items() if self._seen.get(name) != signature]
+        self._seen = current
+        return changed
+
+    def close(self) -> None:
+        pass
+
+
+class FolderWatcher:
+    """Klasördeki yeni veya güncellenen Excel dosyalarını yazımları bitince verir
+
+    Bir dosya settle_seconds boyunca boyutu ve değişiklik zamanı aynı
+    kalınca hazır sayılır; .xlsx/.xlsm dosyalarının ayrıca zip dizini okunabilir
+    olmalıdır (yarım yazılmış dosyada dizin sondadır ve henüz yoktur).
+    Excel'in '~$' kilit dosyaları ve diğer uzantılar yok sayılır.
+    """
+
+    def __init__(self, folder: str, settle_seconds: float = DEFAULT_SETTLE_SECONDS,
+                 poll_interval: float = DEFAULT_POLL_INTERVAL, use_inotify: bool = True):
+        self.folder = Path(folder)
+        self.settle_seconds = settle_seconds
+        self._pending: Dict[Path, Tuple[int, int, float]] = {}  # yol -> (boyut, zaman, değişmediği an)
+        self.source = None
+        if use_inotify and HAS_INOTIFY:
+            try:
+                self.source = InotifySource(str(self.folder))
+                logging.info(f"Klasör inotify ile izleniyor: {self.folder}")
+            except OSError as e:
+                logging.warning(f"inotify kullanılamıyor, klasör taranarak izlenecek: {e}")
+        if self.source is None:
+            self.source = PollingSource(str(self.folder), poll_interval)
+            logging.info(f"Klasör {poll_interval:g} sn aralıklarla taranarak izleniyor: {self.folder}")
+
+    def ready_files(self, timeout: float = 1.0) -> List[Path]:
+        """Olayları bekle (en fazla timeout saniye) ve yazımı biten dosyaları döndür"""
+        if self._pending:
+            timeout = min(timeout, self.settle_seconds / 2)
+        for name in self.source.wait(timeout):
+            path = self.folder / name
+            if path.suffix.lower() in SUPPORTED_EXTENSIONS and not name.startswith('~$'):
+                self._pending.setdefault(path, (-1, -1, time.monotonic()))
+
+        ready, now = [], time.monotonic()
+        for path, (size, mtime, since) in list(self._pending.items()):
+            try:
+                stat = path.stat()
+            except OSError:
+                del self._pending[path]  # silindi veya taşındı
+                continue
+            if (stat.st_size, stat.st_mtime_ns) != (size, mtime):
+                self._pending[path] = (stat.st_size, stat.st_mtime_ns, now)
+            elif now - since >= self.settle_seconds and stat.st_size > 0 and _is_complete(path):
+                del self._pending[path]
+                ready.append(path)
+        return sorted(ready)
+
+    def close(self) -> None:
+        self.source.close()
+
+
+def _is_complete(path: Path) -> bool:
+    """Dosya okunabilir durumda mı? (.xlsx/.xlsm için zip dizini yazılmış olmalı)"""
+    if path.suffix.lower() not in ('.xlsx', '.xlsm'):
+        return True
+    try:
+        return zipfile.is_zipfile(path)
+    except OSError:
+        return False
+
+
+class ExportWatcher:
+    """İzlenen klasöre gelen her dosyayı aynı aracın bir önceki dosyasıyla karşılaştırır
+
+    Başlangıçta klasördeki dosyalar güne göre sıralanıp her aracın son
+    dosyası önceki gün olarak alınır. Dosyanın aracının depo kartından
+    (bulunamazsa dosya adından) çıkarılması, karşılaştırma ve kaydetme
+    ProcessPoolExecutor'daki süreçlerde yapılır; izleme döngüsü dosya
+    okumaz, böylece aynı anda gelen çok sayıda dosya paralel işlenir.
+    Araç sonuçları geliş sırasıyla işlenir, aracın dosya geçmişi gün
+    sırasında kalır. Her sonuç output_dir'deki özet CSV'ye eklenir ve
+    on_result ile bildirilir (BATCH_COLUMNS anahtarlı satır).
+    """
+
+    def __init__(self, engine: ComparisonEngine, folder: str, output_dir: str = "",
+                 settle_seconds: float = DEFAULT_SETTLE_SECONDS, poll_interval: float = DEFAULT_POLL_INTERVAL,
+                 use_inotify: bool = True, workers: Optional[int] = None,
+                 on_result: Optional[Callable[[Dict[str, Any]], None]] = None):
+        if not Path(folder).is_dir():
+            raise ValueError(f"İzlenecek klasör bulunamadı: {folder}")
+        self.engine = engine
+        self.folder = folder
+        self.output_dir = Path(output_dir or WATCH_OUTPUT_NAME)
+        self.on_result = on_result
+        self.workers = max(int(workers or os.cpu_count() or 1), 1)
+        self._stop = threading.Event()
+        self._history: Dict[str, List[Path]] = {}
+        self._probes: List[Tuple[Path, bool, Future]] = []  # (dosya, karşılaştırılacak mı, araç sonucu)
+        self._futures: List[Future] = []
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._parallel = True
+
+        engine._apply_options()
+        self._options = engine._worker_options()
+        self._formats = engine._output_formats()
+        self._initial = [path for path in export_files(folder) if path.suffix.lower() in SUPPORTED_EXTENSIONS]
+        self.watcher = FolderWatcher(folder, settle_seconds, poll_interval, use_inotify)
+
+    def run(self) -> None:
+        """stop() çağrılana kadar klasörü izle; kuyruktaki karşılaştırmaların bitmesini bekleyip dön"""
+        try:
+            logging.info(f"İzleme başlangıcı: klasördeki {len(self._initial)} dosyanın aracı belirleniyor")
+            for path in self._initial:
+                self._queue(path, compare=False)
+            while not self._stop.is_set():
+                for path in self.watcher.ready_files():
+                    self._queue(path)
+                self._collect(wait=False)
+        finally:
+            self._collect(wait=True)
+            if self._executor is not None:
+                self._executor.shutdown()
+            self.watcher.close()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _submit(self, function: Callable[..., Any], *args: Any) -> Future:
+        """İşi süreç havuzuna gönder; süreç başlatılamazsa bu iş parçacığında çalıştır"""
+        if self._parallel:
+            try:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                return self._executor.submit(function, *args)
+            except (OSError, RuntimeError, BrokenProcessPool) as e:
+                # Kısıtlı ortam vb.; bu ve sonraki işler sırayla yapılır
+                logging.warning(f"Paralel işlem başarısız, sırayla yapılıyor: {e}")
+                self._executor = None
+                self._parallel = False
+        future: Future = Future()
+        try:
+            future.set_result(function(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def _queue(self, path: Path, compare: bool = True) -> None:
+        """Dosyanın aracını belirlemek için kuyruğa ekle (compare=False: sadece önceki gün olarak kaydedilir)"""
+        self._probes.append((path, compare, self._submit(probe_export, str(path), self._options)))
+
+    def _add_export(self, path: Path, vehicle: Optional[str], depo_name: Optional[str], compare: bool) -> None:
+        """Aracı belirlenen dosyayı geçmişe ekle ve aracın önceki dosyasıyla karşılaştırma kuyruğuna gönder"""
+        if vehicle is None:
+            logging.warning(f"Araç numarası bulunamadı, dosya karşılaştırılmıyor: {path}")
+            return
+
+        history = [previous for previous in self._history.get(vehicle, []) if previous != path]
+        self._history[vehicle] = history + [path]
+        if not compare:
+            return
+        if not history:
+            logging.info(f"Araç {vehicle} için ilk dosya, sonraki dosya bununla karşılaştırılacak: {path.name}")
+            return
+
+        name = self.engine._create_filename_with_driver(depo_name or f"Araç {vehicle}")
+        output_path = str(self.output_dir / f"{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+        logging.info(f"Araç {vehicle} kuyruğa eklendi: {history[-1].name} -> {path.name}")
+        self._futures.append(self._submit(compare_pair, vehicle, str(history[-1]), str(path),
+                                          output_path, self._options, self._formats))
+
+    def _collect(self, wait: bool) -> None:
+        """Biten araç tespitlerini ve karşılaştırmaları işle (wait=True ise hepsini bekle)"""
+        # Araç sonuçları kuyruk sırasıyla işlenir (öncekiler bitmeden sonrakine geçilmez)
+        while self._probes and (wait or self._probes[0][2].done()):
+            path, compare, future = self._probes.pop(0)
+            try:
+                _, vehicle, depo_name = future.result()
+            except Exception as e:
+                logging.error(f"Dosyanın aracı belirlenemedi {path}: {e}")
+                continue
+            self._add_export(path, vehicle, depo_name, compare)
+
+        for future in [future for future in self._futures if wait or future.done()]:
+            self._futures.remove(future)
+            try:
+                self._report(future.result())
+            except Exception as e:
+                logging.error(f"Karşılaştırma süreci beklenmedik şekilde sonlandı: {e}")
+
+    def _report(self, row: Dict[str, Any]) -> None:
+        """Sonucu logla ve özet CSV'ye ekle"""
+        if row["Hata"]:
+            logging.error(f"Araç {row['Araç']} karşılaştırılamadı ({row['Eski Dosya']} -> {row['Yeni Dosya']}): {row['Hata']}")
+        else:
+            logging.info(
+                f"Araç {row['Araç']} karşılaştırıldı ({row['Eski Dosya']} -> {row['Yeni Dosya']}): "
+                f"eksik {row['Eksik']}, yeni {row['Yeni']}, {row['Toplam (sn)']} sn"
+            )
+        summary_path = self.output_dir / WATCH_SUMMARY_NAME
+        try:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            # BOM sadece dosyanın başına yazılır (Excel'in Türkçe karakterleri doğru açması için)
+            new_file = not summary_path.exists()
+            pd.DataFrame([row], columns=list(BATCH_COLUMNS)).to_csv(
+                summary_path, mode='a', header=new_file, index=False, encoding='utf-8-sig' if new_file else 'utf-8'
+            )
+        except OSError as e:
+            logging.error(f"İzleme özeti yazılamadı {summary_path}: {e}")
+        if self.on_result:
+            self.on_result(row)